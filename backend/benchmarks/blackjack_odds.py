@@ -0,0 +1,24 @@
+"""
+Hands per second simulated by the Monte Carlo odds engine.
+
+Run from the backend directory: PYTHONPATH=src python benchmarks/blackjack_odds.py
+"""
+import time
+
+from demo_adk_app.utils.blackjack_odds import estimate_odds
+
+
+def benchmark(num_hands: int = 1000000, seed: int = 0) -> float:
+    """
+    Times a simulation of num_hands hands.
+
+    Returns:
+        Simulated hands per second.
+    """
+    start = time.perf_counter()
+    estimate_odds(["0S", "6H"], "0D", num_hands=num_hands, seed=seed)
+    return num_hands / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"{benchmark():,.0f} hands per second")
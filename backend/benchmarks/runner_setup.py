@@ -0,0 +1,57 @@
+"""
+Per-turn cost of getting the ADK runner, built on every turn or reused.
+
+Run from the backend directory: PYTHONPATH=src python benchmarks/runner_setup.py
+"""
+import time
+from typing import Dict
+
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.memory import InMemoryMemoryService
+from google.adk.runners import Runner as AdkRunner
+from google.adk.sessions import InMemorySessionService
+
+from demo_adk_app.agents.game_master_agent.agent import root_agent
+from demo_adk_app.services.runner import Runner
+from demo_adk_app.utils.config import Config
+
+
+def benchmark(turns: int = 200) -> Dict[str, float]:
+    """
+    Measures the per-turn cost of getting the ADK runner for the game master agent hierarchy,
+    building a new one on every turn (as before runners were reused) and reusing the long-lived one.
+
+    Returns:
+        Dict of seconds per turn, when building and when reusing the ADK runner.
+    """
+
+    config = Config.model_construct(APP_NAME="benchmark")
+    runner = Runner(
+        root_agent=root_agent,
+        session_service=InMemorySessionService(),
+        memory_service=InMemoryMemoryService(),
+        artifact_service=InMemoryArtifactService(),
+        config=config,
+    )
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        AdkRunner(
+            app_name=config.APP_NAME,
+            agent=runner._root_agent,
+            session_service=runner._session_service,
+            memory_service=runner._memory_service,
+            artifact_service=runner._artifact_service,
+        )
+    built = (time.perf_counter() - start) / turns
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        runner._get_adk_runner(config.APP_NAME)
+    reused = (time.perf_counter() - start) / turns
+
+    return {"built_per_turn_seconds": built, "reused_per_turn_seconds": reused}
+
+
+if __name__ == "__main__":
+    print(benchmark())
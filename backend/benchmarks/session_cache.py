@@ -0,0 +1,68 @@
+"""
+Session service latency of a turn against SQLite, on session cache misses and hits.
+
+Run from the backend directory: PYTHONPATH=src python benchmarks/session_cache.py
+"""
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from typing import Dict
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, DatabaseSessionService
+from google.genai import types
+
+from demo_adk_app.services.cached_session_service import CachingSessionService
+
+
+def benchmark(turns: int = 100, history_events: int = 200) -> Dict[str, float]:
+    """
+    Measures the session service latency of a turn (get the session, append the user and agent events)
+    against a SQLite database session service, reading the session from the database on every turn (miss)
+    and from the cache (hit, only the session's update time is read from the database).
+
+    Args:
+        turns: Number of turns measured.
+        history_events: Number of events in the session before the measured turns.
+
+    Returns:
+        Dict of seconds per turn, on cache misses and on cache hits.
+    """
+    def _event(author: str, text: str) -> Event:
+        return Event(
+            invocation_id=f"benchmark-{uuid.uuid4()}",
+            author=author,
+            content=types.Content(role="model" if author != "user" else "user", parts=[types.Part(text=text)]),
+            timestamp=time.time(),
+        )
+
+    async def _run_turns(service: BaseSessionService, session_id: str) -> float:
+        start = time.perf_counter()
+        for turn in range(turns):
+            session = await service.get_session(app_name="benchmark", user_id="user", session_id=session_id)
+            await service.append_event(session, _event("user", f"message {turn}"))
+            await service.append_event(session, _event("dealer_agent", f"response {turn}"))
+        return (time.perf_counter() - start) / turns
+
+    async def _run() -> Dict[str, float]:
+        with tempfile.TemporaryDirectory() as directory:
+            backend = DatabaseSessionService(db_url=f"sqlite:///{os.path.join(directory, 'sessions.db')}")
+            results = {}
+            for name, service in (
+                ("miss_per_turn_seconds", CachingSessionService(backend, max_size=0)),
+                ("hit_per_turn_seconds", CachingSessionService(backend)),
+            ):
+                session = await backend.create_session(app_name="benchmark", user_id="user")
+                for index in range(history_events):
+                    await backend.append_event(session, _event("user" if index % 2 else "dealer_agent", "history"))
+                results[name] = await _run_turns(service, session.id)
+            backend.db_engine.dispose()
+            return results
+
+    return asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -2,7 +2,8 @@ from google.adk.agents import Agent
 from .prompt import PROMPT
 from .tools import (
     initialize_game_room, create_deck_tool, shuffle_deck_tool, draw_card_tool,
-    calculate_card_value, calculate_hand_score
+    deal_initial_hands, player_hit, player_stand, play_dealer_hand,
+    calculate_card_value, calculate_hand_score, estimate_odds_tool
 )
 from demo_adk_app.utils.tools import memorize
 from demo_adk_app.utils.constants import Models
@@ -21,7 +22,12 @@ root_agent = Agent(
         create_deck_tool,
         shuffle_deck_tool,
         draw_card_tool,
+        deal_initial_hands,
+        player_hit,
+        player_stand,
+        play_dealer_hand,
         calculate_card_value,
         calculate_hand_score,
+        estimate_odds_tool,
     ],
 )
@@ -18,59 +18,42 @@ Tool Invocation Sequence:
      when user places the bet, deduct the bet amount from their {StateVariables.USER_PURSE}.
 1.1. Invoke create_deck_tool with input {StateVariables.GAME_ROOM_ID}
 1.2. Invoke shuffle_deck_tool with input: {StateVariables.GAME_ROOM_ID}
-1.3. Initial Deal Loop (for each player_id in players):
-Invoke deal_card_tool with input {StateVariables.GAME_ROOM_ID} Store result in {StateVariables.GAME_DETAILS} for player's hand
-Invoke deal_card_tool with input {StateVariables.GAME_ROOM_ID} Store result in {StateVariables.GAME_DETAILS} for player's hand
-Invoke calculate_hand_score with player's hand. Store result in {StateVariables.GAME_DETAILS} for player's score
+1.3. Initial Deal (all players and dealer in one call):
+Invoke deal_initial_hands with input {StateVariables.GAME_ROOM_ID}. It deals two cards to each player and two to the dealer,
+stores all hands and scores in the game room, and returns each player's hand and score with dealer's up card and visible score.
+Do NOT invoke draw_card_tool or calculate_hand_score for the initial deal.
 1.4. Dealer's Initial Deal:
-Invoke deal_card_tool with input {StateVariables.GAME_ROOM_ID} Store result in {StateVariables.GAME_DETAILS} for dealer's hand
-Invoke deal_card_tool with input {StateVariables.GAME_ROOM_ID} Store result in {StateVariables.GAME_DETAILS} for dealer's hand
+Already done by deal_initial_hands, dealer's hole card is kept hidden and hole_card_revealed is false.
 IMPORTANT: NEVER reveal dealer's down card to user unless it's appropriate.
-Invoke calculate_card_value with dealer's up card only. Store result in {StateVariables.GAME_DETAILS} for dealer's score
-Set hole_card_revealed = false.
 1.5. Reporting: Compile initial state (all player hands and scores, dealer's up-card and visible score) and report in Markdown friendly response.
 
 2. Process Player Action (triggered by action: "process_player_action"):
 Parameters received: player_move ("hit", "split" or "stand").
 Tool Invocation Sequence:
 2.1. If player_move == "hit":
-Invoke deal_card_tool with input {StateVariables.GAME_ROOM_ID} Store result in {StateVariables.GAME_DETAILS} for player's hand
-Invoke calculate_hand_score with player's hand. Store result in {StateVariables.GAME_DETAILS} for player's score
+Invoke player_hit with input {StateVariables.GAME_ROOM_ID} and player_id. It draws the card, stores player's hand, score and hand status.
 Report to Game Master: event: "player_hit_result", data: (player_id, new_card, current_hand, current_score).
-If player hand score > 21:
-Set player hand status = "busted".
+If returned player_hand_status == "busted":
 Report to Game Master: event: "player_bust", data: ( player_id, final_score ).
-Else if player hand score == 21:
-Set player hand status = "stood_21".
+Else if returned player_hand_status == "stood_21":
 Report to Game Master: event: "player_stands", data: ( player_id, final_score: 21 ).
 2.2. If player_move == "stand":
-Set player hand status = "stood".
+Invoke player_stand with input {StateVariables.GAME_ROOM_ID} and player_id.
 respond back with data: ( player_id, final_score: player hand score ).
 
 Dealer's Turn Execution (triggered by action: "execute_dealer_turn"):
 Tool Invocation Sequence:
-3.1. Set hole_card_revealed = true.
-3.2. Invoke calculate_hand_score with dealer's hand. Store result in {StateVariables.GAME_DETAILS} for dealer's score
-3.3. Report to Game Master: event: "dealer_reveals_hand", data: ( dealer_full_hand, dealer_score ).
-3.4. Dealer Play Logic Loop (while dealer hand score < 17):
-Invoke deal_card_tool with input {StateVariables.GAME_ROOM_ID} and store result in {StateVariables.GAME_DETAILS} for dealer's hand
-Invoke calculate_hand_score with dealer's hand. Store result in {StateVariables.GAME_DETAILS} for dealer's score
-Report to Game Master: event: "dealer_hits", data: ( new_card, dealer_hand, dealer_score ).
-3.5. Post-Loop Evaluation:
-If dealer hand score > 21: Report to Game Master: event: "dealer_busts", data: ( dealer_score ).
-Else (dealer stands): Report to Game Master: event: "dealer_stands", data: ( dealer_score ).
-3.6. Proceed to determine outcomes by triggering the "determine_outcomes" action described below.
+3.1. Invoke play_dealer_hand with input {StateVariables.GAME_ROOM_ID}. It reveals the hole card, draws until the dealer stands
+     according to house rules, settles every player's result and stores everything in the game room, in one call.
+     Do NOT invoke draw_card_tool or calculate_hand_score for the dealer's turn.
+3.2. Report to Game Master each event in the returned transcript in order: "dealer_reveals_hand", "dealer_hits" (one per drawn card),
+     and finally "dealer_busts" or "dealer_stands".
 
-Determine and Report Outcomes (triggered by action: "determine_outcomes"):
-Tool Invocation Sequence & Logic:
-4.1. Initialize outcomes = ().
-4.2. For each player_id in player_hands:
-Retrieve player_score = player hand score and player_status = player hand status.
-Retrieve dealer_score_final = dealer hand score.
-Apply standard Blackjack rules (Player bust, Dealer bust, scores comparison, Blackjack) to determine result ("win", "loss", "push", "blackjack_win"). This logic is part of your internal reasoning based on tool outputs.
-Store result in outcomes[player_id].
-4.3. Report to Game Master: event: "hand_complete_outcomes", data: [outcomes, dealer_final_hand, dealer_final_score].
-4.4 if the player won the game, update their {StateVariables.USER_PURSE} by adding the winning amount plus their orginal bet and notify the user
+Determine and Report Outcomes (part of "execute_dealer_turn", or triggered by action: "determine_outcomes"):
+4.1. Use the outcomes returned by play_dealer_hand, result for each player_id is one of "win", "loss", "push", "blackjack_win".
+     Do NOT recompute them.
+4.2. Report to Game Master: event: "hand_complete_outcomes", data: [outcomes, dealer_final_hand, dealer_final_score].
+4.3 if the player won the game, update their {StateVariables.USER_PURSE} by adding the winning amount plus their orginal bet and notify the user
     if the player result was push return the player's bet into their purse and notify the user
     otherwise, notify user about their loss and remaining purse value
 
@@ -80,8 +63,13 @@ initialize_game_room: Param {StateVariables.GAME_ROOM_ID}. Returns a fully initi
 create_deck_tool: Param {StateVariables.GAME_ROOM_ID}. Returns a full deck list.
 shuffle_deck_tool: Param {StateVariables.GAME_ROOM_ID}. Modifies deck in place or returns shuffled.
 deal_card_tool: Param {StateVariables.GAME_ROOM_ID}. Returns one card, modifies deck.
-calculate_card_value: Param card. Returns card's integer value.
-calculate_hand_score: Param hand (list of cards). Returns best integer score (handles multiple Aces).
+deal_initial_hands: Param {StateVariables.GAME_ROOM_ID}. Deals and stores all opening hands in one call, returns the table state.
+player_hit: Params {StateVariables.GAME_ROOM_ID}, player_id. Draws a card into player's hand, returns new card, hand, score and status.
+player_stand: Params {StateVariables.GAME_ROOM_ID}, player_id. Marks player's hand as stood.
+play_dealer_hand: Param {StateVariables.GAME_ROOM_ID}. Plays the dealer's hand and settles results in one call, returns transcript and outcomes.
+calculate_card_value: Param card (card code like "KS" or label like "KING of SPADES"). Returns card's integer value.
+calculate_hand_score: Param hand (list of card codes or labels). Returns best integer score (handles multiple Aces).
+estimate_odds_tool: Params {StateVariables.GAME_ROOM_ID}, player_id. Use when a player asks for a hint or their odds, returns bust probability, win / push / loss rates for standing and hitting, and the recommended move.
 Error Handling: If a tool fails, report an error to the Game Master.
 Output Formatting: All data reported to Game Master for relay to users must be suitable for Markdown rendering.
 """
\ No newline at end of file
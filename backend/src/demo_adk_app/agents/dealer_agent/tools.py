@@ -1,12 +1,17 @@
 
+import asyncio
+
 from google.adk.tools import ToolContext
 from google.adk.sessions import State
 from ...utils.models import GameRoom
-from ...utils.tools import _load_game_room, _save_game_room
+from ...utils.tools import _load_game_room, _save_game_room, _discard_game_room, _game_room_summary
 from demo_adk_app.utils.constants import StateVariables
-from demo_adk_app.utils import deckofcards_client
+from demo_adk_app.utils.config import get_config
+from demo_adk_app.utils.async_deckofcards_client import get_async_deck_client
+from demo_adk_app.utils.cards import CARD_POINTS, card_code, card_label, score_hand
+from demo_adk_app.utils.blackjack_odds import estimate_odds
 
-def initialize_game_room(game_room_id: str, tool_context: ToolContext):
+async def initialize_game_room(game_room_id: str, tool_context: ToolContext):
     """
     initialize game room at the start of the game
     Args:
@@ -17,7 +22,7 @@ def initialize_game_room(game_room_id: str, tool_context: ToolContext):
     """
 
     # load game room object
-    game_room, error = _load_game_room(game_room_id, tool_context)
+    game_room, error = await _load_game_room(game_room_id, tool_context)
     if error:
         return error
 
@@ -42,19 +47,21 @@ def initialize_game_room(game_room_id: str, tool_context: ToolContext):
     # todo
 
     # save the game room state
-    _save_game_room(game_room, tool_context)
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
  
     # following memory updates should be take care by the agent itself as needed
     # # also add to current session state (session scope) to use with prompts
     # state[StateVariables.GAME_DETAILS] = game_room.model_dump()
  
-    # return the game room details, agent will memorize as needed
+    # return a summary of the game room details, agent will memorize as needed
     return {
         "status" : "success",
-        "game_room": game_room
+        "game_room": _game_room_summary(game_room)
     }
 
-def create_deck_tool(game_room_id: str, tool_context: ToolContext):
+async def create_deck_tool(game_room_id: str, tool_context: ToolContext):
     """
     creat a new shuffled deck of card for the game
     Args:
@@ -66,22 +73,25 @@ def create_deck_tool(game_room_id: str, tool_context: ToolContext):
     # load game room object
     game_room: GameRoom = None
     error: dict = None
-    game_room, error = _load_game_room(game_room_id, tool_context)
+    game_room, error = await _load_game_room(game_room_id, tool_context)
     if error:
         return error
 
     # create a new deck of cards for this game room
-    deck = deckofcards_client.shuffle_new_deck(deck_count=1, jokers_enabled=False, cards=None)
+    deck = await get_async_deck_client().shuffle_new_deck(deck_count=1, jokers_enabled=False)
     if not "success" in deck or not deck["success"]:
         return {
             "status" : "error",
             "mesage" : f"failed to create new deck: {deck}"
         }    
     else:
-        game_room.deck = deck
+        # only the deck id is needed to draw, the remaining count is kept for reference
+        game_room.deck = {"deck_id" : deck["deck_id"], "remaining" : deck.get("remaining", None)}
 
     # save game room object
-    _save_game_room(game_room, tool_context)
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
 
     return {
         "status" : "success",
@@ -103,7 +113,7 @@ def shuffle_deck_tool(game_room_id: str, tool_context):
         "message" : "deck is shuffled"
     }
 
-def draw_card_tool(game_room_id: str, tool_context):
+async def draw_card_tool(game_room_id: str, tool_context):
     """
     draw 1 card from the deck of cards
     Args:
@@ -115,12 +125,12 @@ def draw_card_tool(game_room_id: str, tool_context):
     # load game room object
     game_room: GameRoom = None
     error: dict = None
-    game_room, error = _load_game_room(game_room_id, tool_context)
+    game_room, error = await _load_game_room(game_room_id, tool_context)
     if error:
         return error
 
     # draw 1 card from the deck
-    cards = deckofcards_client.draw_cards(game_room.deck["deck_id"], 1)
+    cards = await get_async_deck_client().draw_cards(game_room.deck["deck_id"], 1)
     if not "success" in cards or not cards["success"]:
         return {
             "status" : "error",
@@ -128,47 +138,342 @@ def draw_card_tool(game_room_id: str, tool_context):
         }
     else:
         # return the card
-        card = cards["cards"][0]
-        return {"value" : card["value"], "code" : card["code"], "suit" : card["suit"]}
+        code = cards["cards"][0]["code"]
+        return {"code" : code, "card" : card_label(code)}
+
+async def deal_initial_hands(game_room_id: str, tool_context: ToolContext):
+    """
+    deal the opening cards of a hand, two cards to each player and two to the dealer, in a single draw
+    Args:
+        game_room_id: a game room id to deal the hand for
+        tool_context: The ADK tool context.
+    Returns:
+        table state with all player hands and scores, and dealer's up card and visible score
+    """
+    # load game room object
+    game_room: GameRoom = None
+    error: dict = None
+    game_room, error = await _load_game_room(game_room_id, tool_context)
+    if error:
+        return error
+
+    if not game_room.deck.get("deck_id", None):
+        return {
+            "status" : "error",
+            "message" : "no deck of cards created for the game, create a deck first"
+        }
+
+    # draw all opening cards in one call, 2 for each player and 2 for dealer
+    num_seats = len(game_room.players) + 1
+    cards = await get_async_deck_client().draw_cards(game_room.deck["deck_id"], 2 * num_seats)
+    if not "success" in cards or not cards["success"]:
+        return {
+            "status" : "error",
+            "message" : f"failed to draw cards from deck: {cards}"
+        }
+    drawn = [card["code"] for card in cards["cards"]]
+
+    # deal in table order, one card per seat per round with dealer last
+    for player in game_room.players:
+        game_room.player_cards[player] = []
+    game_room.dealer_cards = []
+    for i, card in enumerate(drawn):
+        seat = i % num_seats
+        if seat < len(game_room.players):
+            game_room.player_cards[game_room.players[seat]].append(card)
+        else:
+            game_room.dealer_cards.append(card)
+
+    # score the hands, dealer's hole card stays hidden
+    for player in game_room.players:
+        game_room.player_scores[player], _ = score_hand(game_room.player_cards[player])
+        game_room.player_hand_status[player] = "blackjack" if game_room.player_scores[player] == 21 else "playing"
+    game_room.dealer_score = CARD_POINTS[game_room.dealer_cards[0]]
+    game_room.hole_card_revealed = False
+    game_room.game_status = "playing"
+
+    # save the game room state
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
+
+    return {
+        "status" : "success",
+        "player_cards" : {player : _labels(hand) for player, hand in game_room.player_cards.items()},
+        "player_scores" : game_room.player_scores,
+        "player_hand_status" : game_room.player_hand_status,
+        "dealer_up_card" : card_label(game_room.dealer_cards[0]),
+        "dealer_visible_score" : game_room.dealer_score,
+    }
 
-def calculate_card_value(card: dict):
+def _labels(hand: list[str]):
+    """
+    utility method to render card codes of a hand as readable labels for tool responses
+    """
+    return [card_label(code) for code in hand]
+
+def calculate_card_value(card: str):
     """
     calculate value of a standlone card
     Args:
-        card: card object to evaluate
+        card: card to evaluate, as a card code (e.g. "KS") or label (e.g. "KING of SPADES")
     Returns:
         value of the card
     """
-    value_str = card['value']
-    if value_str in ['JACK', 'QUEEN', 'KING']:
-        return 10
-    elif value_str == 'ACE':
-        return 11
-    else:
-        return int(value_str)
+    return CARD_POINTS[card_code(card)]
+
+
+async def player_hit(game_room_id: str, player_id: str, tool_context: ToolContext):
+    """
+    process a "hit" by a player: draw 1 card into player's hand and re-score it
+    Args:
+        game_room_id: a game room id of the game in play
+        player_id: user id of the player hitting
+        tool_context: The ADK tool context.
+    Returns:
+        the new card, player's hand, score and hand status ("playing", "busted" or "stood_21")
+    """
+    # load game room object
+    game_room: GameRoom = None
+    error: dict = None
+    game_room, error = await _load_game_room(game_room_id, tool_context)
+    if error:
+        return error
+
+    if game_room.player_hand_status.get(player_id, None) != "playing":
+        return {
+            "status" : "error",
+            "message" : f"player {player_id} has no hand in play"
+        }
+
+    # draw 1 card from the deck
+    cards = await get_async_deck_client().draw_cards(game_room.deck["deck_id"], 1)
+    if not "success" in cards or not cards["success"]:
+        return {
+            "status" : "error",
+            "message" : f"failed to draw cards from deck: {cards}"
+        }
+    card = cards["cards"][0]["code"]
+    game_room.player_cards[player_id].append(card)
+    score, _ = score_hand(game_room.player_cards[player_id])
+    game_room.player_scores[player_id] = score
+    if score > 21:
+        game_room.player_hand_status[player_id] = "busted"
+    elif score == 21:
+        game_room.player_hand_status[player_id] = "stood_21"
 
+    # save the game room state
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
 
-def calculate_hand_score(player_hand: list[dict]):
+    return {
+        "status" : "success",
+        "new_card" : card_label(card),
+        "player_hand" : _labels(game_room.player_cards[player_id]),
+        "player_score" : score,
+        "player_hand_status" : game_room.player_hand_status[player_id],
+    }
+
+async def player_stand(game_room_id: str, player_id: str, tool_context: ToolContext):
+    """
+    process a "stand" by a player
+    Args:
+        game_room_id: a game room id of the game in play
+        player_id: user id of the player standing
+        tool_context: The ADK tool context.
+    Returns:
+        player's final score and hand status
+    """
+    # load game room object
+    game_room: GameRoom = None
+    error: dict = None
+    game_room, error = await _load_game_room(game_room_id, tool_context)
+    if error:
+        return error
+
+    if game_room.player_hand_status.get(player_id, None) != "playing":
+        return {
+            "status" : "error",
+            "message" : f"player {player_id} has no hand in play"
+        }
+
+    game_room.player_hand_status[player_id] = "stood"
+
+    # save the game room state
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
+
+    return {
+        "status" : "success",
+        "player_score" : game_room.player_scores.get(player_id, 0),
+        "player_hand_status" : "stood",
+    }
+
+def calculate_hand_score(player_hand: list[str]):
     """
     calculate value of a card, based on player's hand
     Args:
-        player_hand: list of card objects in a player's hand
+        player_hand: list of cards in a player's hand, as card codes (e.g. "KS") or labels (e.g. "KING of SPADES")
     Returns:
         score of player's hand based on all cards
     """
-    score = 0
-    num_aces = 0
-    # first calculate score based on each card's standalone value
-    for card in player_hand:
-        card_value = calculate_card_value(card)
-        # also keep track of number of aces
-        if card_value == 11:
-            num_aces += 1
-        score += card_value
-
-    # now adjust score based on ACEs to optimum value
-    while score > 21 and num_aces > 0:
-        score -= 10
-        num_aces -= 1
-
-    return score
\ No newline at end of file
+    score, _ = score_hand([card_code(card) for card in player_hand])
+    return score
+
+
+def _settle_player(player_hand: list[str], player_score: int, player_status: str,
+                   dealer_hand: list[str], dealer_score: int):
+    """
+    utility method to settle a player's hand against the dealer's final hand
+    Returns:
+        result of the hand for the player: "win", "loss", "push" or "blackjack_win"
+    """
+    player_blackjack = player_score == 21 and len(player_hand) == 2
+    dealer_blackjack = dealer_score == 21 and len(dealer_hand) == 2
+    if player_status == "busted" or player_score > 21:
+        return "loss"
+    if player_blackjack and not dealer_blackjack:
+        return "blackjack_win"
+    if dealer_blackjack and not player_blackjack:
+        return "loss"
+    if dealer_score > 21 or player_score > dealer_score:
+        return "win"
+    if player_score == dealer_score:
+        return "push"
+    return "loss"
+
+
+async def play_dealer_hand(game_room_id: str, tool_context: ToolContext):
+    """
+    play the dealer's turn: reveal the hole card, draw until the dealer stands on 17 or more
+    (hitting soft 17 if the house rule is configured), and settle results against every player
+    Args:
+        game_room_id: a game room id to play the dealer's hand for
+        tool_context: The ADK tool context.
+    Returns:
+        transcript of the dealer's play, dealer's final hand and score, and each player's result
+    """
+    # load game room object
+    game_room: GameRoom = None
+    error: dict = None
+    game_room, error = await _load_game_room(game_room_id, tool_context)
+    if error:
+        return error
+
+    if game_room.game_status != "playing" or len(game_room.dealer_cards) < 2:
+        return {
+            "status" : "error",
+            "message" : "no hand in play, the dealer's hand is not dealt yet or already settled"
+        }
+
+    # the dealer plays once every player stood or busted
+    players_in_play = [player for player, status in game_room.player_hand_status.items() if status == "playing"]
+    if players_in_play:
+        return {
+            "status" : "error",
+            "message" : f"players {players_in_play} have not finished their hands yet"
+        }
+
+    # reveal the hole card
+    game_room.hole_card_revealed = True
+    dealer_score, is_soft = score_hand(game_room.dealer_cards)
+    transcript = [{
+        "event" : "dealer_reveals_hand",
+        "dealer_hand" : _labels(game_room.dealer_cards),
+        "dealer_score" : dealer_score,
+    }]
+
+    # dealer draws only if some player is still standing
+    players_standing = any(
+        game_room.player_hand_status.get(player, None) != "busted" for player in game_room.player_scores
+    )
+    hit_soft_17 = get_config().DEALER_HITS_SOFT_17
+    while players_standing and (dealer_score < 17 or (dealer_score == 17 and is_soft and hit_soft_17)):
+        cards = await get_async_deck_client().draw_cards(game_room.deck["deck_id"], 1)
+        if not "success" in cards or not cards["success"]:
+            # the hole card was revealed and cards drawn without saving, don't hand the room to later tools
+            _discard_game_room(game_room_id, tool_context)
+            return {
+                "status" : "error",
+                "message" : f"failed to draw cards from deck: {cards}"
+            }
+        card = cards["cards"][0]["code"]
+        game_room.dealer_cards.append(card)
+        dealer_score, is_soft = score_hand(game_room.dealer_cards)
+        transcript.append({
+            "event" : "dealer_hits",
+            "new_card" : card_label(card),
+            "dealer_score" : dealer_score,
+        })
+    game_room.dealer_score = dealer_score
+    transcript.append({
+        "event" : "dealer_busts" if dealer_score > 21 else "dealer_stands",
+        "dealer_score" : dealer_score,
+    })
+
+    # settle results against every player
+    outcomes = {}
+    for player, player_score in game_room.player_scores.items():
+        outcomes[player] = _settle_player(
+            game_room.player_cards.get(player, []), player_score,
+            game_room.player_hand_status.get(player, None),
+            game_room.dealer_cards, dealer_score,
+        )
+    game_room.player_results = outcomes
+    game_room.game_status = "post-game"
+
+    # save the game room state
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
+
+    return {
+        "status" : "success",
+        "transcript" : transcript,
+        "dealer_final_hand" : _labels(game_room.dealer_cards),
+        "dealer_final_score" : dealer_score,
+        "outcomes" : outcomes,
+    }
+
+
+async def estimate_odds_tool(game_room_id: str, player_id: str, tool_context: ToolContext):
+    """
+    estimate a player's odds against the dealer's up card, with a simulation of the dealer's hand,
+    and recommend a basic strategy move
+    Args:
+        game_room_id: a game room id of the game in play
+        player_id: user id of the player asking for a hint
+        tool_context: The ADK tool context.
+    Returns:
+        player's score, probability of busting on a hit, win / push / loss rates for standing and for
+        hitting once, and the recommended move ("hit" or "stand")
+    """
+    # load game room object
+    game_room: GameRoom = None
+    error: dict = None
+    game_room, error = await _load_game_room(game_room_id, tool_context)
+    if error:
+        return error
+
+    if game_room.game_status != "playing" or game_room.player_hand_status.get(player_id, None) != "playing":
+        return {
+            "status" : "error",
+            "message" : f"player {player_id} has no hand in play"
+        }
+
+    # the simulation runs in a worker thread, so it doesn't block the event loop
+    config = get_config()
+    odds = await asyncio.to_thread(
+        estimate_odds,
+        game_room.player_cards[player_id],
+        game_room.dealer_cards[0],
+        num_hands=config.ODDS_SIMULATIONS,
+        hit_soft_17=config.DEALER_HITS_SOFT_17,
+    )
+    return {
+        "status" : "success",
+        "dealer_up_card" : card_label(game_room.dealer_cards[0]),
+        **odds,
+    }
@@ -1,10 +1,10 @@
 from google.adk.tools import ToolContext
 from google.adk.sessions import State
 from ...utils.models import GameRoom
-from ...utils.tools import _load_game_room, _save_game_room
+from ...utils.tools import _load_game_room, _save_game_room, _game_room_summary, _get_current_game_id
 from demo_adk_app.utils.constants import StateVariables
 
-def create_game(game_room_id: str, user_id: str, tool_context: ToolContext):
+async def create_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     """
     create a new game on behalf of the user
     Args:
@@ -17,13 +17,8 @@ def create_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     # hardcoding to 1 -- we'll only have single player mode for MVP
     max_num_players: int = 1
 
-    # TODO: remove this when move from "app:" scope to DB store
-    state = tool_context.state
-
     # check if user is already enrolled in a game
-    # TODO: replace this from "app:" scope to DB store
-    # old_game_room_id = state.get(f"{State.APP_PREFIX}{user_id}_{StateVariables.CURRENT_GAME}", None)
-    old_game_room_id = state.get(f"{user_id}_{StateVariables.CURRENT_GAME}", None)
+    old_game_room_id = await _get_current_game_id(user_id, tool_context)
     if old_game_room_id:
         return {
             "status" : "error",
@@ -31,7 +26,7 @@ def create_game(game_room_id: str, user_id: str, tool_context: ToolContext):
         }
 
     # check if game room exists
-    game_room, _ = _load_game_room(game_room_id, tool_context)
+    game_room, _ = await _load_game_room(game_room_id, tool_context)
     if game_room:
         return {
             "status" : "error",
@@ -45,11 +40,6 @@ def create_game(game_room_id: str, user_id: str, tool_context: ToolContext):
         players= [user_id],
         max_number_players=max_num_players,
     )
-    # set this game as the current game for user (app scope)
-    # TODO: replace this from "app:" scope to DB store
-    # state[f"{State.APP_PREFIX}{user_id}_{StateVariables.CURRENT_GAME}"] = game_room.game_room_id
-    state[f"{user_id}_{StateVariables.CURRENT_GAME}"] = game_room.game_room_id
-
     # following memory updates should be take care by the agent itself as needed
     # # also set the game as current game in session scope
     # state[StateVariables.GAME_ROOM_ID] = game_room.game_room_id
@@ -58,16 +48,18 @@ def create_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     # # also add to current session state (session scope) to use with prompts
     # state[StateVariables.GAME_DETAILS] = game_room.model_dump()
 
-    # save game details
-    _save_game_room(game_room, tool_context)
+    # save game details, this also makes it the current game of the host
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
 
-    # return the game room details, agent will memorize as needed
+    # return a summary of the game room details, agent will memorize as needed
     return {
         "status" : "success",
-        "game_room": game_room
+        "game_room": _game_room_summary(game_room)
     }
 
-def leave_game(game_room_id: str, user_id: str, tool_context: ToolContext):
+async def leave_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     """
     leave a game as a player
     Args:
@@ -77,44 +69,41 @@ def leave_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     Returns:
         A status message from handling user request
     """
-    # TODO: remove this when move from "app:" scope to DB store
-    state = tool_context.state
-
     # check if user is already enrolled in a game
-    # TODO: replace this from "app:" scope to DB store
-    # if state.get(f"{State.APP_PREFIX}{user_id}_{StateVariables.CURRENT_GAME}", None):
-    if not state.get(f"{user_id}_{StateVariables.CURRENT_GAME}", None):
+    if not await _get_current_game_id(user_id, tool_context):
         return {
             "status" : "error",
             "message" : f"user is not enrolled with game room: {game_room_id}"
         }
 
     # check if game room exists
-    game_room, error = _load_game_room(game_room_id, tool_context)
+    game_room, error = await _load_game_room(game_room_id, tool_context)
     if error:
         return error
 
-    # set this game as the current game for user (app scope)
-    # TODO: replace this from "app:" scope to DB store
-    # state[f"{State.APP_PREFIX}{user_id}_{StateVariables.CURRENT_GAME}"] = game_room.game_room_id
-    state[f"{user_id}_{StateVariables.CURRENT_GAME}"] = None
+    # clear current game tracked in session state by games created before the game room repository
+    if tool_context.state.get(f"{user_id}_{StateVariables.CURRENT_GAME}", None):
+        tool_context.state[f"{user_id}_{StateVariables.CURRENT_GAME}"] = None
 
-    # remove user from player list of the game room (application scope, to share with all users)
-    game_room.players.remove(user_id)
-    game_room.player_cards.pop(user_id)
-    game_room.player_scores.pop(user_id)
+    # remove user from player list of the game room (shared with all users)
+    if user_id in game_room.players:
+        game_room.players.remove(user_id)
+    game_room.player_cards.pop(user_id, None)
+    game_room.player_scores.pop(user_id, None)
 
     # save the game room state
-    _save_game_room(game_room, tool_context)
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
 
-    # return the game room details, agent will memorize as needed
+    # return a summary of the game room details, agent will memorize as needed
     return {
         "status" : "success",
-        "game_room": game_room
+        "game_room": _game_room_summary(game_room)
     }
 
 
-def join_game(game_room_id: str, user_id: str, tool_context: ToolContext):
+async def join_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     """
     join a new game as a player
     Args:
@@ -124,22 +113,16 @@ def join_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     Returns:
         A status message from handling user request
     """
-    # TODO: remove this when move from "app:" scope to DB store
-    state = tool_context.state
-
     # check if user is already enrolled in a game
-    # TODO: replace this from "app:" scope to DB store
-    # if state.get(f"{State.APP_PREFIX}{user_id}_{StateVariables.CURRENT_GAME}", None):
-    if state.get(f"{user_id}_{StateVariables.CURRENT_GAME}", None):
-        # game_room_id = state.get(f"{State.APP_PREFIX}{user_id}_{StateVariables.CURRENT_GAME}")
-        game_room_id = state.get(f"{user_id}_{StateVariables.CURRENT_GAME}")
+    current_game_room_id = await _get_current_game_id(user_id, tool_context)
+    if current_game_room_id:
         return {
             "status" : "error",
-            "message" : f"user id already enrolled with game room: {game_room_id}"
+            "message" : f"user id already enrolled with game room: {current_game_room_id}"
         }
 
     # check if game room exists
-    game_room, error = _load_game_room(game_room_id, tool_context)
+    game_room, error = await _load_game_room(game_room_id, tool_context)
     if error:
         return error
 
@@ -158,11 +141,6 @@ def join_game(game_room_id: str, user_id: str, tool_context: ToolContext):
             "message" : f"game is not accepting new players, status is {game_room.game_status}"
         }
 
-    # set this game as the current game for user (app scope)
-    # TODO: replace this from "app:" scope to DB store
-    # state[f"{State.APP_PREFIX}{user_id}_{StateVariables.CURRENT_GAME}"] = game_room.game_room_id
-    state[f"{user_id}_{StateVariables.CURRENT_GAME}"] = game_room.game_room_id
-
     # following memory updates should be take care by the agent itself as needed
     # # set the game room for current session
     # state[StateVariables.GAME_ROOM_ID] = game_room.game_room_id
@@ -171,19 +149,21 @@ def join_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     # # also add to current session state (session scope) to use with prompts
     # state[StateVariables.GAME_DETAILS] = game_room.model_dump()
 
-    # add user to player list of the game room (application scope, to share with all users)
+    # add user to player list of the game room (shared with all users), this makes it user's current game
     game_room.players.append(user_id)
 
     # save the game room state
-    _save_game_room(game_room, tool_context)
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
 
-    # return the game room details, agent will memorize as needed
+    # return a summary of the game room details, agent will memorize as needed
     return {
         "status" : "success",
-        "game_room": game_room
+        "game_room": _game_room_summary(game_room)
     }
 
-def start_game(game_room_id: str, user_id: str, tool_context: ToolContext):
+async def start_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     """
     handle start game request by host of the game
     Args:
@@ -193,11 +173,8 @@ def start_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     Returns:
         A status message from handling user request
     """
-    # TODO: remove this when move from "app:" scope to DB store
-    state = tool_context.state
-
     # check if game room exists
-    game_room, error = _load_game_room(game_room_id, tool_context)
+    game_room, error = await _load_game_room(game_room_id, tool_context)
     if error:
         return error
 
@@ -219,18 +196,20 @@ def start_game(game_room_id: str, user_id: str, tool_context: ToolContext):
     game_room.game_status = "in-game"
 
     # save the game room state
-    _save_game_room(game_room, tool_context)
+    error = await _save_game_room(game_room, tool_context)
+    if error:
+        return error
 
     # transfer to parent agent
     tool_context.actions.transfer_to_agent = tool_context._invocation_context.agent.parent_agent.name
 
-    # return the game room details, agent will memorize as needed
+    # return a summary of the game room details, agent will memorize as needed
     return {
         "status" : "success",
-        "game_room": game_room
+        "game_room": _game_room_summary(game_room)
     }
 
-def get_game_details(game_room_id: str, tool_context: ToolContext):
+async def get_game_details(game_room_id: str, tool_context: ToolContext):
     """
     get details of the current game
     Args:
@@ -240,12 +219,12 @@ def get_game_details(game_room_id: str, tool_context: ToolContext):
         A status message from getting game details
     """
 
-    # check if game room exists (app scope)
-    game_room, error = _load_game_room(game_room_id, tool_context)
+    # check if game room exists
+    game_room, error = await _load_game_room(game_room_id, tool_context)
     if error:
         return error
     # return dtails of the game
     return {
         "status" : "success",
-        "game_room" : game_room
+        "game_room" : _game_room_summary(game_room)
     }
@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import List, Optional, Any, Dict, Annotated # Added Any, Dict, Annotated
 
-from fastapi import FastAPI, HTTPException, status, Response, Request, Depends
+from fastapi import FastAPI, HTTPException, status, Response, Request, Depends, Query, Header
+from fastapi.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
 # Pydantic models are now in api.models
 from google.adk.events import Event # Assuming this path is correct for your project structure
@@ -13,12 +14,31 @@ from demo_adk_app.utils.config import Config
 from demo_adk_app.utils.constants import StateVariables
 from demo_adk_app.api.models import Conversation, Message, StreamingEvent # Import models from the new module
 from demo_adk_app.services.runner import Runner # Import the Runner class
-from demo_adk_app.api.auth import get_authenticated_user, get_authorized_session # Import auth dependencies
+from demo_adk_app.services.turn_scheduler import TurnRejected
+from demo_adk_app.services.session_listing import list_session_metadata
+from demo_adk_app.services.session_history import load_history_page
+from demo_adk_app.api.history import compute_etag, etag_matches, parse_event_fields, project_event
+from demo_adk_app.api.auth import ( # Import auth dependencies
+    get_authenticated_user,
+    get_authorized_session_state,
+    authorize_conversation,
+    cache_conversation_ownership,
+    invalidate_conversation_ownership,
+)
 
 # Global variable to hold the singleton FastAPI app instance
 _app: Optional[FastAPI] = None
 
 
+def _too_many_turns(e: TurnRejected) -> HTTPException:
+    """
+    Converts a turn refused by the runner's turn scheduler to a 429 response, telling the client when to retry.
+    """
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+    )
+
+
 def get_fast_api_app(
     runner: Runner,
     session_service: BaseSessionService,
@@ -78,6 +98,7 @@ def get_fast_api_app(
                 allow_credentials=True,
                 allow_methods=["*"], # Allows all methods
                 allow_headers=["*"], # Allows all headers
+                expose_headers=["X-Next-Cursor", "ETag", "Retry-After"], # Pagination cursor, history versioning, backpressure
             )
 
         # USER_ID = "hard_coded_user-01" # Hardcoded user ID removed, will use authenticated user's ID
@@ -103,6 +124,7 @@ def get_fast_api_app(
                         StateVariables.USER_ID: user.get("email", None)
                     }
                 )
+                cache_conversation_ownership(user_id, adk_session.id)
                 return Conversation(conv_id=adk_session.id, updated_at=adk_session.last_update_time)
             except Exception as e:
                 # Log the exception e
@@ -111,23 +133,31 @@ def get_fast_api_app(
         @_app.get("/conversations", response_model=List[Conversation])
         async def get_conversations(
             request: Request,
-            user: Annotated[Dict, Depends(get_authenticated_user)]
+            response: Response,
+            user: Annotated[Dict, Depends(get_authenticated_user)],
+            limit: Annotated[int, Query(ge=1, le=500, description="Maximum number of conversations to return.")] = 100,
+            cursor: Annotated[Optional[str], Query(description="Cursor from the previous page's X-Next-Cursor header.")] = None,
         ):
             """
-            Retrieves a list of all conversations for the authenticated user.
+            Retrieves a page of conversations for the authenticated user, most recently updated first.
+            The cursor for the next page, if any, is returned in the X-Next-Cursor response header.
             """
             session_service: BaseSessionService = request.app.state.session_service
             app_config: Config = request.app.state.config
             user_id = user.get("uid")
             try:
                 app_name_to_use = app_config.AGENT_ID if app_config.AGENT_ID else app_config.APP_NAME
-                list_sessions_response: Any = await session_service.list_sessions(
-                    user_id=user_id, app_name=app_name_to_use
+                sessions, next_cursor = await list_session_metadata(
+                    session_service, app_name=app_name_to_use, user_id=user_id, limit=limit, cursor=cursor,
+                    create_index=bool(app_config.SESSION_LISTING_INDEX),
                 )
-                adk_sessions: List[AdkSession] = list_sessions_response.sessions
+                if next_cursor:
+                    response.headers["X-Next-Cursor"] = next_cursor
                 return [
-                    Conversation(conv_id=s.id, updated_at=s.last_update_time) for s in adk_sessions
+                    Conversation(conv_id=s.id, updated_at=s.last_update_time) for s in sessions
                 ]
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
             except Exception as e:
                 # Log the exception e
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -137,11 +167,11 @@ def get_fast_api_app(
             request: Request, 
             message_request: Message,
             user: Annotated[Dict, Depends(get_authenticated_user)],
-            adk_session: Annotated[AdkSession, Depends(get_authorized_session)] # Injects authorized session
+            adk_session: Annotated[AdkSession, Depends(get_authorized_session_state)] # Injects authorized session state view
         ):
             """
             Sends a message to a specific conversation and gets a response from the agent.
-            User authorization for the conversation is handled by get_authorized_session.
+            User authorization for the conversation is handled by get_authorized_session_state.
             """
             app_runner: Runner = request.app.state.runner
             try:
@@ -149,6 +179,8 @@ def get_fast_api_app(
                 return response_message
             except HTTPException: # Re-raise HTTPException
                 raise
+            except TurnRejected as e:
+                raise _too_many_turns(e)
             except Exception as e:
                 # Log the exception e
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -158,13 +190,13 @@ def get_fast_api_app(
             request: Request, 
             message_request: Message,
             user: Annotated[Dict, Depends(get_authenticated_user)],
-            adk_session: Annotated[AdkSession, Depends(get_authorized_session)] # Injects authorized session
+            adk_session: Annotated[AdkSession, Depends(get_authorized_session_state)] # Injects authorized session state view
         ):
             """
             Submit's a user message to a specific conversation for processing. Client needs to use
             `stream` endpoint to fetch the processing results.
 
-            User authorization for the conversation is handled by get_authorized_session.
+            User authorization for the conversation is handled by get_authorized_session_state.
             """
             app_runner: Runner = request.app.state.runner
             try:
@@ -180,25 +212,93 @@ def get_fast_api_app(
         async def stream_messages(
             request: Request, 
             user: Annotated[Dict, Depends(get_authenticated_user)],
-            adk_session: Annotated[AdkSession, Depends(get_authorized_session)] # Injects authorized session
+            adk_session: Annotated[AdkSession, Depends(get_authorized_session_state)], # Injects authorized session state view
+            last_event_id: Annotated[Optional[str], Header()] = None,
         ):
             """
             Streams events from agent's processing of last user submitted message.
-            User authorization for the conversation is handled by get_authorized_session.
+            A client reconnecting with a Last-Event-ID header is sent only the events it missed.
+            User authorization for the conversation is handled by get_authorized_session_state.
+            """
+            app_runner: Runner = request.app.state.runner
+            try:
+                events = await app_runner.stream(
+                    user=user, session=adk_session, request=request, last_event_id=last_event_id
+                )
+            except TurnRejected as e:
+                raise _too_many_turns(e)
+            return EventSourceResponse(events)
+
+        @_app.post("/conversations/{conversation_id}/stream")
+        async def submit_and_stream_messages(
+            request: Request,
+            message_request: Message,
+            user: Annotated[Dict, Depends(get_authenticated_user)],
+            adk_session: Annotated[AdkSession, Depends(get_authorized_session_state)], # Injects authorized session state view
+            last_event_id: Annotated[Optional[str], Header()] = None,
+        ):
+            """
+            Processes a user message and streams events from agent's processing in the same request,
+            without the separate `submit` call.
+            A client reconnecting with a Last-Event-ID header is sent only the events it missed,
+            the message is not processed again.
+            User authorization for the conversation is handled by get_authorized_session_state.
             """
             app_runner: Runner = request.app.state.runner
-            return EventSourceResponse(app_runner.stream(user=user, session=adk_session, request=request))
+            try:
+                events = await app_runner.stream_message(
+                    user=user, session=adk_session, msg=message_request, request=request, last_event_id=last_event_id
+                )
+            except TurnRejected as e:
+                raise _too_many_turns(e)
+            return EventSourceResponse(events)
 
         @_app.get("/conversations/{conversation_id}/history", response_model=List[Event])
         async def get_conversation_history(
-            adk_session: Annotated[AdkSession, Depends(get_authorized_session)] # Injects authorized session
+            request: Request,
+            user: Annotated[Dict, Depends(get_authenticated_user)],
+            authorized_conversation_id: Annotated[str, Depends(authorize_conversation)], # Ownership check only, session is not loaded
+            since_event_id: Annotated[Optional[str], Query(description="Return only events after this event id.")] = None,
+            limit: Annotated[Optional[int], Query(ge=1, le=1000, description="Maximum number of events to return.")] = None,
+            fields: Annotated[Optional[str], Query(description="Comma-separated event fields to return, e.g. id,author,timestamp,content,invocationId.")] = None,
+            function_payloads: Annotated[bool, Query(description="Include function call args and function response payloads.")] = True,
+            if_none_match: Annotated[Optional[str], Header()] = None,
         ):
             """
             Retrieves the event history for a specific conversation.
-            User authorization for the conversation is handled by get_authorized_session.
+            Supports incremental paging with since_event_id / limit, a projection of event fields,
+            and conditional requests with ETag / If-None-Match (304 when nothing changed).
+            Only the requested page of events is loaded where the session backend allows it.
+            User authorization for the conversation is handled by authorize_conversation.
             """
+            session_service: BaseSessionService = request.app.state.session_service
+            app_config: Config = request.app.state.config
+            try:
+                field_set = parse_event_fields(fields)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
             try:
-                return adk_session.events
+                app_name_to_use = app_config.AGENT_ID if app_config.AGENT_ID else app_config.APP_NAME
+                events, event_count, last_event_id = await load_history_page(
+                    session_service,
+                    app_name=app_name_to_use,
+                    user_id=user.get("uid"),
+                    session_id=authorized_conversation_id,
+                    since_event_id=since_event_id,
+                    limit=limit,
+                )
+                etag = compute_etag(
+                    authorized_conversation_id, event_count, last_event_id, since_event_id, limit, fields, function_payloads
+                )
+                if etag_matches(if_none_match, etag):
+                    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+                return JSONResponse(
+                    content=[project_event(event, field_set, function_payloads) for event in events],
+                    headers={"ETag": etag},
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
             except HTTPException: # Re-raise HTTPException
                 raise
             except Exception as e:
@@ -208,19 +308,22 @@ def get_fast_api_app(
         @_app.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
         async def delete_conversation(
             request: Request,
-            adk_session: Annotated[AdkSession, Depends(get_authorized_session)] # Injects authorized session
+            user: Annotated[Dict, Depends(get_authenticated_user)],
+            authorized_conversation_id: Annotated[str, Depends(authorize_conversation)] # Ownership check only, session is not loaded
         ):
             """
             Deletes a specific conversation.
-            User authorization for the conversation is handled by get_authorized_session.
+            User authorization for the conversation is handled by authorize_conversation.
             """
             session_service: BaseSessionService = request.app.state.session_service
             app_config: Config = request.app.state.config
+            user_id = user.get("uid")
             try:
                 app_name_to_use = app_config.AGENT_ID if app_config.AGENT_ID else app_config.APP_NAME
                 await session_service.delete_session(
-                    session_id=adk_session.id, user_id=adk_session.user_id, app_name=app_name_to_use
+                    session_id=authorized_conversation_id, user_id=user_id, app_name=app_name_to_use
                 )
+                invalidate_conversation_ownership(user_id, authorized_conversation_id)
                 return Response(status_code=status.HTTP_204_NO_CONTENT)
             except Exception as e:
                 # Log the exception e
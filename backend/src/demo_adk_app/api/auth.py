@@ -1,15 +1,30 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+
 import firebase_admin
 from firebase_admin import auth as firebase_auth # Alias to avoid conflict with local 'auth'
 from fastapi import Depends, HTTPException, status, Path
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Annotated, Optional, Dict
+from typing import Annotated, Optional, Dict, Tuple
 
 from demo_adk_app.utils.config import Config
+from demo_adk_app.api.local_token_verifier import LocalTokenVerifier
+from demo_adk_app.services.session_listing import session_exists
 from google.adk.sessions import Session as AdkSession, BaseSessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
 
 # Module-level globals to store config and session service
 _config_instance: Optional[Config] = None
 _session_service_instance: Optional[BaseSessionService] = None
+# Module-level cache of verified tokens: sha256(token) -> (expires_at, decoded_token), in LRU order
+_token_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+# Module-level cache of confirmed conversation ownership: (user_id, session_id), in LRU order
+_ownership_cache: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+_OWNERSHIP_CACHE_SIZE = 10000
+# Module-level local token verifier, set when AUTH_LOCAL_VERIFICATION is enabled
+_local_verifier_instance: Optional[LocalTokenVerifier] = None
 
 # HTTPBearer security scheme
 security_scheme = HTTPBearer()
@@ -19,21 +34,66 @@ def init_auth_module(config: Config, session_service: BaseSessionService):
     Initializes the authentication module with necessary configurations and services.
     This should be called once during application startup.
     """
-    global _config_instance, _session_service_instance
+    global _config_instance, _session_service_instance, _local_verifier_instance
     _config_instance = config
     _session_service_instance = session_service
+    _token_cache.clear()
+    _ownership_cache.clear()
+
+    # Verify tokens locally against in-memory signing keys if configured,
+    # a local key file allows running the whole auth path without network
+    if _local_verifier_instance:
+        _local_verifier_instance.close()
+        _local_verifier_instance = None
+    if config.AUTH_LOCAL_VERIFICATION or config.AUTH_SIGNING_KEYS_FILE:
+        _local_verifier_instance = LocalTokenVerifier(
+            project_id=config.GOOGLE_CLOUD_PROJECT,
+            keys_file=config.AUTH_SIGNING_KEYS_FILE,
+        )
+        return
 
     # Initialize Firebase Admin SDK if not already initialized
     # Uses GOOGLE_APPLICATION_CREDENTIALS environment variable by default
     if not firebase_admin._apps:
         firebase_admin.initialize_app()
 
+def _get_cached_token(token_hash: str) -> Optional[Dict]:
+    """
+    Returns the cached decoded token for the token hash, if present and not expired.
+    """
+    entry = _token_cache.get(token_hash, None)
+    if entry is None:
+        return None
+    expires_at, decoded_token = entry
+    if expires_at <= time.time():
+        _token_cache.pop(token_hash, None)
+        return None
+    _token_cache.move_to_end(token_hash)
+    return decoded_token
+
+def _cache_token(token_hash: str, decoded_token: Dict):
+    """
+    Caches a decoded token until the earlier of the cache TTL or the token's own expiry,
+    evicting least recently used entries beyond the configured cache size.
+    """
+    max_size = _config_instance.AUTH_TOKEN_CACHE_SIZE if _config_instance else 0
+    if max_size <= 0:
+        return
+    expires_at = time.time() + _config_instance.AUTH_TOKEN_CACHE_TTL
+    if decoded_token.get("exp"):
+        expires_at = min(expires_at, float(decoded_token["exp"]))
+    _token_cache[token_hash] = (expires_at, decoded_token)
+    _token_cache.move_to_end(token_hash)
+    while len(_token_cache) > max_size:
+        _token_cache.popitem(last=False)
+
 async def get_authenticated_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security_scheme)]
 ) -> Dict:
     """
     Verifies the Firebase ID token from the Authorization header.
     Returns the decoded token (user payload) if valid.
+    Verified tokens are cached until they expire, so repeated requests skip verification.
     """
     token = credentials.credentials
     if not token:
@@ -42,8 +102,18 @@ async def get_authenticated_user(
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    decoded_token = _get_cached_token(token_hash)
+    if decoded_token is not None:
+        return decoded_token
     try:
-        decoded_token = firebase_auth.verify_id_token(token)
+        if _local_verifier_instance:
+            # signing keys are in memory, verification is CPU only
+            decoded_token = _local_verifier_instance.verify_id_token(token)
+        else:
+            # verification is blocking (may fetch signing certificates), run it off the event loop
+            decoded_token = await asyncio.to_thread(firebase_auth.verify_id_token, token)
+        _cache_token(token_hash, decoded_token)
         return decoded_token
     except firebase_auth.InvalidIdTokenError as e:
         raise HTTPException(
@@ -58,13 +128,24 @@ async def get_authenticated_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-async def get_authorized_session(
-    conversation_id: Annotated[str, Path(description="The ID of the conversation to access.")],
-    user: Annotated[Dict, Depends(get_authenticated_user)]
-) -> AdkSession:
+def cache_conversation_ownership(user_id: str, session_id: str):
     """
-    Retrieves a conversation session if the authenticated user is authorized.
-    Checks if the auth module has been initialized.
+    Records that the user owns the conversation, e.g. after creating or loading it.
+    """
+    _ownership_cache[(user_id, session_id)] = True
+    _ownership_cache.move_to_end((user_id, session_id))
+    while len(_ownership_cache) > _OWNERSHIP_CACHE_SIZE:
+        _ownership_cache.popitem(last=False)
+
+def invalidate_conversation_ownership(user_id: str, session_id: str):
+    """
+    Forgets cached ownership of a conversation, must be called when the conversation is deleted.
+    """
+    _ownership_cache.pop((user_id, session_id), None)
+
+def _get_user_id(user: Dict) -> str:
+    """
+    Checks the auth module is initialized and returns the authenticated user's id.
     """
     if not _config_instance or not _session_service_instance:
         # This indicates a server-side configuration error.
@@ -80,17 +161,26 @@ async def get_authorized_session(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User ID (uid) not found in token.",
         )
+    return user_id
 
+async def _load_authorized_session(
+    conversation_id: str, user: Dict, config: Optional[GetSessionConfig] = None
+) -> AdkSession:
+    """
+    Loads a conversation session of the authenticated user, raising 404 if it does not exist.
+    """
+    user_id = _get_user_id(user)
     try:
         app_name_to_use = _config_instance.AGENT_ID if _config_instance.AGENT_ID else _config_instance.APP_NAME
         adk_session: Optional[AdkSession] = await _session_service_instance.get_session(
-            session_id=conversation_id, user_id=user_id, app_name=app_name_to_use
+            session_id=conversation_id, user_id=user_id, app_name=app_name_to_use, config=config
         )
         if not adk_session:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, 
                 detail="Conversation not found or user not authorized."
             )
+        cache_conversation_ownership(user_id, conversation_id)
         return adk_session
     except HTTPException: # Re-raise known HTTPExceptions (like the 404 above)
         raise
@@ -101,3 +191,54 @@ async def get_authorized_session(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
             detail=f"An error occurred while retrieving the conversation: {str(e)}"
         )
+
+async def get_authorized_session(
+    conversation_id: Annotated[str, Path(description="The ID of the conversation to access.")],
+    user: Annotated[Dict, Depends(get_authenticated_user)]
+) -> AdkSession:
+    """
+    Retrieves a conversation session, with its full event history, if the authenticated user is authorized.
+    Checks if the auth module has been initialized.
+    """
+    return await _load_authorized_session(conversation_id, user)
+
+async def get_authorized_session_state(
+    conversation_id: Annotated[str, Path(description="The ID of the conversation to access.")],
+    user: Annotated[Dict, Depends(get_authenticated_user)]
+) -> AdkSession:
+    """
+    Retrieves a state-only view of a conversation session if the authenticated user is authorized.
+    The session's state is complete but only its latest event is loaded, for routes that don't need the history.
+    """
+    return await _load_authorized_session(conversation_id, user, config=GetSessionConfig(num_recent_events=1))
+
+async def authorize_conversation(
+    conversation_id: Annotated[str, Path(description="The ID of the conversation to access.")],
+    user: Annotated[Dict, Depends(get_authenticated_user)]
+) -> str:
+    """
+    Confirms the authenticated user owns the conversation without loading the session,
+    using the in-process ownership cache when possible.
+    Returns the conversation id.
+    """
+    user_id = _get_user_id(user)
+    if _ownership_cache.get((user_id, conversation_id), False):
+        _ownership_cache.move_to_end((user_id, conversation_id))
+        return conversation_id
+    try:
+        app_name_to_use = _config_instance.AGENT_ID if _config_instance.AGENT_ID else _config_instance.APP_NAME
+        owned = await session_exists(
+            _session_service_instance, app_name=app_name_to_use, user_id=user_id, session_id=conversation_id
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            detail=f"An error occurred while retrieving the conversation: {str(e)}"
+        )
+    if not owned:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail="Conversation not found or user not authorized."
+        )
+    cache_conversation_ownership(user_id, conversation_id)
+    return conversation_id
@@ -0,0 +1,91 @@
+import hashlib
+from typing import Any, Dict, List, Optional, Set
+
+from google.adk.events import Event
+
+
+def page_events(events: List[Event], since_event_id: Optional[str], limit: Optional[int]) -> List[Event]:
+    """
+    Returns the events after `since_event_id` (all events if not given), up to `limit` events.
+
+    Raises:
+        ValueError: if `since_event_id` is not an event of the session.
+    """
+    start = 0
+    if since_event_id:
+        for index in range(len(events) - 1, -1, -1):
+            if events[index].id == since_event_id:
+                start = index + 1
+                break
+        else:
+            raise ValueError(f"event {since_event_id} not found in conversation")
+    end = start + limit if limit else len(events)
+    return events[start:end]
+
+
+def compute_etag(session_id: str, event_count: int, last_event_id: Optional[str], *query_params: Any) -> str:
+    """
+    Computes a weak ETag for a history response, from the session's event count, latest event id
+    and the query parameters. Events are append only, so the count and last event id identify the history's version.
+    """
+    raw = "|".join(str(part) for part in (session_id, event_count, last_event_id or "", *query_params))
+    return f'W/"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks an If-None-Match header value against an ETag.
+    """
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+# event field names by the camelCase alias used in responses, and by their own name
+_EVENT_FIELDS = {
+    **{name: name for name in Event.model_fields},
+    **{field.alias: name for name, field in Event.model_fields.items() if field.alias},
+}
+
+
+def parse_event_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """
+    Parses a comma-separated list of event fields, given as response (camelCase) or snake_case names.
+
+    Returns:
+        The event field names, None if no fields were given.
+
+    Raises:
+        ValueError: if a name is not an event field.
+    """
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else []
+    if not names:
+        return None
+    unknown = [name for name in names if name not in _EVENT_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown event fields: {', '.join(unknown)}")
+    return {_EVENT_FIELDS[name] for name in names}
+
+
+def project_event(event: Event, fields: Optional[Set[str]], function_payloads: bool) -> Dict[str, Any]:
+    """
+    Serializes an event for the history response, with camelCase field names.
+
+    Args:
+        event: The ADK event to serialize.
+        fields: Top level event fields to include (see `parse_event_fields`), all fields if None.
+            Empty fields are omitted from a projection.
+        function_payloads: If False, function call args and function response payloads are dropped.
+
+    Returns:
+        JSON compatible dict of the event.
+    """
+    data = event.model_dump(mode="json", include=fields, exclude_none=fields is not None, by_alias=True)
+    if not function_payloads and data.get("content"):
+        for part in data["content"].get("parts", None) or []:
+            if part.get("functionCall"):
+                part["functionCall"].pop("args", None)
+            if part.get("functionResponse"):
+                part["functionResponse"].pop("response", None)
+    return data
@@ -8,6 +8,7 @@ from demo_adk_app.services.provider import (
     get_session_service,
     get_memory_service,
     get_artifact_service,
+    get_pending_message_store,
 )
 from demo_adk_app.services.runner import Runner
 from demo_adk_app.api.auth import init_auth_module # Import the init function
@@ -39,6 +40,7 @@ root_agent = get_root_agent(config=app_config)
 session_service = get_session_service(config=app_config)
 memory_service = get_memory_service(config=app_config)
 artifact_service = get_artifact_service(config=app_config)
+pending_message_store = get_pending_message_store(config=app_config, session_service=session_service)
 
 # Initialize the Runner
 app_runner = Runner(
@@ -47,6 +49,7 @@ app_runner = Runner(
     memory_service=memory_service,
     artifact_service=artifact_service,
     config=app_config,
+    pending_message_store=pending_message_store,
 )
 
 # Initialize the auth module with config and session_service
@@ -0,0 +1,209 @@
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from datetime import timezone
+from typing import Any, Dict, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import (
+    BaseSessionService,
+    DatabaseSessionService,
+    Session as AdkSession,
+)
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+_CacheKey = Tuple[str, str, str]
+
+
+def _copy_session(session: AdkSession, config: Optional[GetSessionConfig] = None) -> AdkSession:
+    """
+    Copies a session for a caller, sharing the (immutable) event objects but not the events list or state,
+    and applies the event filters of a GetSessionConfig. The state is deep copied, callers may mutate its values.
+    """
+    events = list(session.events)
+    if config:
+        if config.num_recent_events:
+            events = events[-config.num_recent_events:]
+        if config.after_timestamp:
+            events = [event for event in events if event.timestamp >= config.after_timestamp]
+    return AdkSession(
+        id=session.id,
+        app_name=session.app_name,
+        user_id=session.user_id,
+        state=copy.deepcopy(session.state),
+        events=events,
+        last_update_time=session.last_update_time,
+    )
+
+
+class CachingSessionService(BaseSessionService):
+    """
+    Write-through session cache in front of a session service backend.
+
+    Hot sessions are kept in an LRU with size and TTL limits. Appended events are written to the backend
+    and applied to the cached session, so reads within a worker stay consistent. For database backends,
+    the session's update time, event count and latest event are checked on every hit, so events and state
+    changes written by other workers are detected. Other backends have no such check, a session changed
+    by another worker is served stale until its TTL expires, so they are cached in single worker deployments only.
+    """
+
+    def __init__(self, backend: BaseSessionService, max_size: int = 1000, ttl_seconds: float = 300):
+        """
+        Initializes the cache.
+
+        Args:
+            backend: The session service sessions are read from and written to.
+            max_size: Maximum number of cached sessions, least recently used are evicted.
+            ttl_seconds: Maximum seconds a session is served from cache before being re-read.
+        """
+        self.backend = backend
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._cache: "OrderedDict[_CacheKey, Tuple[float, AdkSession]]" = OrderedDict()
+        self.metrics: Dict[str, int] = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def _put(self, session: AdkSession):
+        key = (session.app_name, session.user_id, session.id)
+        self._cache[key] = (time.monotonic(), _copy_session(session))
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def _fetch_database_version(
+        self, app_name: str, user_id: str, session_id: str
+    ) -> Optional[Tuple[float, int, Optional[str]]]:
+        """
+        Reads the session's update time, number of events and latest event id from a database backend,
+        without loading the events. The update time only changes with the session state, the events
+        tell events without a state delta apart.
+        """
+        from sqlalchemy import func
+        from google.adk.sessions.database_session_service import StorageEvent, StorageSession
+
+        with self.backend.database_session_factory() as sql_session:
+            row = (
+                sql_session.query(StorageSession.update_time)
+                .filter(StorageSession.app_name == app_name)
+                .filter(StorageSession.user_id == user_id)
+                .filter(StorageSession.id == session_id)
+                .first()
+            )
+            if row is None:
+                return None
+            events = (
+                sql_session.query(StorageEvent)
+                .filter(StorageEvent.app_name == app_name)
+                .filter(StorageEvent.user_id == user_id)
+                .filter(StorageEvent.session_id == session_id)
+            )
+            event_count = events.with_entities(func.count()).scalar()
+            latest = events.with_entities(StorageEvent.id).order_by(StorageEvent.timestamp.desc()).first()
+        update_time = row.update_time
+        if self.backend.db_engine.dialect.name == "sqlite":
+            # SQLite returns naive datetimes stored in UTC
+            update_time = update_time.replace(tzinfo=timezone.utc)
+        return update_time.timestamp(), event_count, latest.id if latest else None
+
+    async def _is_current(self, session: AdkSession) -> bool:
+        """
+        Checks a cached session was not updated by another worker, when the backend allows a cheap check.
+        """
+        if not isinstance(self.backend, DatabaseSessionService):
+            return True
+        version = await asyncio.to_thread(
+            self._fetch_database_version, session.app_name, session.user_id, session.id
+        )
+        if version is None:
+            return False
+        update_time, event_count, latest_event_id = version
+        return (
+            update_time <= session.last_update_time
+            and event_count == len(session.events)
+            and latest_event_id == (session.events[-1].id if session.events else None)
+        )
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> AdkSession:
+        session = await self.backend.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        if self._max_size > 0:
+            self._put(session)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[AdkSession]:
+        key = (app_name, user_id, session_id)
+        entry = self._cache.get(key, None)
+        if entry is not None:
+            cached_at, cached = entry
+            if time.monotonic() - cached_at <= self._ttl_seconds and await self._is_current(cached):
+                self._cache.move_to_end(key)
+                self.metrics["hits"] += 1
+                return _copy_session(cached, config)
+            self.metrics["stale"] += 1
+            self._cache.pop(key, None)
+
+        self.metrics["misses"] += 1
+        if self._max_size <= 0 or (config and (config.num_recent_events or config.after_timestamp)):
+            # filtered reads let the backend skip loading the full history, and are not cached
+            return await self.backend.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id, config=config
+            )
+        session = await self.backend.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        if session is None:
+            return None
+        self._put(session)
+        return session
+
+    def invalidate(self, app_name: str, user_id: str, session_id: str):
+        """
+        Drops a session from the cache, for changes made to the backend behind the cache's back.
+        """
+        self._cache.pop((app_name, user_id, session_id), None)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return await self.backend.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._cache.pop((app_name, user_id, session_id), None)
+        await self.backend.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session: AdkSession, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        try:
+            # write through, the backend also applies the event to the passed in session
+            event = await self.backend.append_event(session=session, event=event)
+        except Exception:
+            self._cache.pop(key, None)
+            raise
+        entry = self._cache.get(key, None)
+        if entry is None or event.partial:
+            return event
+        cached_at, cached = entry
+        if event.actions and event.actions.state_delta:
+            for state_key, value in event.actions.state_delta.items():
+                if not state_key.startswith(State.TEMP_PREFIX):
+                    cached.state[state_key] = value
+        cached.events.append(event)
+        cached.last_update_time = session.last_update_time
+        return event
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService, Session as AdkSession
+
+from demo_adk_app.utils.constants import StateVariables
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+
+class BasePendingMessageStore(ABC):
+    """
+    Short-lived store of user messages submitted for streaming, keyed by session.
+    A message is put by the submit request and taken, at most once, by the following stream request.
+    """
+
+    @abstractmethod
+    async def put(self, session: AdkSession, text: str) -> None:
+        """
+        Stores the pending message of a session, replacing any previous one.
+        """
+
+    @abstractmethod
+    async def pop(self, session: AdkSession) -> Optional[str]:
+        """
+        Removes and returns the pending message of a session, None if there is none or it expired.
+        """
+
+
+class SessionStatePendingMessageStore(BasePendingMessageStore):
+    """
+    Pending message store in the session's state, shared by all workers through the session service.
+    Costs a persisted system event to put a message and another one to take it.
+    """
+
+    def __init__(self, session_service: BaseSessionService):
+        """
+        Initializes the store.
+
+        Args:
+            session_service: The session service the session state is written to.
+        """
+        self._session_service = session_service
+
+    async def _append_state(self, session: AdkSession, invocation_id: str, text: Optional[str]):
+        await self._session_service.append_event(session=session, event=Event(
+            invocation_id=invocation_id,
+            author="system",
+            actions=EventActions(state_delta={StateVariables.LAST_USER_MESSAGE: text}),
+            timestamp=time.time(),
+        ))
+
+    async def put(self, session: AdkSession, text: str) -> None:
+        await self._append_state(session, "last_user_message_submit", text)
+
+    async def pop(self, session: AdkSession) -> Optional[str]:
+        text = session.state.get(StateVariables.LAST_USER_MESSAGE, None)
+        if text:
+            await self._append_state(session, "last_user_message_clear", None)
+        return text
+
+
+class InMemoryPendingMessageStore(BasePendingMessageStore):
+    """
+    Pending message store held in process memory, for single worker deployments only:
+    the stream request must reach the worker that received the submit request.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_size: int = 10000):
+        """
+        Initializes the store.
+
+        Args:
+            ttl_seconds: Seconds after which an unclaimed message expires.
+            max_size: Maximum number of pending messages, oldest are dropped.
+        """
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._messages: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def put(self, session: AdkSession, text: str) -> None:
+        self._messages.pop(session.id, None)
+        self._messages[session.id] = (time.monotonic() + self._ttl_seconds, text)
+        while len(self._messages) > self._max_size:
+            self._messages.popitem(last=False)
+
+    async def pop(self, session: AdkSession) -> Optional[str]:
+        entry = self._messages.pop(session.id, None)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        return text if time.monotonic() < expires_at else None
+
+
+class DatabasePendingMessageStore(BasePendingMessageStore):
+    """
+    Pending message store in a database table, shared by all workers of a multi-worker deployment.
+    """
+
+    def __init__(self, db_url: str, ttl_seconds: float = 300):
+        """
+        Initializes the store, creating its table if needed.
+
+        Args:
+            db_url: SQLAlchemy database URL.
+            ttl_seconds: Seconds after which an unclaimed message expires.
+        """
+        from sqlalchemy import Column, Float, MetaData, String, Table, Text, create_engine
+
+        self._ttl_seconds = ttl_seconds
+        self._engine = create_engine(db_url)
+        self._table = Table(
+            "pending_messages",
+            MetaData(),
+            Column("session_id", String(128), primary_key=True),
+            Column("text", Text, nullable=False),
+            Column("expires_at", Float, nullable=False, index=True),
+        )
+        self._table.create(self._engine, checkfirst=True)
+
+    def _put(self, session_id: str, text: str):
+        now = time.time()
+        with self._engine.begin() as connection:
+            # also drop expired messages that were never claimed
+            connection.execute(self._table.delete().where(
+                (self._table.c.session_id == session_id) | (self._table.c.expires_at < now)
+            ))
+            connection.execute(self._table.insert().values(
+                session_id=session_id, text=text, expires_at=now + self._ttl_seconds
+            ))
+
+    def _pop(self, session_id: str) -> Optional[str]:
+        with self._engine.begin() as connection:
+            row = connection.execute(
+                self._table.select().where(self._table.c.session_id == session_id)
+            ).first()
+            if row is None:
+                return None
+            deleted = connection.execute(self._table.delete().where(
+                (self._table.c.session_id == session_id) & (self._table.c.expires_at == row.expires_at)
+            ))
+        # a concurrent pop of the same message claims it only once
+        if deleted.rowcount != 1 or row.expires_at < time.time():
+            return None
+        return row.text
+
+    async def put(self, session: AdkSession, text: str) -> None:
+        await asyncio.to_thread(self._put, session.id, text)
+
+    async def pop(self, session: AdkSession) -> Optional[str]:
+        return await asyncio.to_thread(self._pop, session.id)
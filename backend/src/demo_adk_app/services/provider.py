@@ -26,6 +26,13 @@ import vertexai # For Vertex AI specific initializations
 from vertexai import agent_engines, rag
 
 from demo_adk_app.utils.config import Config
+from demo_adk_app.services.cached_session_service import CachingSessionService
+from demo_adk_app.services.pending_messages import (
+    BasePendingMessageStore,
+    InMemoryPendingMessageStore,
+    DatabasePendingMessageStore,
+    SessionStatePendingMessageStore,
+)
 from demo_adk_app.simple_agent.agent import root_agent as simple_agent_instance
 from demo_adk_app.agents.game_master_agent.agent import root_agent as game_master_agent
 
@@ -37,6 +44,8 @@ _singleton_session_service: Optional[BaseSessionService] = None
 _singleton_memory_service: Optional[BaseMemoryService] = None
 # Module-level variable to hold the singleton instance of the artifact service
 _singleton_artifact_service: Optional[BaseArtifactService] = None
+# Module-level variable to hold the singleton instance of the pending message store
+_singleton_pending_message_store: Optional[BasePendingMessageStore] = None
 
 
 def get_root_agent(config: Config) -> BaseAgent:
@@ -61,6 +70,26 @@ def get_root_agent(config: Config) -> BaseAgent:
     return _singleton_root_agent
 
 
+def _with_session_cache(session_service: BaseSessionService, config: Config) -> BaseSessionService:
+    """
+    Wraps a database session service with a write-through cache of hot sessions, unless disabled.
+    Only database backends let the cache detect sessions changed by other workers.
+
+    Args:
+        session_service: The session service backend to wrap.
+        config: The application configuration object.
+
+    Returns:
+        The cached session service, or the backend itself if SESSION_CACHE_SIZE is 0.
+    """
+    if config.SESSION_CACHE_SIZE <= 0:
+        return session_service
+    print(f"Caching up to {config.SESSION_CACHE_SIZE} sessions for {config.SESSION_CACHE_TTL} seconds.")
+    return CachingSessionService(
+        session_service, max_size=config.SESSION_CACHE_SIZE, ttl_seconds=config.SESSION_CACHE_TTL
+    )
+
+
 def get_session_service(config: Config) -> BaseSessionService:
     """
     Initializes and returns a singleton instance of a session service.
@@ -72,6 +101,7 @@ def get_session_service(config: Config) -> BaseSessionService:
     3. If DB_URL is not set (or DatabaseSessionService failed),
        VertexAiSessionService is attempted using PROJECT_ID and LOCATION.
     4. As a fallback, InMemorySessionService is used.
+    The database session service is wrapped in a CachingSessionService.
 
     Args:
         config: The application configuration object.
@@ -137,7 +167,7 @@ def get_session_service(config: Config) -> BaseSessionService:
             print(f"Attempting to use DatabaseSessionService with DB_URL: {config.DB_URL}")
             # Note: Using DatabaseSessionService might require 'sqlalchemy' and a DB driver.
             # Consider adding 'google-adk[database]' or 'sqlalchemy' to requirements.txt.
-            _singleton_session_service = DatabaseSessionService(db_url=config.DB_URL)
+            _singleton_session_service = _with_session_cache(DatabaseSessionService(db_url=config.DB_URL), config)
             print("Successfully initialized DatabaseSessionService.")
             return _singleton_session_service
         except Exception as e:
@@ -148,6 +178,7 @@ def get_session_service(config: Config) -> BaseSessionService:
     # This assumes that if DB_URL was set but failed, we still try VertexAI as a cloud-native option.
     try:
         print(f"Attempting to use VertexAiSessionService with default project and location.")
+        # not cached, sessions changed by other instances could not be detected
         _singleton_session_service = VertexAiSessionService(
             project=None, location=None
         )
@@ -258,3 +289,48 @@ def get_artifact_service(config: Config) -> BaseArtifactService:
     print("Falling back to InMemoryArtifactService.")
     _singleton_artifact_service = InMemoryArtifactService()
     return _singleton_artifact_service
+
+
+def get_pending_message_store(config: Config, session_service: BaseSessionService) -> BasePendingMessageStore:
+    """
+    Initializes and returns a singleton instance of a pending message store.
+
+    The type of store is determined based on the application configuration:
+    1. If PENDING_MESSAGE_BACKEND is "database" or "auto" and DB_URL is set, DatabasePendingMessageStore is attempted.
+    2. If PENDING_MESSAGE_BACKEND is "memory", InMemoryPendingMessageStore is used (single worker deployments only).
+    3. Otherwise, or if the database store fails, SessionStatePendingMessageStore is used,
+       costing two system events per turn.
+
+    Args:
+        config: The application configuration object.
+        session_service: The session service of the session state store.
+
+    Returns:
+        A singleton instance of a BasePendingMessageStore.
+    """
+    global _singleton_pending_message_store
+    if _singleton_pending_message_store is not None:
+        return _singleton_pending_message_store
+
+    # 1. Check for a database backed store
+    if config.PENDING_MESSAGE_BACKEND in ("database", "auto") and config.DB_URL:
+        try:
+            print("Attempting to use DatabasePendingMessageStore with DB_URL.")
+            _singleton_pending_message_store = DatabasePendingMessageStore(
+                db_url=config.DB_URL, ttl_seconds=config.PENDING_MESSAGE_TTL
+            )
+            print("Successfully initialized DatabasePendingMessageStore.")
+            return _singleton_pending_message_store
+        except Exception as e:
+            print(f"Failed to initialize DatabasePendingMessageStore: {e}. Falling back to SessionStatePendingMessageStore.")
+
+    # 2. Check for the in-process store
+    if config.PENDING_MESSAGE_BACKEND == "memory":
+        print("Using InMemoryPendingMessageStore, stream requests must reach the worker of their submit request.")
+        _singleton_pending_message_store = InMemoryPendingMessageStore(ttl_seconds=config.PENDING_MESSAGE_TTL)
+        return _singleton_pending_message_store
+
+    # 3. Fallback to SessionStatePendingMessageStore
+    print("Using SessionStatePendingMessageStore.")
+    _singleton_pending_message_store = SessionStatePendingMessageStore(session_service)
+    return _singleton_pending_message_store
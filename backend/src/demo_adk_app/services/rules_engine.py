@@ -0,0 +1,198 @@
+import logging
+import re
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from google.adk.sessions.state import State
+
+from demo_adk_app.utils.constants import StateVariables
+from demo_adk_app.utils.tools import _load_game_room, _get_current_game_id
+from demo_adk_app.agents.dealer_agent.tools import player_hit, player_stand, play_dealer_hand, estimate_odds_tool
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+# name of the agent the fast path acts on behalf of
+DEALER_AGENT_NAME = "dealer_agent"
+
+# user messages recognized as player actions, after normalization
+_PLAYER_ACTIONS = {
+    "hit": "hit",
+    "hit me": "hit",
+    "stand": "stand",
+    "stay": "stand",
+    "hint": "hint",
+    "odds": "hint",
+}
+_NORMALIZE_PATTERN = re.compile(r"[^a-z ]+")
+
+# payout multiple of the bet returned to the purse for each result (bet is deducted when placed)
+_PAYOUTS = {
+    "win": 2.0,
+    "blackjack_win": 2.5,
+    "push": 1.0,
+    "loss": 0.0,
+}
+
+
+class FastPathResult(BaseModel):
+    """
+    Outcome of a player action handled by the rules engine without an LLM call.
+    """
+    text: str = Field(..., description="markdown response for the user")
+    function_calls: List[str] = Field([], description="names of the dealer tools that were run")
+    state_delta: Dict = Field({}, description="session state changes made by the tools")
+
+
+class _StateToolContext:
+    """
+    Minimal stand-in for ADK's ToolContext, dealer tools only use its state and invocation id.
+    Changes are tracked as a delta without touching the session's state.
+    """
+
+    def __init__(self, session_state: Dict):
+        # tools share the game rooms loaded within the same invocation
+        self.invocation_id = f"fast-path-{uuid.uuid4()}"
+        self.state_delta: Dict = {}
+        self.state = State(value=dict(session_state), delta=self.state_delta)
+
+
+def parse_player_action(text: str) -> Optional[str]:
+    """
+    Recognizes a "hit", "stand" or "hint" action in a user message.
+
+    Args:
+        text: The user's message text.
+
+    Returns:
+        "hit", "stand" or "hint" if the message is just that action, otherwise None.
+    """
+    normalized = " ".join(_NORMALIZE_PATTERN.sub(" ", text.lower()).split())
+    return _PLAYER_ACTIONS.get(normalized, None)
+
+
+def _settle_purse(tool_context: _StateToolContext, bet, result: str) -> Optional[float]:
+    """
+    Pays out a settled hand into the user's purse, when purse and bet are numeric.
+
+    Returns:
+        The new purse value, or None if the purse could not be settled.
+    """
+    try:
+        purse = float(tool_context.state.get(StateVariables.USER_PURSE, None))
+        bet = float(bet)
+    except (TypeError, ValueError):
+        return None
+    purse += bet * _PAYOUTS.get(result, 0.0)
+    purse = int(purse) if purse.is_integer() else purse
+    tool_context.state[StateVariables.USER_PURSE] = purse
+    return purse
+
+
+async def _find_player_game(session_state: Dict, tool_context: _StateToolContext) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Finds the id the user was registered with by the game room tools, and their current game room.
+    Agents register the session's USER_ID, which is the user's email or uid depending on how the session
+    was started, so both are tried.
+
+    Returns:
+        The player id and game room id, or (None, None) if the user is not enrolled in a game.
+    """
+    user_details = session_state.get(StateVariables.USER_DETAILS, None) or {}
+    candidates = [
+        session_state.get(StateVariables.USER_ID, None),
+        user_details.get("uid", None),
+        user_details.get("email", None),
+    ]
+    for player_id in dict.fromkeys(candidate for candidate in candidates if candidate):
+        game_room_id = await _get_current_game_id(player_id, tool_context)
+        if game_room_id:
+            return player_id, game_room_id
+    return None, None
+
+
+async def run_player_action(session_state: Dict, text: str) -> Optional[FastPathResult]:
+    """
+    Handles a "hit" or "stand" message by running the dealer tools directly, or a "hint" with the odds engine,
+    and plays the dealer's hand once no player has a hand in play.
+
+    Args:
+        session_state: The current session state.
+        text: The user's message text.
+
+    Returns:
+        A FastPathResult, or None if the message must be handled by the agents.
+    """
+    action = parse_player_action(text)
+    if not action:
+        return None
+
+    tool_context = _StateToolContext(session_state)
+    player_id, game_room_id = await _find_player_game(session_state, tool_context)
+    if not game_room_id:
+        return None
+
+    game_room, error = await _load_game_room(game_room_id, tool_context)
+    if error or game_room.game_status != "playing" or game_room.player_hand_status.get(player_id, None) != "playing":
+        return None
+
+    lines: List[str] = []
+    function_calls: List[str] = []
+    if action == "hint":
+        response = await estimate_odds_tool(game_room_id, player_id, tool_context)
+        if response.get("status", None) != "success":
+            logger.warning(f"fast path estimate_odds_tool failed, falling back to agents: {response}")
+            return None
+        lines.append(
+            f"With **{response['player_score']}** against the dealer's **{response['dealer_up_card']}**, "
+            f"standing wins **{response['stand']['win']:.0%}** of the time, "
+            f"and a hit busts **{response['bust_probability_on_hit']:.0%}** of the time."
+        )
+        lines.append(f"Basic strategy says: **{response['recommendation']}**.")
+        return FastPathResult(text="\n\n".join(lines), function_calls=["estimate_odds_tool"])
+    if action == "hit":
+        response = await player_hit(game_room_id, player_id, tool_context)
+        function_calls.append("player_hit")
+        if response.get("status", None) != "success":
+            logger.warning(f"fast path player_hit failed, falling back to agents: {response}")
+            return None
+        lines.append(f"You drew the **{response['new_card']}**, your score is now **{response['player_score']}**.")
+        if response["player_hand_status"] == "busted":
+            lines.append("You **bust**!")
+        elif response["player_hand_status"] == "stood_21":
+            lines.append("That's **21**, you stand.")
+    else:
+        response = await player_stand(game_room_id, player_id, tool_context)
+        function_calls.append("player_stand")
+        if response.get("status", None) != "success":
+            logger.warning(f"fast path player_stand failed, falling back to agents: {response}")
+            return None
+        lines.append(f"You stand on **{response['player_score']}**.")
+
+    # dealer plays once no player has a hand in play
+    game_room, _ = await _load_game_room(game_room_id, tool_context)
+    if all(status != "playing" for status in game_room.player_hand_status.values()):
+        response = await play_dealer_hand(game_room_id, tool_context)
+        function_calls.append("play_dealer_hand")
+        if response.get("status", None) != "success":
+            logger.warning(f"fast path play_dealer_hand failed: {response}")
+            lines.append("The dealer could not complete their turn.")
+        else:
+            dealer_hand = ", ".join(response["dealer_final_hand"])
+            lines.append(f"Dealer's hand: {dealer_hand}, dealer's score is **{response['dealer_final_score']}**.")
+            if response["dealer_final_score"] > 21:
+                lines.append("Dealer **busts**!")
+            result = response["outcomes"].get(player_id, None)
+            if result:
+                lines.append(f"Result: **{result.replace('_', ' ')}**.")
+                bet = game_room.bets.get(player_id, None) or session_state.get(StateVariables.USER_BET, None)
+                purse = _settle_purse(tool_context, bet, result)
+                if purse is not None:
+                    lines.append(f"Your purse is now **{purse}**.")
+
+    return FastPathResult(
+        text="\n\n".join(lines),
+        function_calls=function_calls,
+        state_delta=tool_context.state_delta,
+    )
@@ -1,13 +1,22 @@
 import asyncio
+import hashlib
+import json
 import logging
 import time
-from typing import Dict
+from typing import AsyncIterator, Dict, List, Optional, Set
 import traceback
+import uuid
 from fastapi import Request
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.run_config import RunConfig, StreamingMode
-from google.adk.sessions import BaseSessionService, Session as AdkSession
+from google.adk.sessions import (
+    BaseSessionService,
+    InMemorySessionService,
+    DatabaseSessionService,
+    VertexAiSessionService,
+    Session as AdkSession,
+)
 from google.adk.memory import BaseMemoryService
 from google.adk.artifacts import BaseArtifactService
 from google.adk.runners import Runner as AdkRunner # Alias to avoid name collision
@@ -16,6 +25,18 @@ from google.adk.events import Event, EventActions # Import Event for type hintin
 from demo_adk_app.utils.config import Config
 from demo_adk_app.utils.constants import StateVariables
 from demo_adk_app.api.models import Message, StreamingEvent
+from demo_adk_app.services.cached_session_service import CachingSessionService
+from demo_adk_app.services.rules_engine import FastPathResult, run_player_action, DEALER_AGENT_NAME
+from demo_adk_app.services.session_compaction import compact_session
+from demo_adk_app.services.stream_coalescer import coalesce_streaming_events
+from demo_adk_app.services.pending_messages import (
+    BasePendingMessageStore,
+    InMemoryPendingMessageStore,
+    SessionStatePendingMessageStore,
+)
+from demo_adk_app.services.turn_streams import TurnStream, TurnStreamRegistry
+from demo_adk_app.services.turn_scheduler import TurnScheduler, TurnTicket
+from demo_adk_app.services.turn_interruption import TurnProgress
 
 
 def log_event(event: Event) -> str:
@@ -52,6 +73,15 @@ def log_event(event: Event) -> str:
 # Get a logger instance for this module
 logger = logging.getLogger(__name__)
 
+# Session services known to apply an appended event's state_delta to the passed in session object,
+# for these there is no need to re-read the session after appending a system event
+_IN_PLACE_APPEND_SESSION_SERVICES = (
+    InMemorySessionService,
+    DatabaseSessionService,
+    VertexAiSessionService,
+    CachingSessionService,
+)
+
 class Runner:
     """
     A class to encapsulate the execution of an agent using the ADK Runner.
@@ -64,6 +94,7 @@ class Runner:
         memory_service: BaseMemoryService,
         artifact_service: BaseArtifactService,
         config: Config,
+        pending_message_store: Optional[BasePendingMessageStore] = None,
     ):
         """
         Initializes the Runner.
@@ -74,12 +105,243 @@ class Runner:
             memory_service: The memory service for agent memory.
             artifact_service: The artifact service for handling artifacts.
             config: The application configuration.
+            pending_message_store: Store of messages submitted for streaming, the session state if not given.
         """
         self._root_agent = root_agent
         self._session_service = session_service
         self._memory_service = memory_service
         self._artifact_service = artifact_service
         self._config = config # Stored if needed for future runner configurations
+        # submitted messages are handed to the stream request through the session state, unless a store
+        # not costing two persisted events per turn is configured
+        self._pending_messages = pending_message_store or SessionStatePendingMessageStore(session_service)
+        # messages submitted while a turn of their session is in progress on this worker, kept out of the
+        # session state so the turn's session does not go stale under it
+        self._held_messages = InMemoryPendingMessageStore(ttl_seconds=config.PENDING_MESSAGE_TTL)
+        # ADK runners are stateless between turns, so build them once per app name and reuse them
+        self._adk_runners: Dict[str, AdkRunner] = {}
+        # references to background compaction tasks, so they are not garbage collected while running
+        self._compaction_tasks: Set[asyncio.Task] = set()
+        # turns run in background tasks writing their events to a replay buffer, so they complete
+        # when their client disconnects and a reconnecting client receives the events it missed
+        self._turn_streams = TurnStreamRegistry(
+            max_sessions=config.STREAM_REPLAY_SESSIONS,
+            max_events=config.STREAM_REPLAY_EVENTS,
+            ttl_seconds=config.STREAM_REPLAY_TTL,
+        )
+        self._turn_tasks: Set[asyncio.Task] = set()
+        # one turn at a time per session, so turns don't interleave their session appends and game room saves,
+        # and a cap on the turns of the worker, so load is rejected early instead of piling up
+        self._turn_scheduler = TurnScheduler(
+            policy=config.TURN_CONCURRENCY_POLICY,
+            max_queued=config.TURN_QUEUE_SIZE,
+            max_concurrent=config.MAX_CONCURRENT_TURNS,
+            retry_after=config.TURN_RETRY_AFTER,
+        )
+
+    def _get_adk_runner(self, app_name: str) -> AdkRunner:
+        """
+        Returns the ADK Runner for the given app name, creating it on first use.
+
+        Args:
+            app_name: The application name the ADK Runner is bound to.
+
+        Returns:
+            A long-lived ADK Runner instance shared across all turns.
+        """
+        adk_runner = self._adk_runners.get(app_name, None)
+        if adk_runner is None:
+            adk_runner = AdkRunner(
+                app_name=app_name,
+                agent=self._root_agent,
+                session_service=self._session_service,
+                memory_service=self._memory_service,
+                artifact_service=self._artifact_service,
+            )
+            self._adk_runners[app_name] = adk_runner
+        return adk_runner
+
+    async def _append_system_event(self, session: AdkSession, invocation_id: str, state_delta: Dict) -> AdkSession:
+        """
+        Appends a system event carrying a state delta to the session.
+
+        The state delta is applied to the session object in memory by the session service,
+        the session is only re-read from the service when its backend does not do that.
+
+        Args:
+            session: The ADK session object to update.
+            invocation_id: The invocation id to tag the system event with.
+            state_delta: The state changes to apply to the session.
+
+        Returns:
+            The updated ADK session object.
+        """
+        system_event = Event(
+            invocation_id=invocation_id,
+            author='system',
+            actions=EventActions(state_delta=state_delta),
+            timestamp=time.time()
+        )
+        await self._session_service.append_event(
+            session=session,
+            event=system_event,
+        )
+        if isinstance(self._session_service, _IN_PLACE_APPEND_SESSION_SERVICES):
+            return session
+        app_name_to_use = self._config.AGENT_ID if self._config.AGENT_ID else self._config.APP_NAME
+        return await self._session_service.get_session(
+            app_name=app_name_to_use,
+            user_id=session.user_id,
+            session_id=session.id
+        )
+
+    async def _ensure_user_details(self, session: AdkSession, state_changes: Dict) -> AdkSession:
+        """
+        Makes sure that the session has the user's details for tools to use, appending them
+        while holding the session so the system event does not interleave with a turn.
+        A session with a turn in progress already has them, the turn wrote them first.
+
+        Args:
+            session: The ADK session object for the current interaction.
+            state_changes: The user's details state variables.
+
+        Returns:
+            The updated ADK session object.
+        """
+        if session.state.get(StateVariables.USER_DETAILS, None) or self._turn_scheduler.busy(session.id):
+            return session
+        async with self._turn_scheduler.hold(session.id):
+            session = await self._append_system_event(session, "user_details_update", state_changes)
+        logger.info(f"Updated session {session.id} with state: {session.state}")
+        return session
+
+    async def _reload_session(self, session: AdkSession) -> AdkSession:
+        """
+        Re-reads a session whose state may have been changed by other turns since it was read.
+        """
+        return await self._session_service.get_session(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id
+        )
+
+    async def _record_interrupted_turn(self, session: AdkSession, progress: TurnProgress):
+        """
+        Appends the events of a cancelled agent run that ADK did not record, so the session's next turn
+        sees a response for every function call and the partial response that was streamed.
+
+        Args:
+            session: The ADK session object of the cancelled run.
+            progress: What the run yielded before it was cancelled.
+        """
+        try:
+            # the agent run appended events through its own session object
+            session = await self._reload_session(session)
+            for event in progress.interruption_events(reason="the turn was cancelled before the function completed"):
+                await self._session_service.append_event(session=session, event=event)
+        except Exception as e:
+            logger.error(f"failed to record interrupted turn of session {session.id}: {e}")
+            logger.error(traceback.format_exc())
+
+    def _schedule_compaction(self, session: AdkSession):
+        """
+        Compacts the session's old events in the background after a turn, when compaction is enabled.
+
+        Args:
+            session: The ADK session object of the completed turn.
+        """
+        if self._config.SESSION_COMPACTION_THRESHOLD <= 0:
+            return
+        # one compaction at a time per session
+        if any(task.get_name() == session.id for task in self._compaction_tasks):
+            return
+        task = asyncio.create_task(self._compact_session(session), name=session.id)
+        self._compaction_tasks.add(task)
+        task.add_done_callback(self._compaction_tasks.discard)
+
+    async def _compact_session(self, session: AdkSession):
+        try:
+            # compaction rewrites the session's events, it waits for the session's turns in progress
+            async with self._turn_scheduler.hold(session.id):
+                await compact_session(
+                    self._session_service,
+                    app_name=session.app_name,
+                    user_id=session.user_id,
+                    session_id=session.id,
+                    threshold=self._config.SESSION_COMPACTION_THRESHOLD,
+                    keep_recent=self._config.SESSION_COMPACTION_KEEP_RECENT,
+                    prune_tool_events=bool(self._config.SESSION_COMPACTION_PRUNE_TOOL_EVENTS),
+                )
+        except Exception as e:
+            logger.error(f"failed to compact session {session.id}: {e}")
+            logger.error(traceback.format_exc())
+
+    def _end_event(self, response_chunks: List[str], message_chunks: List[str]) -> StreamingEvent:
+        """
+        Builds the end event of a streamed turn. The client already received every chunk,
+        so unless STREAM_END_PAYLOAD is "full" the event only carries the length and digest
+        of the concatenated data of the turn's "message" events, as the client received it.
+
+        Args:
+            response_chunks: All parts of the turn's response, in order, with its actions and errors.
+            message_chunks: The data of the turn's "message" events, in order.
+
+        Returns:
+            The end StreamingEvent.
+        """
+        if self._config.STREAM_END_PAYLOAD == "full":
+            return StreamingEvent(type="end", data="".join(response_chunks))
+        message_text = "".join(message_chunks)
+        return StreamingEvent(type="end", data=json.dumps({
+            "chars": len(message_text),
+            "sha256": hashlib.sha256(message_text.encode("utf-8")).hexdigest(),
+        }))
+
+    async def _run_fast_path(self, session: AdkSession, text: str) -> Optional[FastPathResult]:
+        """
+        Handles in-game "hit" / "stand" messages with the rules engine, without invoking the agents.
+        The user message and the dealer's response are recorded in the session like an agent turn.
+
+        Args:
+            session: The ADK session object for the current interaction.
+            text: The user's message text.
+
+        Returns:
+            A FastPathResult if the message was handled, None if it must go to the agents.
+        """
+        if not self._config.RULES_FAST_PATH:
+            return None
+        try:
+            result = await run_player_action(session.state, text)
+        except Exception as e:
+            logger.error(f"rules engine failed, falling back to agents: {e}")
+            logger.error(traceback.format_exc())
+            return None
+        if result is None:
+            return None
+
+        invocation_id = f"e-{uuid.uuid4()}"
+        await self._session_service.append_event(
+            session=session,
+            event=Event(
+                invocation_id=invocation_id,
+                author='user',
+                content=types.Content(role='user', parts=[types.Part(text=text)]),
+                timestamp=time.time()
+            ),
+        )
+        await self._session_service.append_event(
+            session=session,
+            event=Event(
+                invocation_id=invocation_id,
+                author=DEALER_AGENT_NAME,
+                content=types.Content(role='model', parts=[types.Part(text=result.text)]),
+                actions=EventActions(state_delta=result.state_delta),
+                timestamp=time.time()
+            ),
+        )
+        logger.info(f"rules engine handled message in session {session.id} with {result.function_calls}")
+        return result
 
     async def invoke(self, user: Dict, session: AdkSession, msg: Message) -> Message:
         """
@@ -92,46 +354,63 @@ class Runner:
 
         Returns:
             A Message object containing the agent's response.
+
+        Raises:
+            TurnRejected: if the turn is not admitted by the turn scheduler.
         """
-        app_name_to_use = self._config.AGENT_ID if self._config.AGENT_ID else self._config.APP_NAME
         # make sure that session has user's details for tools to use
-        if not session.state.get(StateVariables.USER_DETAILS, None):
-            current_time = time.time()
-            state_changes = {
-                StateVariables.USER_DETAILS: user,
-                StateVariables.USER_ID: user.get("email", None)
-            }
-            actions_with_update = EventActions(state_delta=state_changes)
-            system_event = Event(
-                invocation_id="user_details_update",
-                author='system',
-                actions=actions_with_update,
-                timestamp=current_time
-            )
-            await self._session_service.append_event(
-                session=session,
-                event=system_event,
-            )
-            session = await self._session_service.get_session(
-                app_name=app_name_to_use,
-                user_id=session.user_id,
-                session_id=session.id
-            )
-            logger.info(f"Updated session {session.id} with state: {session.state}")
+        session = await self._ensure_user_details(session, {
+            StateVariables.USER_DETAILS: user,
+            StateVariables.USER_ID: user.get("email", None)
+        })
 
-        # Instantiate the ADK Runner
-        adk_runner = AdkRunner(
-            app_name=app_name_to_use,
-            agent=self._root_agent,
-            session_service=self._session_service,
-            memory_service=self._memory_service,
-            artifact_service=self._artifact_service,
-        )
+        ticket = self._turn_scheduler.admit(session.id)
+        try:
+            async with self._turn_scheduler.run(ticket) as waited:
+                if waited:
+                    session = await self._reload_session(session)
+                return await self._invoke_turn(session, msg)
+        except asyncio.CancelledError:
+            if not ticket.cancelled:
+                raise
+            # cancelled by a newer message of the conversation, the request itself is still served
+            task = asyncio.current_task()
+            if hasattr(task, "uncancel"):  # python 3.11+
+                task.uncancel()
+            return Message(text="this message was cancelled by a newer message")
+
+    async def _invoke_turn(self, session: AdkSession, msg: Message) -> Message:
+        """
+        Runs the root agent on a user message and returns the agent's response.
+        When the run is cancelled, what it did not record in the session yet is recorded as an interrupted turn.
+
+        Args:
+            session: The ADK session object for the current interaction.
+            msg: The user's message to the agent.
+
+        Returns:
+            A Message object containing the agent's response.
+        """
+        app_name_to_use = self._config.AGENT_ID if self._config.AGENT_ID else self._config.APP_NAME
+
+        # handle player actions in game without an LLM call when possible
+        fast_path = await self._run_fast_path(session, msg.text)
+        if fast_path:
+            response_chunks = [
+                f"\n{DEALER_AGENT_NAME} calling function: {name} ...\n" for name in fast_path.function_calls
+            ]
+            response_chunks.append(fast_path.text)
+            self._schedule_compaction(session)
+            return Message(text="".join(response_chunks))
+
+        # Reuse the long-lived ADK Runner for this app
+        adk_runner = self._get_adk_runner(app_name_to_use)
 
         # Prepare the user's message in ADK format
         content = types.Content(role='user', parts=[types.Part(text=msg.text)])
 
-        full_response_text = ""  # To accumulate all parts of the response
+        response_chunks: List[str] = []  # To accumulate all parts of the response, joined once at the end
+        progress = TurnProgress(default_author=self._root_agent.name)
 
         # Key Concept: run_async executes the agent logic and yields Events.
         # We iterate through events to find the final answer.
@@ -141,11 +420,12 @@ class Runner:
                 new_message=content,
                 run_config=RunConfig(streaming_mode=StreamingMode.SSE)
             ):
+                progress.track(event)
                 # # accumulate the full response text if needed
                 # if event.content and event.content.parts:
-                #     full_response_text += ''.join(part.text for part in event.content.parts if part.text)
+                #     response_chunks.append(''.join(part.text for part in event.content.parts if part.text))
                 if event.error_message:
-                    full_response_text += f"\n[Event] Author: {event.author}, Type: Error, Message: {event.error_message}\n"
+                    response_chunks.append(f"\n[Event] Author: {event.author}, Type: Error, Message: {event.error_message}\n")
 
                 # You can uncomment the line below to see *all* events during execution
                 logger.info(log_event(event))
@@ -154,10 +434,10 @@ class Runner:
                 if event.is_final_response():
                     #### in case of SSE / streaming, partial response is being collected
                     # if event.content and event.content.parts:
-                    #     # full_response_text += "\n" + ''.join(part.text for part in event.content.parts if part.text)
-                    #     full_response_text = event.content.parts[0].text
+                    #     # response_chunks.append("\n" + ''.join(part.text for part in event.content.parts if part.text))
+                    #     response_chunks = [event.content.parts[0].text]
                     if event.actions and event.actions.escalate:  # Handle potential errors/escalations
-                        full_response_text += f"\nAgent escalated: {event.error_message or 'No specific message.'}\n"
+                        response_chunks.append(f"\nAgent escalated: {event.error_message or 'No specific message.'}\n")
                     #### in case of SSE, we just keep looping until run_async does EOF and loop ends itself
                     #### no need to explicitly break the loop
                     # if event.turn_complete:
@@ -166,22 +446,29 @@ class Runner:
                 else:
                     if event.partial and event.content and event.content.parts:
                         text = ''.join(part.text for part in event.content.parts if part.text)
-                        full_response_text += text
+                        response_chunks.append(text)
                     elif event.actions and event.actions.transfer_to_agent:
-                        full_response_text += f"\n{event.author} transferring to {event.actions.transfer_to_agent} ...\n"
+                        response_chunks.append(f"\n{event.author} transferring to {event.actions.transfer_to_agent} ...\n")
                     elif event.get_function_calls():
                         for function in event.get_function_calls():
-                            full_response_text += f"\n{event.author} calling function: {function.name} ...\n" if function.name != "transfer_to_agent" else ""
+                            if function.name != "transfer_to_agent":
+                                response_chunks.append(f"\n{event.author} calling function: {function.name} ...\n")
 
+        except asyncio.CancelledError:
+            # cancelled by a newer message, the session must not keep function calls without responses
+            logger.info(f"agent run of session {session.id} cancelled")
+            await asyncio.shield(self._record_interrupted_turn(session, progress))
+            raise
         except Exception as e:
             logger.error(e)
             logger.error(traceback.format_exc())
             raise e
 
+        self._schedule_compaction(session)
         # The agent's final response is returned as a string.
         # If the agent returns structured output, it will be a JSON string.
         # This Runner class remains oblivious to that contract and passes it as is.
-        return Message(text=full_response_text)
+        return Message(text="".join(response_chunks))
 
     async def submit(self, user: Dict, session: AdkSession, msg: Message) -> StreamingEvent:
         """
@@ -195,92 +482,284 @@ class Runner:
         Returns:
             A StreamingEvent object containing submission result.
         """
-        state_changes = {
-                StateVariables.LAST_USER_MESSAGE: msg.text,
-            }
+        if self._turn_scheduler.busy(session.id) and isinstance(self._pending_messages, SessionStatePendingMessageStore):
+            # the turn in progress holds the session, its next append would fail on the changed session state
+            await self._held_messages.put(session, msg.text)
+            return StreamingEvent(type="start", data=msg.text)
         # make sure that session has user's details for tools to use
-        if not session.state.get(StateVariables.USER_DETAILS, None):
-            state_changes[StateVariables.USER_DETAILS] = user
-            state_changes[StateVariables.USER_ID] = user.get("uid", None)
-        actions_with_update = EventActions(state_delta=state_changes)
-        current_time = time.time()
-        system_event = Event(
-            invocation_id="last_user_message_submit",
-            author='system',
-            actions=actions_with_update,
-            timestamp=current_time
-        )
-        await self._session_service.append_event(
-            session=session,
-            event=system_event,
-        )
-        app_name_to_use = self._config.AGENT_ID if self._config.AGENT_ID else self._config.APP_NAME
-        session = await self._session_service.get_session(
-            app_name=app_name_to_use,
-            user_id=session.user_id,
-            session_id=session.id
-        )
+        session = await self._ensure_user_details(session, {
+            StateVariables.USER_DETAILS: user,
+            StateVariables.USER_ID: user.get("uid", None),
+        })
+        async with self._turn_scheduler.hold(session.id):
+            await self._pending_messages.put(session, msg.text)
         return StreamingEvent(type="start", data=msg.text)
 
-    async def stream(self, user: Dict, session: AdkSession, request: Request):
+    async def stream(
+        self, user: Dict, session: AdkSession, request: Request, last_event_id: Optional[str] = None
+    ) -> AsyncIterator:
         """
-        Yields StreamingEvent from agents when processing latest user submitted message
+        Starts processing the latest user submitted message, and returns the StreamingEvent of its processing.
+        A client reconnecting with the SSE id of the last event it received is sent the rest of
+        the session's turn instead.
 
         Args:
             user: The authenticated user's details from Firebase ID token.
             session: The ADK session object for the current interaction.
             request: The http request
+            last_event_id: The Last-Event-ID header of a reconnecting client.
 
         Returns:
-            None (events are yielded while processing, no return at end of processing)
+            The serialized events to stream, yielded while processing.
+
+        Raises:
+            TurnRejected: if the turn is not admitted by the turn scheduler.
         """
-        # fetch the last user submitted message from session state
-        last_usr_msg = session.state.get(StateVariables.LAST_USER_MESSAGE, None)
-        if not last_usr_msg:
-            logger.info("there is no last user message to process")
-            yield StreamingEvent(type="error", data="no user message for processing")
-            return
+        turn, after = self._resumable_turn(session, last_event_id)
+        if turn:
+            logger.info(f"resuming stream of session {session.id} after event {after}")
+            return turn.subscribe(after=after)
 
         if not session.state.get(StateVariables.USER_DETAILS, None):
             logger.error("last user message was submitted without user's details")
-            yield StreamingEvent(type="error", data="no user details for processing")
-            return
+            return self._error_events("no user details for processing")
+
+        # admitted before taking the message, so a rejected message is still there when the client retries,
+        # the message is taken by the turn once it holds the session
+        ticket = self._turn_scheduler.admit(session.id)
+        try:
+            turn = self._start_turn(session=session, text=None, ticket=ticket)
+        except BaseException:
+            # failed before the turn started, its admission must not leak
+            ticket.release()
+            raise
+        return turn.subscribe()
+
+    async def stream_message(
+        self, user: Dict, session: AdkSession, msg: Message, request: Request, last_event_id: Optional[str] = None
+    ) -> AsyncIterator:
+        """
+        Starts processing the given user message, and returns the StreamingEvent of its processing.
+        Single request alternative to `submit` followed by `stream`, the message is
+        processed directly without passing it through session state.
+        A client reconnecting with the SSE id of the last event it received is sent the rest of
+        the session's turn instead, without processing the message again.
+
+        Args:
+            user: The authenticated user's details from Firebase ID token.
+            session: The ADK session object for the current interaction.
+            msg: The user's message to the agent.
+            request: The http request
+            last_event_id: The Last-Event-ID header of a reconnecting client.
 
-        # clear last user message from session state
-        actions_with_update = EventActions(state_delta={
-                StateVariables.LAST_USER_MESSAGE: None,
+        Returns:
+            The serialized events to stream, yielded while processing.
+
+        Raises:
+            TurnRejected: if the turn is not admitted by the turn scheduler.
+        """
+        turn, after = self._resumable_turn(session, last_event_id)
+        if turn:
+            logger.info(f"resuming stream of session {session.id} after event {after}")
+            return turn.subscribe(after=after)
+
+        # make sure that session has user's details for tools to use
+        session = await self._ensure_user_details(session, {
+            StateVariables.USER_DETAILS: user,
+            StateVariables.USER_ID: user.get("uid", None),
         })
-        current_time = time.time()
-        system_event = Event(
-            invocation_id="last_user_message_clear",
-            author='system',
-            actions=actions_with_update,
-            timestamp=current_time
-        )
-        await self._session_service.append_event(
-            session=session,
-            event=system_event,
+
+        ticket = self._turn_scheduler.admit(session.id)
+        turn = self._start_turn(
+            session=session, text=msg.text, ticket=ticket, start_event=StreamingEvent(type="start", data=msg.text)
         )
+        return turn.subscribe()
+
+    async def _error_events(self, message: str):
+        yield StreamingEvent(type="error", data=message).model_dump_json()
+
+    def _resumable_turn(self, session: AdkSession, last_event_id: Optional[str]):
+        """
+        Finds the turn a reconnecting client was streaming, if it still has events the client did not receive.
+
+        Args:
+            session: The ADK session object of the stream.
+            last_event_id: The Last-Event-ID header of the request, None for new streams.
+
+        Returns:
+            The TurnStream to resume and the SSE id to resume after, or (None, None).
+        """
+        if not last_event_id:
+            return None, None
+        try:
+            after = int(last_event_id)
+        except ValueError:
+            logger.info(f"ignoring invalid Last-Event-ID {last_event_id!r}")
+            return None, None
+        # a client that received all of the session's completed turns is starting a new one
+        turn = self._turn_streams.get(session.id, after)
+        if turn is None:
+            return None, None
+        return turn, after
+
+    def _start_turn(
+        self, session: AdkSession, text: Optional[str], ticket: TurnTicket, start_event: Optional[StreamingEvent] = None
+    ) -> TurnStream:
+        """
+        Starts processing a user message in a background task writing to a new turn stream of the session.
+        The turn runs once the session's previous turns completed.
+
+        Args:
+            session: The ADK session object for the current interaction.
+            text: The user's message text to process, None to take the last submitted message.
+            ticket: The turn's admission by the turn scheduler.
+            start_event: Event to send ahead of the agent's events, if any.
+
+        Returns:
+            The TurnStream clients read the turn's events from.
+        """
+        turn = self._turn_streams.start(session.id)
+        if start_event:
+            turn.append(start_event.model_dump_json())
+        task = asyncio.create_task(self._write_turn(turn, ticket, session=session, text=text), name=session.id)
+        self._turn_tasks.add(task)
+        task.add_done_callback(self._turn_tasks.discard)
+        task.add_done_callback(lambda _: self._end_turn(turn, ticket))
+        if self._config.STREAM_DISCONNECT_POLICY == "cancel":
+            watcher = asyncio.create_task(self._watch_disconnect(turn, task))
+            self._turn_tasks.add(watcher)
+            watcher.add_done_callback(self._turn_tasks.discard)
+        return turn
+
+    def _end_turn(self, turn: TurnStream, ticket: TurnTicket):
+        """
+        Releases a turn's admission and completes its stream once its task is done. A task cancelled
+        before it started never ran `_write_turn`, which otherwise does both.
+
+        Args:
+            turn: The turn stream clients read the turn's events from.
+            ticket: The turn's admission by the turn scheduler.
+        """
+        ticket.release()
+        if not turn.done:
+            turn.append(StreamingEvent(type="error", data="this turn was cancelled before it started").model_dump_json())
+            turn.finish()
+
+    async def _watch_disconnect(self, turn: TurnStream, task: asyncio.Task):
+        """
+        Cancels a turn's task once no client has been reading the turn for STREAM_DISCONNECT_GRACE_SECONDS,
+        so abandoned turns stop using the model and tools. A client reconnecting within the grace period
+        resumes the turn.
+
+        Args:
+            turn: The turn stream clients read the turn's events from.
+            task: The task running the turn.
+        """
+        grace = self._config.STREAM_DISCONNECT_GRACE_SECONDS
+        while True:
+            await turn.wait_idle()
+            if turn.done:
+                return
+            delay = turn.idle_since + grace - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            logger.info(f"streaming client of session {task.get_name()} disconnected, cancelling its turn")
+            task.cancel()
+            return
+
+    async def _take_submitted_message(self, session: AdkSession) -> Optional[str]:
+        """
+        Takes the last user submitted message of a session, it is processed only once.
+        Called by the turn holding the session, so taking it from the session state does not interleave
+        with another turn. A message held while a turn was in progress is the newer one.
+        """
+        held = await self._held_messages.pop(session)
+        submitted = await self._pending_messages.pop(session)
+        return held or submitted
+
+    async def _write_turn(self, turn: TurnStream, ticket: TurnTicket, session: AdkSession, text: Optional[str]):
+        try:
+            async with self._turn_scheduler.run(ticket) as waited:
+                if waited:
+                    session = await self._reload_session(session)
+                if text is None:
+                    text = await self._take_submitted_message(session)
+                    if not text:
+                        logger.info("there is no last user message to process")
+                        turn.append(StreamingEvent(type="error", data="no user message for processing").model_dump_json())
+                        return
+                async for data in self._run_stream(session=session, text=text):
+                    turn.append(data)
+        except asyncio.CancelledError:
+            reason = "a newer message" if ticket.cancelled else "its client disconnecting"
+            turn.append(
+                StreamingEvent(type="error", data=f"this turn was cancelled by {reason}").model_dump_json()
+            )
+            raise
+        except Exception as e:
+            # already logged while streaming, the client is told the turn failed
+            turn.append(StreamingEvent(type="error", data=str(e)).model_dump_json())
+        finally:
+            turn.finish()
+
+    async def _run_stream(self, session: AdkSession, text: str):
+        """
+        Runs the root agent on a user message and yields serialized StreamingEvent for the agent's events.
+        Message chunks are coalesced into fewer frames, flushed every STREAM_FLUSH_INTERVAL_MS
+        or STREAM_FLUSH_BYTES, whichever comes first.
+
+        Args:
+            session: The ADK session object for the current interaction.
+            text: The user's message text to process.
+
+        Returns:
+            None (events are yielded while processing, no return at end of processing)
+        """
+        async for streaming_event in coalesce_streaming_events(
+            self._agent_streaming_events(session=session, text=text),
+            flush_interval=self._config.STREAM_FLUSH_INTERVAL_MS / 1000,
+            flush_bytes=self._config.STREAM_FLUSH_BYTES,
+        ):
+            yield streaming_event.model_dump_json()
+
+    async def _agent_streaming_events(self, session: AdkSession, text: str):
+        """
+        Runs the root agent on a user message and yields StreamingEvent for the agent's events.
+        The run is not tied to a client connection. When it is cancelled, what it did not record
+        in the session yet is recorded as an interrupted turn.
+
+        Args:
+            session: The ADK session object for the current interaction.
+            text: The user's message text to process.
+
+        Returns:
+            None (events are yielded while processing, no return at end of processing)
+        """
+        # handle player actions in game without an LLM call when possible
+        fast_path = await self._run_fast_path(session, text)
+        if fast_path:
+            response_chunks = []
+            for name in fast_path.function_calls:
+                yield StreamingEvent(type="action", data=f"{DEALER_AGENT_NAME} calling function: {name}")
+                response_chunks.append(f"\n{DEALER_AGENT_NAME} calling function: {name} ...\n")
+            yield StreamingEvent(type="message", data=fast_path.text)
+            response_chunks.append(fast_path.text)
+            self._schedule_compaction(session)
+            yield self._end_event(response_chunks, [fast_path.text])
+            return
+
         app_name_to_use = self._config.AGENT_ID if self._config.AGENT_ID else self._config.APP_NAME
-        session = await self._session_service.get_session(
-            app_name=app_name_to_use,
-            user_id=session.user_id,
-            session_id=session.id
-        )
 
-        # Instantiate the ADK Runner
-        adk_runner = AdkRunner(
-            app_name=app_name_to_use,
-            agent=self._root_agent,
-            session_service=self._session_service,
-            memory_service=self._memory_service,
-            artifact_service=self._artifact_service,
-        )
+        # Reuse the long-lived ADK Runner for this app
+        adk_runner = self._get_adk_runner(app_name_to_use)
 
         # Prepare the user's message in ADK format
-        content = types.Content(role='user', parts=[types.Part(text=last_usr_msg)])
+        content = types.Content(role='user', parts=[types.Part(text=text)])
 
-        full_response_text = ""  # To accumulate all parts of the response
+        response_chunks: List[str] = []  # To accumulate all parts of the response, joined once at the end
+        message_chunks: List[str] = []  # data of the message events, as the client receives it
+        progress = TurnProgress(default_author=self._root_agent.name)
 
         # Key Concept: run_async executes the agent logic and yields Events.
         # We iterate through events to find the final answer.
@@ -290,16 +769,13 @@ class Runner:
                 new_message=content,
                 run_config=RunConfig(streaming_mode=StreamingMode.SSE)
             ):
-                # make sure that client is still connected
-                if await request.is_disconnected():
-                    logger.info("streaming client disconnected, closing connection")
-                    return
+                progress.track(event)
                 # # accumulate the full response text if needed
                 # if event.content and event.content.parts:
-                #     full_response_text += ''.join(part.text for part in event.content.parts if part.text)
+                #     response_chunks.append(''.join(part.text for part in event.content.parts if part.text))
                 if event.error_message:
-                    yield StreamingEvent(type="error", data=f"[Event] Author: {event.author}, Type: Error, Message: {event.error_message}").model_dump_json()
-                    full_response_text += f"\n[Event] Author: {event.author}, Type: Error, Message: {event.error_message}\n"
+                    yield StreamingEvent(type="error", data=f"[Event] Author: {event.author}, Type: Error, Message: {event.error_message}")
+                    response_chunks.append(f"\n[Event] Author: {event.author}, Type: Error, Message: {event.error_message}\n")
 
                 # You can uncomment the line below to see *all* events during execution
                 logger.info(log_event(event))
@@ -308,11 +784,11 @@ class Runner:
                 if event.is_final_response():
                     #### in case of SSE / streaming, partial response is being collected
                     # if event.content and event.content.parts:
-                    #     # full_response_text += "\n" + ''.join(part.text for part in event.content.parts if part.text)
-                    #     full_response_text = event.content.parts[0].text
+                    #     # response_chunks.append("\n" + ''.join(part.text for part in event.content.parts if part.text))
+                    #     response_chunks = [event.content.parts[0].text]
                     if event.actions and event.actions.escalate:  # Handle potential errors/escalations
-                        yield StreamingEvent(type="action", data=f"Agent escalated: {event.error_message or 'No specific message.'}").model_dump_json()
-                        full_response_text += f"\nAgent escalated: {event.error_message or 'No specific message.'}\n"
+                        yield StreamingEvent(type="action", data=f"Agent escalated: {event.error_message or 'No specific message.'}")
+                        response_chunks.append(f"\nAgent escalated: {event.error_message or 'No specific message.'}\n")
                     #### in case of SSE, we just keep looping until run_async does EOF and loop ends itself
                     #### no need to explicitly break the loop
                     # if event.turn_complete:
@@ -321,21 +797,28 @@ class Runner:
                 else:
                     if event.partial and event.content and event.content.parts:
                         text = ''.join(part.text for part in event.content.parts if part.text)
-                        yield StreamingEvent(type="message", data=text).model_dump_json()
-                        full_response_text += text
+                        yield StreamingEvent(type="message", data=text)
+                        response_chunks.append(text)
+                        message_chunks.append(text)
                     elif event.actions and event.actions.transfer_to_agent:
-                        yield StreamingEvent(type="action", data=f"{event.author} transferring to {event.actions.transfer_to_agent}").model_dump_json()
-                        full_response_text += f"\n{event.author} transferring to {event.actions.transfer_to_agent} ...\n"
+                        yield StreamingEvent(type="action", data=f"{event.author} transferring to {event.actions.transfer_to_agent}")
+                        response_chunks.append(f"\n{event.author} transferring to {event.actions.transfer_to_agent} ...\n")
                     elif event.get_function_calls():
                         for function in event.get_function_calls():
                             if function.name != "transfer_to_agent":
-                                yield StreamingEvent(type="action", data=f"{event.author} calling function: {function.name}").model_dump_json()
-                                full_response_text += f"\n{event.author} calling function: {function.name} ...\n" if function.name != "transfer_to_agent" else ""
-
+                                yield StreamingEvent(type="action", data=f"{event.author} calling function: {function.name}")
+                                response_chunks.append(f"\n{event.author} calling function: {function.name} ...\n")
+
+        except asyncio.CancelledError:
+            # cancelling the run also cancels the model request and tool calls it awaits
+            logger.info(f"agent run of session {session.id} cancelled")
+            await asyncio.shield(self._record_interrupted_turn(session, progress))
+            raise
         except Exception as e:
             logger.error(e)
             logger.error(traceback.format_exc())
             raise e
 
+        self._schedule_compaction(session)
         # The agent's final response is returned as a string.
-        yield StreamingEvent(type="end", data=full_response_text).model_dump_json()
+        yield self._end_event(response_chunks, message_chunks)
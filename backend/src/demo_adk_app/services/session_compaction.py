@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import (
+    BaseSessionService,
+    InMemorySessionService,
+    DatabaseSessionService,
+    Session as AdkSession,
+)
+
+from demo_adk_app.services.cached_session_service import CachingSessionService
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+# invocation id of the snapshot event folding old state-delta-only system events
+SNAPSHOT_INVOCATION_ID = "state_snapshot"
+
+
+def _is_state_only_system_event(event: Event) -> bool:
+    return event.author == "system" and not event.content
+
+
+def _is_tool_only_event(event: Event) -> bool:
+    if not event.content or not event.content.parts:
+        return False
+    return all((part.function_call or part.function_response) and not part.text for part in event.content.parts)
+
+
+def plan_compaction(
+    events: List[Event], keep_recent: int, prune_tool_events: bool
+) -> Optional[Tuple[List[Event], Event]]:
+    """
+    Plans a compaction of the events older than the `keep_recent` most recent ones.
+
+    State-delta-only system events are folded into a single snapshot event carrying their merged state delta.
+    If `prune_tool_events` is set, tool-call-only events whose calls and responses are all past the horizon
+    are pruned too, with their state deltas folded into the snapshot.
+
+    Returns:
+        The events to remove and the snapshot event replacing them, or None if there is nothing to compact.
+    """
+    horizon = len(events) - keep_recent
+    if horizon <= 1:
+        return None
+    old_events = events[:horizon]
+
+    removed: List[Event] = [event for event in old_events if _is_state_only_system_event(event)]
+    if prune_tool_events:
+        tool_events = [event for event in old_events if _is_tool_only_event(event)]
+        responded = {response.id for event in tool_events for response in event.get_function_responses()}
+        called = {call.id for event in tool_events for call in event.get_function_calls()}
+        # never split a call from its response across the horizon
+        complete = responded & called
+        for event in tool_events:
+            ids = [call.id for call in event.get_function_calls()] + [r.id for r in event.get_function_responses()]
+            if ids and all(call_id in complete for call_id in ids):
+                removed.append(event)
+
+    # a single previous snapshot alone is already compact
+    if not removed or (len(removed) == 1 and removed[0].invocation_id == SNAPSHOT_INVOCATION_ID):
+        return None
+
+    removed.sort(key=lambda event: event.timestamp)
+    state_delta = {}
+    for event in removed:
+        if event.actions and event.actions.state_delta:
+            state_delta.update(event.actions.state_delta)
+    snapshot = Event(
+        invocation_id=SNAPSHOT_INVOCATION_ID,
+        author="system",
+        actions=EventActions(state_delta=state_delta),
+        timestamp=removed[-1].timestamp,
+    )
+    return removed, snapshot
+
+
+def _archive_table():
+    """
+    Returns the archive table of compacted events, defined on its own metadata.
+    """
+    from sqlalchemy import Column, Float, MetaData, String, Table, Text
+
+    global _ARCHIVE_TABLE
+    if _ARCHIVE_TABLE is None:
+        _ARCHIVE_TABLE = Table(
+            "events_archive",
+            MetaData(),
+            Column("app_name", String(128), primary_key=True),
+            Column("user_id", String(128), primary_key=True),
+            Column("session_id", String(128), primary_key=True),
+            Column("id", String(128), primary_key=True),
+            Column("timestamp", Float, index=True),
+            Column("event_json", Text),
+            Column("archived_at", Float),
+        )
+    return _ARCHIVE_TABLE
+
+
+_ARCHIVE_TABLE = None
+
+
+def _count_database_events(session_service: DatabaseSessionService, app_name: str, user_id: str, session_id: str) -> int:
+    from google.adk.sessions.database_session_service import StorageEvent
+
+    with session_service.database_session_factory() as sql_session:
+        return (
+            sql_session.query(StorageEvent.id)
+            .filter(StorageEvent.app_name == app_name)
+            .filter(StorageEvent.user_id == user_id)
+            .filter(StorageEvent.session_id == session_id)
+            .count()
+        )
+
+
+def _compact_database_session(
+    session_service: DatabaseSessionService, session: AdkSession, removed: List[Event], snapshot: Event
+):
+    """
+    Archives the removed events, deletes them and stores the snapshot, in one transaction.
+    The events_archive table is not part of ADK's schema, it is created on first use
+    (create it ahead with a migration where the database user cannot create tables).
+    """
+    from google.adk.sessions.database_session_service import StorageEvent
+
+    archive = _archive_table()
+    archive.create(session_service.db_engine, checkfirst=True)
+    archived_at = time.time()
+    with session_service.database_session_factory() as sql_session:
+        sql_session.execute(archive.insert(), [
+            {
+                "app_name": session.app_name,
+                "user_id": session.user_id,
+                "session_id": session.id,
+                "id": event.id,
+                "timestamp": event.timestamp,
+                "event_json": event.model_dump_json(exclude_none=True),
+                "archived_at": archived_at,
+            }
+            for event in removed
+        ])
+        (
+            sql_session.query(StorageEvent)
+            .filter(StorageEvent.app_name == session.app_name)
+            .filter(StorageEvent.user_id == session.user_id)
+            .filter(StorageEvent.session_id == session.id)
+            .filter(StorageEvent.id.in_([event.id for event in removed]))
+            .delete(synchronize_session=False)
+        )
+        sql_session.add(StorageEvent.from_event(session, snapshot))
+        sql_session.commit()
+
+
+async def compact_session(
+    session_service: BaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    threshold: int,
+    keep_recent: int,
+    prune_tool_events: bool,
+) -> int:
+    """
+    Compacts a session's events once it holds more than `threshold` events, see plan_compaction.
+    Database backends archive the raw events in the events_archive table, in-memory sessions drop them.
+    Other backends do not support removing events and are left unchanged.
+
+    Returns:
+        The number of events removed from the session.
+    """
+    backend = session_service.backend if isinstance(session_service, CachingSessionService) else session_service
+
+    if isinstance(backend, InMemorySessionService):
+        session = backend.sessions.get(app_name, {}).get(user_id, {}).get(session_id, None)
+        if session is None or len(session.events) <= threshold:
+            return 0
+        plan = plan_compaction(session.events, keep_recent, prune_tool_events)
+        if not plan:
+            return 0
+        removed, snapshot = plan
+        removed_ids = {event.id for event in removed}
+        events = [event for event in session.events if event.id not in removed_ids]
+        events.append(snapshot)
+        events.sort(key=lambda event: event.timestamp)
+        session.events = events
+    elif isinstance(backend, DatabaseSessionService):
+        count = await asyncio.to_thread(_count_database_events, backend, app_name, user_id, session_id)
+        if count <= threshold:
+            return 0
+        session = await backend.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        if session is None:
+            return 0
+        plan = plan_compaction(session.events, keep_recent, prune_tool_events)
+        if not plan:
+            return 0
+        removed, snapshot = plan
+        await asyncio.to_thread(_compact_database_session, backend, session, removed, snapshot)
+    else:
+        return 0
+
+    if isinstance(session_service, CachingSessionService):
+        session_service.invalidate(app_name=app_name, user_id=user_id, session_id=session_id)
+    logger.info(f"compacted session {session_id}: folded {len(removed)} events into a state snapshot")
+    return len(removed)
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, DatabaseSessionService
+
+from demo_adk_app.api.history import page_events
+from demo_adk_app.services.cached_session_service import CachingSessionService
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+
+def _load_database_history_page(
+    session_service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    since_event_id: Optional[str],
+    limit: Optional[int],
+) -> Tuple[List[Event], int, Optional[str]]:
+    """
+    Loads a page of events with a keyset query on (timestamp, id), plus the session's event count and
+    latest event id, without loading the session's state or its other events.
+    """
+    from sqlalchemy import and_, func, or_
+    from google.adk.sessions.database_session_service import StorageEvent
+
+    with session_service.database_session_factory() as sql_session:
+        events = (
+            sql_session.query(StorageEvent)
+            .filter(StorageEvent.app_name == app_name)
+            .filter(StorageEvent.user_id == user_id)
+            .filter(StorageEvent.session_id == session_id)
+        )
+        event_count = events.with_entities(func.count()).scalar()
+        latest = (
+            events.with_entities(StorageEvent.id)
+            .order_by(StorageEvent.timestamp.desc(), StorageEvent.id.desc())
+            .first()
+        )
+
+        page = events
+        if since_event_id:
+            since = events.with_entities(StorageEvent.timestamp).filter(StorageEvent.id == since_event_id).first()
+            if since is None:
+                raise ValueError(f"event {since_event_id} not found in conversation")
+            page = page.filter(or_(
+                StorageEvent.timestamp > since.timestamp,
+                and_(StorageEvent.timestamp == since.timestamp, StorageEvent.id > since_event_id),
+            ))
+        page = page.order_by(StorageEvent.timestamp, StorageEvent.id)
+        if limit:
+            page = page.limit(limit)
+        return [storage_event.to_event() for storage_event in page.all()], event_count, latest.id if latest else None
+
+
+async def load_history_page(
+    session_service: BaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    since_event_id: Optional[str],
+    limit: Optional[int],
+) -> Tuple[List[Event], int, Optional[str]]:
+    """
+    Loads the events of a session after `since_event_id` (all events if not given), up to `limit` events,
+    loading as little of the session as the backend allows. Database backends only read the page's events,
+    other backends load the session and page its events in memory.
+
+    Args:
+        session_service: The session service storing the session.
+        app_name: The application name the session belongs to.
+        user_id: The user owning the session.
+        session_id: The session id.
+        since_event_id: Id of the last event the client already has.
+        limit: Maximum number of events to return.
+
+    Returns:
+        The page of events, the session's number of events and its latest event id (to version the history).
+
+    Raises:
+        ValueError: if `since_event_id` is not an event of the session.
+    """
+    if isinstance(session_service, CachingSessionService):
+        session_service = session_service.backend
+    if isinstance(session_service, DatabaseSessionService):
+        return await asyncio.to_thread(
+            _load_database_history_page, session_service, app_name, user_id, session_id, since_event_id, limit
+        )
+
+    session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+    events = session.events if session else []
+    return page_events(events, since_event_id, limit), len(events), events[-1].id if events else None
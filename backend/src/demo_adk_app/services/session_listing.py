@@ -0,0 +1,215 @@
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+from google.adk.sessions import (
+    BaseSessionService,
+    InMemorySessionService,
+    DatabaseSessionService,
+)
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from demo_adk_app.services.cached_session_service import CachingSessionService
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+
+class SessionMetadata(BaseModel):
+    """
+    Lightweight listing entry of a session, without its events or state.
+    """
+    id: str = Field(..., description="session id")
+    last_update_time: datetime = Field(..., description="time of the last update to the session")
+
+
+def encode_cursor(sort_key: Union[float, str], session_id: str) -> str:
+    """
+    Encodes the position after a listed session as an opaque cursor.
+    """
+    raw = json.dumps({"t": sort_key, "id": session_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Union[float, str], str]:
+    """
+    Decodes a cursor into the sort key and session id of the last listed session.
+
+    Raises:
+        ValueError: if the cursor is malformed.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return data["t"], data["id"]
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+
+def _to_utc(value: datetime) -> datetime:
+    # naive timestamps from the database are stored as UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _list_database_sessions(
+    session_service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    limit: int,
+    cursor: Optional[str],
+    create_index: bool,
+) -> Tuple[List[SessionMetadata], Optional[str]]:
+    """
+    Lists session metadata with a keyset query, without loading state or events.
+    The query is backed by the ix_sessions_listing index on (app_name, user_id, update_time) of ADK's
+    sessions table. That table belongs to ADK's schema, so the index is only created here when
+    `create_index` is set, otherwise it is expected from a migration (or the query scans the user's sessions).
+    """
+    from sqlalchemy import Index, and_, or_
+    from google.adk.sessions.database_session_service import StorageSession
+
+    # index backing the listing query, created once per database
+    if create_index and not getattr(session_service, "_listing_index_ready", False):
+        Index(
+            "ix_sessions_listing", StorageSession.app_name, StorageSession.user_id, StorageSession.update_time
+        ).create(session_service.db_engine, checkfirst=True)
+        session_service._listing_index_ready = True
+
+    with session_service.database_session_factory() as sql_session:
+        query = (
+            sql_session.query(StorageSession.id, StorageSession.update_time)
+            .filter(StorageSession.app_name == app_name)
+            .filter(StorageSession.user_id == user_id)
+        )
+        if cursor:
+            after_time, after_id = decode_cursor(cursor)
+            after_time = datetime.fromisoformat(after_time)
+            query = query.filter(or_(
+                StorageSession.update_time < after_time,
+                and_(StorageSession.update_time == after_time, StorageSession.id < after_id),
+            ))
+        rows = (
+            query.order_by(StorageSession.update_time.desc(), StorageSession.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].update_time.isoformat(), rows[-1].id)
+    return [SessionMetadata(id=row.id, last_update_time=_to_utc(row.update_time)) for row in rows], next_cursor
+
+
+def _paginate(
+    entries: List[Tuple[float, str]], limit: int, cursor: Optional[str]
+) -> Tuple[List[SessionMetadata], Optional[str]]:
+    """
+    Sorts (last_update_time, id) entries most recent first and returns the page after the cursor.
+    """
+    entries = sorted(entries, reverse=True)
+    if cursor:
+        after = decode_cursor(cursor)
+        entries = [entry for entry in entries if entry < (float(after[0]), after[1])]
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1][0], entries[-1][1])
+    return [
+        SessionMetadata(id=session_id, last_update_time=datetime.fromtimestamp(update_time, tz=timezone.utc))
+        for update_time, session_id in entries
+    ], next_cursor
+
+
+async def list_session_metadata(
+    session_service: BaseSessionService,
+    app_name: str,
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    create_index: bool = False,
+) -> Tuple[List[SessionMetadata], Optional[str]]:
+    """
+    Lists a page of a user's sessions, most recently updated first, without loading events or state.
+
+    Args:
+        session_service: The session service storing the sessions.
+        app_name: The application name the sessions belong to.
+        user_id: The user whose sessions to list.
+        limit: Maximum number of sessions to return.
+        cursor: Opaque cursor returned with the previous page, None for the first page.
+        create_index: True to create the listing index on a database backend's sessions table if missing.
+
+    Returns:
+        The page of session metadata, and the cursor for the next page or None if this is the last page.
+
+    Raises:
+        ValueError: if the cursor is malformed.
+    """
+    # listing reads metadata straight from the backend, bypassing any session cache
+    if isinstance(session_service, CachingSessionService):
+        session_service = session_service.backend
+    if isinstance(session_service, DatabaseSessionService):
+        return await asyncio.to_thread(
+            _list_database_sessions, session_service, app_name, user_id, limit, cursor, create_index
+        )
+
+    if isinstance(session_service, InMemorySessionService):
+        # read the stored sessions directly, list_sessions would deep copy each one with its state
+        sessions = session_service.sessions.get(app_name, {}).get(user_id, {})
+        entries = [(s.last_update_time, s.id) for s in sessions.values()]
+        return _paginate(entries, limit, cursor)
+
+    # other backends already list sessions without events
+    list_sessions_response = await session_service.list_sessions(app_name=app_name, user_id=user_id)
+    entries = [(s.last_update_time, s.id) for s in list_sessions_response.sessions]
+    return _paginate(entries, limit, cursor)
+
+
+def _database_session_exists(
+    session_service: DatabaseSessionService, app_name: str, user_id: str, session_id: str
+) -> bool:
+    """
+    Checks a session row exists by primary key, without loading its state or events.
+    """
+    from google.adk.sessions.database_session_service import StorageSession
+
+    with session_service.database_session_factory() as sql_session:
+        row = (
+            sql_session.query(StorageSession.id)
+            .filter(StorageSession.app_name == app_name)
+            .filter(StorageSession.user_id == user_id)
+            .filter(StorageSession.id == session_id)
+            .first()
+        )
+    return row is not None
+
+
+async def session_exists(session_service: BaseSessionService, app_name: str, user_id: str, session_id: str) -> bool:
+    """
+    Checks that a session exists for the user, loading as little of it as the backend allows.
+
+    Args:
+        session_service: The session service storing the sessions.
+        app_name: The application name the session belongs to.
+        user_id: The user expected to own the session.
+        session_id: The session id to check.
+
+    Returns:
+        True if the user has a session with this id.
+    """
+    if isinstance(session_service, CachingSessionService):
+        session_service = session_service.backend
+    if isinstance(session_service, DatabaseSessionService):
+        return await asyncio.to_thread(_database_session_exists, session_service, app_name, user_id, session_id)
+
+    if isinstance(session_service, InMemorySessionService):
+        return session_id in session_service.sessions.get(app_name, {}).get(user_id, {})
+
+    session = await session_service.get_session(
+        app_name=app_name, user_id=user_id, session_id=session_id, config=GetSessionConfig(num_recent_events=1)
+    )
+    return session is not None
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from typing import AsyncIterator, List
+
+from demo_adk_app.api.models import StreamingEvent
+
+
+async def coalesce_streaming_events(
+    source: AsyncIterator[StreamingEvent], flush_interval: float, flush_bytes: int
+) -> AsyncIterator[StreamingEvent]:
+    """
+    Merges consecutive "message" events of a stream into fewer, larger events.
+
+    Buffered message text is flushed once `flush_interval` seconds passed since the first buffered chunk,
+    or once `flush_bytes` bytes are buffered, whichever comes first. Any other event flushes the buffer
+    and is passed through immediately, so actions, errors and the end event are never delayed.
+
+    Args:
+        source: The stream of events to coalesce.
+        flush_interval: Maximum seconds message text is buffered, 0 to pass all events through.
+        flush_bytes: Maximum bytes of message text buffered, UTF-8 encoded as it is sent.
+
+    Returns:
+        None (events are yielded as they are flushed)
+    """
+    if flush_interval <= 0:
+        async for streaming_event in source:
+            yield streaming_event
+        return
+
+    # a single producer task reads the source ahead, so the consumer can wait for it with a timeout
+    queue: asyncio.Queue = asyncio.Queue()
+    producer = asyncio.create_task(_produce(source, queue))
+    chunks: List[str] = []
+    buffered_bytes = 0
+    deadline = 0.0
+    try:
+        while True:
+            if not chunks:
+                item = await queue.get()
+            else:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=max(deadline - time.monotonic(), 0))
+                    except asyncio.TimeoutError:
+                        yield StreamingEvent(type="message", data="".join(chunks))
+                        chunks, buffered_bytes = [], 0
+                        continue
+
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                # the text streamed before the failure is still sent
+                if chunks:
+                    yield StreamingEvent(type="message", data="".join(chunks))
+                    chunks, buffered_bytes = [], 0
+                raise item
+
+            if item.type == "message":
+                if not chunks:
+                    deadline = time.monotonic() + flush_interval
+                chunks.append(item.data)
+                buffered_bytes += len(item.data.encode("utf-8"))
+                if buffered_bytes >= flush_bytes or time.monotonic() >= deadline:
+                    yield StreamingEvent(type="message", data="".join(chunks))
+                    chunks, buffered_bytes = [], 0
+                continue
+
+            if chunks:
+                yield StreamingEvent(type="message", data="".join(chunks))
+                chunks, buffered_bytes = [], 0
+            yield item
+
+        if chunks:
+            yield StreamingEvent(type="message", data="".join(chunks))
+    finally:
+        # stop reading the source when the consumer goes away
+        if not producer.done():
+            producer.cancel()
+            await asyncio.wait({producer})
+
+
+# marks the end of the source in the producer's queue
+_END = object()
+
+
+async def _produce(source: AsyncIterator[StreamingEvent], queue: asyncio.Queue):
+    """
+    Reads all events of the source into the queue, followed by the end marker or the source's exception.
+    """
+    try:
+        async for streaming_event in source:
+            queue.put_nowait(streaming_event)
+    except Exception as e:
+        queue.put_nowait(e)
+        return
+    queue.put_nowait(_END)
@@ -0,0 +1,73 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from google.adk.events import Event
+from google.genai import types
+
+
+class TurnProgress:
+    """
+    Tracks what an agent run yielded that is not recorded in the session: streamed partial text,
+    and function calls still waiting for their response. ADK only appends complete events,
+    so when a run is cancelled these are recorded by `interruption_events` to keep the session coherent,
+    a function call without a response would break the model's next request.
+    """
+
+    def __init__(self, default_author: str):
+        """
+        Args:
+            default_author: Author of the interruption event when the run yielded no event.
+        """
+        self.invocation_id: Optional[str] = None
+        self._author = default_author
+        self._partial_chunks: List[str] = []
+        # function calls waiting for their response by call id, with the calling agent
+        self._pending_calls: Dict[str, Tuple[str, types.FunctionCall]] = {}
+
+    def track(self, event: Event):
+        """
+        Updates the progress with an event yielded by the agent run.
+        """
+        self.invocation_id = event.invocation_id
+        self._author = event.author
+        if event.partial:
+            if event.content and event.content.parts:
+                self._partial_chunks.append("".join(part.text for part in event.content.parts if part.text))
+            return
+        # the complete event following partial ones carries their whole text
+        if event.content:
+            self._partial_chunks = []
+        for function_call in event.get_function_calls():
+            self._pending_calls[function_call.id] = (event.author, function_call)
+        for function_response in event.get_function_responses():
+            self._pending_calls.pop(function_response.id, None)
+
+    def interruption_events(self, reason: str) -> List[Event]:
+        """
+        Builds the events recording an interrupted run: an error response for each function call
+        waiting for one, then the partial text streamed so far, flagged as interrupted.
+
+        Args:
+            reason: Why the run was interrupted, given to the model as the functions' error.
+        """
+        invocation_id = self.invocation_id or "interrupted_turn"
+        events = [
+            Event(
+                invocation_id=invocation_id,
+                author=author,
+                content=types.Content(role="user", parts=[types.Part(function_response=types.FunctionResponse(
+                    id=function_call.id, name=function_call.name, response={"error": reason}
+                ))]),
+                timestamp=time.time(),
+            )
+            for author, function_call in self._pending_calls.values()
+        ]
+        partial_text = "".join(self._partial_chunks)
+        events.append(Event(
+            invocation_id=invocation_id,
+            author=self._author,
+            content=types.Content(role="model", parts=[types.Part(text=partial_text)]) if partial_text else None,
+            interrupted=True,
+            timestamp=time.time(),
+        ))
+        return events
@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+# policies for a turn submitted while the conversation still has one in progress
+TURN_POLICIES = ("queue", "reject", "cancel")
+
+
+class TurnRejected(Exception):
+    """
+    Raised when a turn is not admitted, the client should retry after `retry_after` seconds.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TurnTicket:
+    """
+    An admitted turn, holding its place in its session's turns and one of the worker's turn slots until released.
+    """
+
+    def __init__(self, scheduler: "TurnScheduler", session_id: str):
+        self.session_id = session_id
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+        self._scheduler = scheduler
+        self._released = False
+
+    def cancel(self):
+        """
+        Cancels the turn, now if it is running, or as soon as it starts.
+        """
+        self.cancelled = True
+        if self.task:
+            self.task.cancel()
+
+    def release(self):
+        """
+        Frees the ticket's places, for a turn that completed or will not run.
+        """
+        if not self._released:
+            self._released = True
+            self._scheduler._release(self)
+
+
+class TurnScheduler:
+    """
+    Runs one turn at a time per session, and caps the turns admitted by the worker.
+
+    A turn submitted while its session has one in progress is handled by the policy:
+    'queue' waits for the previous turns, up to `max_queued` waiting turns per session,
+    'reject' refuses it, and 'cancel' cancels the previous turns.
+    Turns are refused with TurnRejected when the worker already admitted `max_concurrent` turns.
+    """
+
+    def __init__(self, policy: str, max_queued: int, max_concurrent: int, retry_after: int):
+        """
+        Args:
+            policy: 'queue', 'reject' or 'cancel'.
+            max_queued: Maximum turns waiting per session with the 'queue' policy.
+            max_concurrent: Maximum turns admitted (running or waiting) by the worker, 0 for no limit.
+            retry_after: Seconds rejected clients are told to wait before retrying.
+        """
+        if policy not in TURN_POLICIES:
+            raise ValueError(f"unknown turn policy {policy!r}, expected one of {TURN_POLICIES}")
+        self._policy = policy
+        self._max_queued = max_queued
+        self._max_concurrent = max_concurrent
+        self._retry_after = retry_after
+        # admitted turns and turn lock of each session with turns, in admission order
+        self._tickets: Dict[str, List[TurnTicket]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # number of session writes outside of turns holding or waiting for each session's turn lock
+        self._holders: Dict[str, int] = {}
+        self._admitted = 0
+
+    def busy(self, session_id: str) -> bool:
+        """
+        Returns True if the session has turns running or waiting on this worker.
+        """
+        return session_id in self._tickets
+
+    def admit(self, session_id: str) -> TurnTicket:
+        """
+        Admits a new turn of the session, the returned ticket must be run or released.
+
+        Raises:
+            TurnRejected: if the worker is saturated, or the session's turns do not allow another one.
+        """
+        tickets = self._tickets.get(session_id, [])
+        # turns about to be cancelled make room for the new one
+        replaced = len(tickets) if self._policy == "cancel" else 0
+        if self._max_concurrent and self._admitted - replaced >= self._max_concurrent:
+            raise TurnRejected("too many turns in progress, retry later", self._retry_after)
+        if tickets:
+            if self._policy == "reject":
+                raise TurnRejected("a turn is already in progress for this conversation", self._retry_after)
+            if self._policy == "queue" and len(tickets) > self._max_queued:
+                raise TurnRejected("too many turns queued for this conversation", self._retry_after)
+            if self._policy == "cancel":
+                for ticket in tickets:
+                    ticket.cancel()
+
+        ticket = TurnTicket(self, session_id)
+        self._tickets.setdefault(session_id, []).append(ticket)
+        self._locks.setdefault(session_id, asyncio.Lock())
+        self._admitted += 1
+        return ticket
+
+    @asynccontextmanager
+    async def run(self, ticket: TurnTicket) -> AsyncIterator[bool]:
+        """
+        Runs an admitted turn in the current task once the session's previous turns completed,
+        and releases the ticket when the turn ends.
+
+        Returns:
+            (as context value) True if the turn waited for previous turns, so session state read before may be stale.
+        """
+        ticket.task = asyncio.current_task()
+        try:
+            if ticket.cancelled:
+                raise asyncio.CancelledError()
+            lock = self._locks[ticket.session_id]
+            waited = lock.locked()
+            async with lock:
+                yield waited
+        finally:
+            ticket.release()
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Holds the session's turn lock for a session write outside of turns, such as bookkeeping system events,
+        so it does not interleave with a turn's appends. Waits for the session's turns in progress,
+        turns admitted meanwhile wait for the write.
+        """
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        self._holders[session_id] = self._holders.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._holders[session_id] -= 1
+            if not self._holders[session_id]:
+                self._holders.pop(session_id)
+                if session_id not in self._tickets:
+                    self._locks.pop(session_id, None)
+
+    def _release(self, ticket: TurnTicket):
+        self._admitted -= 1
+        tickets = self._tickets.get(ticket.session_id, [])
+        if ticket in tickets:
+            tickets.remove(ticket)
+        if not tickets:
+            self._tickets.pop(ticket.session_id, None)
+            if ticket.session_id not in self._holders:
+                self._locks.pop(ticket.session_id, None)
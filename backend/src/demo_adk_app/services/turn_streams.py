@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from demo_adk_app.api.models import StreamingEvent
+
+
+class TurnStream:
+    """
+    Bounded ring buffer of a turn's serialized streaming events, each tagged with an SSE id.
+    The turn writes events to the buffer independently of its clients, which read them through
+    `subscribe` and can resume after the last id they received.
+    """
+
+    def __init__(self, ids: Iterator[int], max_events: int):
+        """
+        Args:
+            ids: Increasing SSE ids, shared by the turns of a session.
+            max_events: Maximum number of events kept for replay, older events are dropped.
+        """
+        self.done = False
+        self.finish_time: Optional[float] = None
+        # clients currently reading the turn, and since when none has been, once one had
+        self.subscribers = 0
+        self.idle_since: Optional[float] = None
+        self._ids = ids
+        self._events: Deque[Tuple[int, str]] = deque(maxlen=max_events)
+        # number of events dropped from the buffer, and their ids as runs of consecutive ids
+        self._dropped = 0
+        self._dropped_ranges: List[List[int]] = []
+        # replaced on every change, subscribers wait on the one current when they caught up
+        self._changed = asyncio.Event()
+
+    @property
+    def last_id(self) -> Optional[int]:
+        """
+        SSE id of the turn's latest event, None if it has none yet.
+        """
+        if self._events:
+            return self._events[-1][0]
+        return self._dropped_ranges[-1][1] if self._dropped_ranges else None
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def append(self, data: str) -> int:
+        """
+        Adds a serialized event to the buffer and wakes up subscribers.
+
+        Returns:
+            The event's SSE id.
+        """
+        event_id = next(self._ids)
+        if len(self._events) == self._events.maxlen:
+            dropped_id = self._events[0][0]
+            self._dropped += 1
+            if self._dropped_ranges and self._dropped_ranges[-1][1] == dropped_id - 1:
+                self._dropped_ranges[-1][1] = dropped_id
+            else:
+                self._dropped_ranges.append([dropped_id, dropped_id])
+        self._events.append((event_id, data))
+        self._notify()
+        return event_id
+
+    def finish(self):
+        """
+        Marks the turn as complete, subscribers stop once they received all its events.
+        """
+        self.done = True
+        self.finish_time = time.monotonic()
+        self._notify()
+
+    async def wait_idle(self):
+        """
+        Returns once the turn is complete, or no client is reading it after one did.
+        """
+        while True:
+            changed = self._changed
+            if self.done or (self.subscribers == 0 and self.idle_since is not None):
+                return
+            await changed.wait()
+
+    async def subscribe(self, after: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Yields the turn's events after the given SSE id, as they are added, until the turn is complete.
+
+        Args:
+            after: SSE id of the last event the client received, None to read the turn from its start.
+
+        Returns:
+            None (events are yielded as sse_starlette event dicts with "id" and "data")
+        """
+        self.subscribers += 1
+        try:
+            async for sse_event in self._read(after):
+                yield sse_event
+        finally:
+            # also reached when the client disconnects and the response stops reading events
+            self.subscribers -= 1
+            if self.subscribers == 0:
+                self.idle_since = time.monotonic()
+                self._notify()
+
+    async def _read(self, after: Optional[int]) -> AsyncIterator[Dict]:
+        # position of the client in all the turn's events, dropped ones included
+        position = 0
+        if after is not None:
+            position = sum(min(last, after) - first + 1 for first, last in self._dropped_ranges if first <= after)
+            position += sum(1 for event_id, _ in self._events if event_id <= after)
+        while True:
+            changed = self._changed
+            if position < self._dropped:
+                # the client fell behind the ring buffer, tell it instead of silently skipping events
+                yield {"data": StreamingEvent(
+                    type="error", data=f"{self._dropped - position} events of this turn are no longer available"
+                ).model_dump_json()}
+                position = self._dropped
+            # copy before yielding, the turn keeps appending while the client is sent events
+            missed = list(itertools.islice(self._events, position - self._dropped, None))
+            for event_id, data in missed:
+                yield {"id": str(event_id), "data": data}
+            position += len(missed)
+            if self.done and position >= self._dropped + len(self._events):
+                return
+            if not missed:
+                await changed.wait()
+
+
+class TurnStreamRegistry:
+    """
+    Recent TurnStreams of each session, for the sessions with the most recent turns.
+    SSE ids keep increasing across the turns of a session, so a client's Last-Event-ID
+    is never mistaken for an event of a later turn.
+    """
+
+    # turns kept per session, enough for a running turn and the turns queued after it
+    TURNS_PER_SESSION = 4
+
+    def __init__(self, max_sessions: int, max_events: int, ttl_seconds: float):
+        """
+        Args:
+            max_sessions: Maximum number of sessions whose turns are kept, least recent are dropped.
+            max_events: Maximum number of events kept per turn.
+            ttl_seconds: Seconds a completed turn is kept for clients to resume.
+        """
+        self._max_sessions = max_sessions
+        self._max_events = max_events
+        self._ttl_seconds = ttl_seconds
+        self._turns: "OrderedDict[str, Deque[TurnStream]]" = OrderedDict()
+        self._ids: Dict[str, Iterator[int]] = {}
+
+    def start(self, session_id: str) -> TurnStream:
+        """
+        Starts a new turn stream for the session.
+        """
+        turns = self._turns.pop(session_id, None) or deque(maxlen=self.TURNS_PER_SESSION)
+        if not turns:
+            # ids start from the clock, so they keep increasing when a session's previous turns were dropped
+            self._ids[session_id] = itertools.count(int(time.time() * 1000))
+        turn = TurnStream(ids=self._ids[session_id], max_events=self._max_events)
+        turns.append(turn)
+        self._turns[session_id] = turns
+        self._evict()
+        return turn
+
+    def get(self, session_id: str, after: int) -> Optional[TurnStream]:
+        """
+        Returns the session's earliest turn with events after the given SSE id, or still running,
+        None if there is none.
+        """
+        for turn in self._turns.get(session_id, ()):
+            if not self._expired(turn) and not (turn.done and (turn.last_id is None or turn.last_id <= after)):
+                return turn
+        return None
+
+    def _expired(self, turn: TurnStream) -> bool:
+        return turn.done and time.monotonic() - turn.finish_time > self._ttl_seconds
+
+    def _evict(self):
+        while len(self._turns) > self._max_sessions:
+            session_id, _ = self._turns.popitem(last=False)
+            self._ids.pop(session_id, None)
+        for session_id in [
+            session_id for session_id, turns in self._turns.items() if all(self._expired(turn) for turn in turns)
+        ]:
+            del self._turns[session_id]
+            self._ids.pop(session_id, None)
@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import random
+from typing import Optional, Union
+
+import httpx
+
+from demo_adk_app.utils.config import get_config
+from demo_adk_app.utils.local_deck_engine import LocalDeckEngine
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+
+# errors of requests that never reached the server, safe to retry for any request
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class AsyncDeckOfCardsClient:
+    """
+    Non-blocking Python REST client for the Deck of Cards API.
+    API Docs: https://deckofcardsapi.com/
+
+    Uses a pooled httpx.AsyncClient with connect / read timeouts, a keep-alive limit,
+    and retries with jittered exponential backoff. Read-only requests are retried on connection errors,
+    timeouts and 5xx responses. Requests that change a deck (draws, piles, returns) are only retried
+    when the connection failed, since the server may have handled a request whose response was lost.
+    """
+
+    BASE_URL = "https://deckofcardsapi.com/api/deck"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.2,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Initializes the client.
+
+        Args:
+            base_url (str, optional): Base URL of the deck API, e.g. a local stub server.
+            connect_timeout (float): Seconds to wait for a connection.
+            read_timeout (float): Seconds to wait for a response.
+            max_retries (int): Number of retries after the first failed attempt.
+            backoff_seconds (float): Base delay for exponential backoff between retries.
+            max_connections (int): Maximum number of pooled connections.
+            max_keepalive_connections (int): Maximum number of idle keep-alive connections.
+            client (httpx.AsyncClient, optional): Pre-configured client to use instead.
+        """
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+    async def aclose(self):
+        """
+        Closes the pooled connections.
+        """
+        await self.client.aclose()
+
+    async def _get(self, path: str, params: Optional[dict] = None, idempotent: bool = True) -> dict:
+        """
+        Issues a GET request with retries and returns the JSON response.
+
+        Args:
+            path (str): Path relative to the base URL.
+            params (dict, optional): Query parameters.
+            idempotent (bool): False for requests changing a deck, only retried if the request was not sent.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        url = f"{self.base_url}/{path}"
+        # requests changing the deck are only retried when they never reached the server
+        retried_errors = httpx.TransportError if idempotent else _NOT_SENT_ERRORS
+        attempt = 0
+        while True:
+            try:
+                resp = await self.client.get(url, params=params)
+                if resp.status_code < 500 or attempt >= self.max_retries or not idempotent:
+                    resp.raise_for_status()
+                    return resp.json()
+                logger.warning(f"deck api {url} returned {resp.status_code}, retrying")
+            except retried_errors as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"deck api {url} failed with {e!r}, retrying")
+            # full jitter exponential backoff
+            await asyncio.sleep(random.uniform(0, self.backoff_seconds * (2 ** attempt)))
+            attempt += 1
+
+    async def shuffle_new_deck(self, deck_count=None, jokers_enabled=None, cards=None):
+        """
+        Shuffle a new deck (optionally partial, with jokers, or multiple decks).
+
+        Args:
+            deck_count (int, optional): Number of decks to use.
+            jokers_enabled (bool, optional): Whether to include jokers.
+            cards (str, optional): Comma-separated card codes for a partial deck.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        params = {}
+        if deck_count is not None:
+            params['deck_count'] = deck_count
+        if jokers_enabled is not None:
+            params['jokers_enabled'] = 'true' if jokers_enabled else 'false'
+        if cards is not None:
+            params['cards'] = cards
+        return await self._get("new/shuffle/", params)
+
+    async def draw_cards(self, deck_id, count=None):
+        """
+        Draw cards from a deck.
+
+        Args:
+            deck_id (str): The deck ID or "new".
+            count (int, optional): Number of cards to draw.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        params = {}
+        if count is not None:
+            params['count'] = count
+        return await self._get(f"{deck_id}/draw/", params, idempotent=False)
+
+    async def reshuffle_deck(self, deck_id, remaining=None):
+        """
+        Reshuffle an existing deck.
+
+        Args:
+            deck_id (str): The deck ID.
+            remaining (bool, optional): Shuffle only remaining cards.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        params = {}
+        if remaining is not None:
+            params['remaining'] = 'true' if remaining else 'false'
+        return await self._get(f"{deck_id}/shuffle/", params)
+
+    async def new_unshuffled_deck(self, deck_count=None, jokers_enabled=None, cards=None):
+        """
+        Create a new, unshuffled deck.
+
+        Args:
+            deck_count (int, optional): Number of decks to use.
+            jokers_enabled (bool, optional): Whether to include jokers.
+            cards (str, optional): Comma-separated card codes for a partial deck.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        params = {}
+        if deck_count is not None:
+            params['deck_count'] = deck_count
+        if jokers_enabled is not None:
+            params['jokers_enabled'] = 'true' if jokers_enabled else 'false'
+        if cards is not None:
+            params['cards'] = cards
+        return await self._get("new/", params)
+
+    async def add_to_pile(self, deck_id, pile_name, cards):
+        """
+        Add drawn cards to a named pile.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+            cards (str): Comma-separated card codes to add.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        return await self._get(f"{deck_id}/pile/{pile_name}/add/", {'cards': cards}, idempotent=False)
+
+    async def list_pile(self, deck_id, pile_name):
+        """
+        List cards in a named pile.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        return await self._get(f"{deck_id}/pile/{pile_name}/list/")
+
+    async def draw_from_pile(self, deck_id, pile_name, count=None, cards=None):
+        """
+        Draw cards from a named pile.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+            count (int, optional): Number of cards to draw.
+            cards (str, optional): Comma-separated card codes to draw.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        params = {}
+        if count is not None:
+            params['count'] = count
+        if cards is not None:
+            params['cards'] = cards
+        return await self._get(f"{deck_id}/pile/{pile_name}/draw/", params, idempotent=False)
+
+    async def return_cards(self, deck_id, cards=None):
+        """
+        Return cards from hand to the main deck.
+
+        Args:
+            deck_id (str): The deck ID.
+            cards (str, optional): Comma-separated card codes to return.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        params = {}
+        if cards is not None:
+            params['cards'] = cards
+        return await self._get(f"{deck_id}/return/", params, idempotent=False)
+
+    async def return_cards_to_pile(self, deck_id, pile_name, cards=None):
+        """
+        Return cards from a pile to the main deck.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+            cards (str, optional): Comma-separated card codes to return.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        params = {}
+        if cards is not None:
+            params['cards'] = cards
+        return await self._get(f"{deck_id}/pile/{pile_name}/return/", params, idempotent=False)
+
+
+# Global variable to hold the singleton instance
+_async_deck_client: Optional[Union[AsyncDeckOfCardsClient, LocalDeckEngine]] = None
+
+
+def get_async_deck_client() -> Union[AsyncDeckOfCardsClient, LocalDeckEngine]:
+    """
+    Initializes and returns a singleton deck client, configured from the application configuration.
+    A LocalDeckEngine is used when DECK_BACKEND is 'local', otherwise an AsyncDeckOfCardsClient.
+    """
+    global _async_deck_client
+    if _async_deck_client is None:
+        config = get_config()
+        if config.DECK_BACKEND == "local":
+            _async_deck_client = LocalDeckEngine(seed=config.DECK_SEED)
+            return _async_deck_client
+        _async_deck_client = AsyncDeckOfCardsClient(
+            base_url=config.DECKOFCARDS_URL,
+            connect_timeout=config.DECKOFCARDS_CONNECT_TIMEOUT,
+            read_timeout=config.DECKOFCARDS_READ_TIMEOUT,
+            max_retries=config.DECKOFCARDS_MAX_RETRIES,
+            max_keepalive_connections=config.DECKOFCARDS_MAX_KEEPALIVE,
+        )
+    return _async_deck_client
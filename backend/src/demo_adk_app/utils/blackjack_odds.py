@@ -0,0 +1,154 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cards import CARD_POINTS, VALUE_POINTS
+
+# points of each rank, cards are drawn by rank from an infinite shoe
+_RANK_POINTS = np.array(VALUE_POINTS, dtype=np.int16)
+
+
+def _best_scores(totals: np.ndarray, aces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best scores of hands from their totals with aces counted 11, and their number of aces.
+
+    Returns:
+        The scores, and a mask of soft hands (an ace still counted as 11).
+    """
+    # number of aces to count as 1 to get to 21 or under, if there are enough of them
+    needed = np.clip((totals - 21 + 9) // 10, 0, None)
+    adjusted = np.minimum(needed, aces)
+    return totals - 10 * adjusted, aces > adjusted
+
+
+def score_hands(hands: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scores many blackjack hands at once.
+
+    Args:
+        hands: Hands of card codes (e.g. "KS"), hands can have different numbers of cards.
+
+    Returns:
+        The best score of each hand, and a mask of soft hands.
+    """
+    width = max((len(hand) for hand in hands), default=0)
+    points = np.zeros((len(hands), width), dtype=np.int16)
+    for i, hand in enumerate(hands):
+        points[i, :len(hand)] = [CARD_POINTS[code] for code in hand]
+    return _best_scores(points.sum(axis=1), (points == 11).sum(axis=1))
+
+
+def _draw(rng: np.random.Generator, count: int) -> np.ndarray:
+    return _RANK_POINTS[rng.integers(0, 13, size=count)]
+
+
+def _play_dealer(
+    rng: np.random.Generator, up_card_points: int, num_hands: int, hit_soft_17: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Plays num_hands dealer hands from the up card, drawing the hole card and hitting until standing.
+
+    Returns:
+        The dealer's final scores, and a mask of dealer blackjacks.
+    """
+    hole = _draw(rng, num_hands)
+    totals = up_card_points + hole
+    aces = (hole == 11).astype(np.int16) + (1 if up_card_points == 11 else 0)
+    scores, soft = _best_scores(totals, aces)
+    blackjack = scores == 21
+    while True:
+        hitting = (scores < 17) | ((scores == 17) & soft & hit_soft_17)
+        count = int(hitting.sum())
+        if count == 0:
+            return scores, blackjack
+        drawn = _draw(rng, count)
+        totals[hitting] += drawn
+        aces[hitting] += drawn == 11
+        scores, soft = _best_scores(totals, aces)
+
+
+def _settle(player_scores: np.ndarray, dealer_scores: np.ndarray, dealer_blackjack: np.ndarray) -> Dict[str, float]:
+    """
+    Win / push / loss rates of a (non blackjack) player hand against the simulated dealer hands.
+    """
+    player_bust = player_scores > 21
+    loss = player_bust | dealer_blackjack | ((dealer_scores <= 21) & (dealer_scores > player_scores))
+    win = ~loss & ((dealer_scores > 21) | (player_scores > dealer_scores))
+    push = ~loss & ~win
+    return {
+        "win": float(win.mean()),
+        "push": float(push.mean()),
+        "loss": float(loss.mean()),
+    }
+
+
+def basic_strategy(player_score: int, is_soft: bool, dealer_up_card_points: int) -> str:
+    """
+    Basic strategy hit / stand decision, for games without doubling or splitting.
+
+    Args:
+        player_score: The player's best score.
+        is_soft: True if the player's hand counts an ace as 11.
+        dealer_up_card_points: Points of the dealer's up card, 11 for an ace.
+
+    Returns:
+        "hit" or "stand".
+    """
+    if is_soft:
+        if player_score >= 19 or (player_score == 18 and dealer_up_card_points <= 8):
+            return "stand"
+        return "hit"
+    if player_score >= 17:
+        return "stand"
+    if player_score >= 13:
+        return "stand" if dealer_up_card_points <= 6 else "hit"
+    if player_score == 12:
+        return "stand" if 4 <= dealer_up_card_points <= 6 else "hit"
+    return "hit"
+
+
+def estimate_odds(
+    player_hand: List[str],
+    dealer_up_card: str,
+    num_hands: int = 100000,
+    hit_soft_17: bool = False,
+    seed: Optional[int] = None,
+) -> Dict:
+    """
+    Estimates a player's odds against the dealer's up card with a Monte Carlo simulation of the dealer's hand,
+    drawing from an infinite shoe.
+
+    Args:
+        player_hand: The player's card codes.
+        dealer_up_card: The dealer's visible card code.
+        num_hands: Number of simulated hands.
+        hit_soft_17: True if the dealer hits on a soft 17.
+        seed: Seed for reproducible simulations.
+
+    Returns:
+        The player's score, the probability of busting on a hit, win / push / loss rates when standing
+        and when hitting once then standing, and the basic strategy recommendation.
+    """
+    rng = np.random.default_rng(seed)
+    up_card_points = CARD_POINTS[dealer_up_card]
+    (player_score,), (is_soft,) = score_hands([player_hand])
+    player_total = sum(CARD_POINTS[code] for code in player_hand)
+    player_aces = sum(1 for code in player_hand if CARD_POINTS[code] == 11)
+
+    dealer_scores, dealer_blackjack = _play_dealer(rng, up_card_points, num_hands, hit_soft_17)
+    stand = _settle(np.full(num_hands, player_score, dtype=np.int16), dealer_scores, dealer_blackjack)
+
+    # the same dealer hands are played against a hit, for a paired comparison
+    hit_cards = _draw(rng, num_hands)
+    hit_scores, _ = _best_scores(player_total + hit_cards, player_aces + (hit_cards == 11))
+    hit = _settle(hit_scores, dealer_scores, dealer_blackjack)
+
+    return {
+        "player_score": int(player_score),
+        "is_soft": bool(is_soft),
+        "bust_probability_on_hit": float((hit_scores > 21).mean()),
+        "stand": stand,
+        "hit_then_stand": hit,
+        "recommendation": basic_strategy(int(player_score), bool(is_soft), up_card_points),
+        "simulated_hands": num_hands,
+    }
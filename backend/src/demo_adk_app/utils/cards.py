@@ -0,0 +1,95 @@
+from typing import Dict, List, Tuple, Union
+
+# card values and suits in deckofcardsapi.com encoding, card int = suit_index * 13 + value_index
+VALUE_CODES = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "0", "J", "Q", "K"]
+VALUE_NAMES = ["ACE", "2", "3", "4", "5", "6", "7", "8", "9", "10", "JACK", "QUEEN", "KING"]
+SUIT_CODES = ["S", "D", "C", "H"]
+SUIT_NAMES = ["SPADES", "DIAMONDS", "CLUBS", "HEARTS"]
+# jokers follow the 52 standard cards
+JOKER_CODES = ["X1", "X2"]
+JOKER_SUITS = ["BLACK", "RED"]
+
+# blackjack points of each value, aces count 11 until the hand is adjusted
+VALUE_POINTS = [11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10]
+
+IMAGE_URL = "https://deckofcardsapi.com/static/img"
+
+
+def _card_json(code: str, value: str, suit: str) -> dict:
+    """
+    Builds the deckofcardsapi.com JSON shape for a card.
+    """
+    return {
+        "code": code,
+        "image": f"{IMAGE_URL}/{code}.png",
+        "images": {"svg": f"{IMAGE_URL}/{code}.svg", "png": f"{IMAGE_URL}/{code}.png"},
+        "value": value,
+        "suit": suit,
+    }
+
+
+# precomputed lookup tables between card ints, codes and JSON shapes
+CARD_CODES: List[str] = [v + s for s in SUIT_CODES for v in VALUE_CODES] + JOKER_CODES
+CARD_JSON: List[dict] = [
+    _card_json(VALUE_CODES[i % 13] + SUIT_CODES[i // 13], VALUE_NAMES[i % 13], SUIT_NAMES[i // 13]) for i in range(52)
+] + [_card_json(JOKER_CODES[i], "JOKER", JOKER_SUITS[i]) for i in range(2)]
+CARD_INDEX: Dict[str, int] = {code: i for i, code in enumerate(CARD_CODES)}
+
+# precomputed lookup tables by card code, for game logic on compact 2-char codes
+CARD_POINTS: Dict[str, int] = {CARD_CODES[i]: VALUE_POINTS[i % 13] for i in range(52)}
+CARD_LABELS: Dict[str, str] = {CARD_CODES[i]: f"{VALUE_NAMES[i % 13]} of {SUIT_NAMES[i // 13]}" for i in range(52)}
+# accepted spellings of a card (code or label, any case) to its code
+_CARD_LOOKUP: Dict[str, str] = {
+    **{code: code for code in CARD_CODES},
+    **{label.upper(): code for code, label in CARD_LABELS.items()},
+}
+
+
+def card_code(card: Union[str, dict]) -> str:
+    """
+    Returns the 2-char code of a card given as a code, a label (e.g. "KING of SPADES")
+    or a deckofcardsapi.com card dict.
+
+    Raises:
+        ValueError: if the card is not recognized.
+    """
+    if isinstance(card, dict):
+        card = card.get("code", None) or f"{card.get('value', '')} of {card.get('suit', '')}"
+    code = _CARD_LOOKUP.get(str(card).strip().upper(), None)
+    if code is None:
+        raise ValueError(f"unknown card: {card}")
+    return code
+
+
+def card_label(code: str) -> str:
+    """
+    Returns the readable label of a card code, e.g. "KING of SPADES" for "KS".
+    """
+    return CARD_LABELS[code]
+
+
+def card_json(code: str) -> dict:
+    """
+    Returns the rich deckofcardsapi.com JSON shape of a card code, for API responses.
+    """
+    return CARD_JSON[CARD_INDEX[code]]
+
+
+def score_hand(codes: List[str]) -> Tuple[int, bool]:
+    """
+    Scores a blackjack hand of card codes with table lookups.
+
+    Returns:
+        The best score of the hand, and True if an ace is still counted as 11 in that score.
+    """
+    score = 0
+    num_aces = 0
+    for code in codes:
+        points = CARD_POINTS[code]
+        score += points
+        if points == 11:
+            num_aces += 1
+    while score > 21 and num_aces > 0:
+        score -= 10
+        num_aces -= 1
+    return score, num_aces > 0
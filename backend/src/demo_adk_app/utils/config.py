@@ -18,13 +18,47 @@ class Config(BaseSettings):
     GOOGLE_GENAI_USE_VERTEXAI: str = Field(..., description="Boolean indicating if VertexAI is enabled.")
     APP_NAME: str = Field(..., description="A unique canonical name for the application.")
     DECKOFCARDS_URL: str = Field(..., description="URL for the Deckofcards API service to initialize client instance.")
+    DECKOFCARDS_CONNECT_TIMEOUT: float = Field(2.0, description="Seconds to wait for a connection to the Deckofcards API service.")
+    DECKOFCARDS_READ_TIMEOUT: float = Field(5.0, description="Seconds to wait for a response from the Deckofcards API service.")
+    DECKOFCARDS_MAX_RETRIES: int = Field(2, description="Number of retries for failed Deckofcards API requests.")
+    DECKOFCARDS_MAX_KEEPALIVE: int = Field(20, description="Maximum number of idle keep-alive connections to the Deckofcards API service.")
+    DECK_BACKEND: str = Field("remote", description="Deck backend used by dealer tools: 'remote' for the Deckofcards API service, 'local' for the in-process deck engine (decks live in worker memory, single worker only).")
+    DECK_SEED: Optional[str] = Field(None, description="Seed for reproducible shuffles with the local deck engine (optional).")
+    DEALER_HITS_SOFT_17: bool = Field(False, description="Boolean indicating if the dealer hits on a soft 17 (house rule).")
+    GAME_ROOM_STORE: str = Field("session", description="Store of game rooms: 'session' for the state of the session that created them (each save writes the whole room), 'database' for tables on DB_URL shared across sessions (requires DB_URL), 'memory' for in-process (single worker only).")
+    ODDS_SIMULATIONS: int = Field(100000, description="Number of simulated hands per odds estimate by the dealer's estimate_odds_tool.")
+    STREAM_FLUSH_INTERVAL_MS: int = Field(50, description="Maximum milliseconds streamed message text is buffered before it is sent (0 sends every chunk as its own event).")
+    STREAM_FLUSH_BYTES: int = Field(1024, description="Buffered bytes of streamed message text that trigger sending it before the flush interval.")
+    STREAM_END_PAYLOAD: str = Field("digest", description="Payload of a stream's end event: 'full' for the whole response text, 'digest' for the length and SHA-256 of the streamed message text only.")
+    STREAM_REPLAY_EVENTS: int = Field(1000, description="Maximum events of a turn kept for clients reconnecting with Last-Event-ID.")
+    STREAM_REPLAY_SESSIONS: int = Field(1000, description="Maximum number of sessions whose latest turn is kept for replay, per worker.")
+    STREAM_REPLAY_TTL: int = Field(300, description="Seconds a completed turn is kept for clients reconnecting with Last-Event-ID.")
+    TURN_CONCURRENCY_POLICY: str = Field("queue", description="Handling of a message sent while the conversation has a turn in progress: 'queue' to run it after, 'reject' to refuse it with 429, 'cancel' to cancel the turn in progress.")
+    TURN_QUEUE_SIZE: int = Field(2, description="Maximum messages waiting per conversation with the 'queue' policy, more are refused with 429.")
+    MAX_CONCURRENT_TURNS: int = Field(32, description="Maximum turns running or waiting per worker, more are refused with 429 (0 for no limit).")
+    TURN_RETRY_AFTER: int = Field(5, description="Seconds sent in the Retry-After header of refused turns.")
+    STREAM_DISCONNECT_POLICY: str = Field("cancel", description="Handling of a turn whose streaming client disconnected: 'cancel' to cancel it after the grace period, 'continue' to complete it for clients reconnecting later.")
+    STREAM_DISCONNECT_GRACE_SECONDS: float = Field(15, description="Seconds a disconnected client has to reconnect with Last-Event-ID before its turn is cancelled.")
+    RULES_FAST_PATH: bool = Field(True, description="Boolean indicating if in-game 'hit' / 'stand' messages are handled by the rules engine without an LLM call.")
     CORS_ORIGINS: str = Field(..., description="Comma-separated string of allowed origins for CORS.")
     PORT: int = Field(..., description="The port on which the application will run.")
     IS_TESTING: Optional[bool] = Field(None, description="Boolean indicating if the application is running in a testing environment.")
     GCS_BUCKET: Optional[str] = Field(None, description="Google Cloud Storage bucket name (optional, used for GcsArtifactService).")
     DB_URL: Optional[str] = Field(None, description="Database connection URL (optional, used for DatabaseSessionService).")
+    SESSION_CACHE_SIZE: int = Field(1000, description="Maximum number of hot sessions cached in front of the database session service (0 disables the cache).")
+    SESSION_CACHE_TTL: int = Field(300, description="Maximum seconds a cached session is served before being re-read from the session service.")
+    SESSION_COMPACTION_THRESHOLD: int = Field(0, description="Number of events above which a session's old events are compacted after a turn (0 disables compaction). With DB_URL, compacted events are moved to an events_archive table created on first use.")
+    SESSION_COMPACTION_KEEP_RECENT: int = Field(50, description="Number of most recent events left untouched by session compaction.")
+    SESSION_COMPACTION_PRUNE_TOOL_EVENTS: Optional[bool] = Field(None, description="Boolean indicating if compaction also prunes tool call / response events older than the kept recent events.")
+    SESSION_LISTING_INDEX: Optional[bool] = Field(None, description="Boolean indicating if the ix_sessions_listing index backing conversation listing is created on ADK's sessions table on first use, instead of by a migration (with DB_URL).")
+    PENDING_MESSAGE_BACKEND: str = Field("auto", description="Store of messages submitted for streaming: 'auto' for 'database' when DB_URL is set and 'session' otherwise, 'database' for a table on DB_URL, 'session' for the session state (two system events per turn), 'memory' for in-process (single worker only).")
+    PENDING_MESSAGE_TTL: int = Field(300, description="Maximum seconds a submitted message waits for its stream request before it expires, with the database and memory stores.")
     AGENT_ID: Optional[str] = Field(None, description="Vertex AI Agent Engine resource ID (optional, discovered or created at runtime).")
     RAG_CORPUS: Optional[str] = Field(None, description="Vertex AI RAG Corpus resource name (optional, discovered or created at runtime).")
+    AUTH_TOKEN_CACHE_SIZE: int = Field(1024, description="Maximum number of verified Firebase ID tokens to cache (0 disables the cache).")
+    AUTH_TOKEN_CACHE_TTL: int = Field(300, description="Maximum seconds to cache a verified Firebase ID token, capped by the token's own expiry.")
+    AUTH_LOCAL_VERIFICATION: Optional[bool] = Field(None, description="Boolean indicating if Firebase ID tokens are verified locally against in-memory signing keys.")
+    AUTH_SIGNING_KEYS_FILE: Optional[str] = Field(None, description="Path to a local JSON file of token signing certificates (optional, for offline verification in tests).")
 
     class Config:
         # Pydantic-settings specific configurations
@@ -0,0 +1,347 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .config import get_config
+from .constants import StateVariables
+from .models import GameRoom
+
+# Get a logger instance for this module
+logger = logging.getLogger(__name__)
+
+# fields of the stored game room document, the version is stored alongside it
+_DOCUMENT_FIELDS = [name for name in GameRoom.model_fields if name != "version"]
+
+
+def _to_document(game_room: GameRoom, fields: Iterable[str] = _DOCUMENT_FIELDS) -> Dict[str, Any]:
+    """
+    Returns a copy of the game room's field values as a plain dict, sharing nothing with the room.
+    """
+    return game_room.model_dump(include=set(fields))
+
+
+def _from_document(document: Dict[str, Any], version: int) -> GameRoom:
+    """
+    Builds a game room from a freshly decoded document, without re-validating data the repository wrote itself.
+    """
+    return GameRoom.model_construct(version=version, **document)
+
+
+class GameRoomVersionConflict(Exception):
+    """
+    Raised when saving a game room that was changed by someone else since it was loaded.
+    """
+
+
+class GameRoomRepository(ABC):
+    """
+    Store of game rooms, shared by all sessions and indexed by game room id, host and player.
+
+    Saves use optimistic versioning: a room is saved only if its stored version is still the version
+    it was loaded with, and the room's version is then incremented. Rooms with version 0 are new.
+    """
+
+    @abstractmethod
+    async def get(self, game_room_id: str) -> Optional[GameRoom]:
+        """
+        Returns the game room with the given id, None if it does not exist.
+        """
+
+    @abstractmethod
+    async def save(self, game_room: GameRoom, changed_fields: Optional[Set[str]] = None) -> GameRoom:
+        """
+        Creates (version 0) or updates a game room, and increments its version.
+
+        Args:
+            game_room: The game room to save.
+            changed_fields: Names of the fields changed since the room was loaded, all fields if None.
+                The in-memory store only writes these fields, the SQL and session state stores write
+                the whole room and use them to skip updating the player index.
+
+        Raises:
+            GameRoomVersionConflict: if the room was created or updated since it was loaded.
+        """
+
+    @abstractmethod
+    async def find_by_player(self, user_id: str) -> List[GameRoom]:
+        """
+        Returns the game rooms a user is enrolled in as a player.
+        """
+
+    @abstractmethod
+    async def find_by_host(self, user_id: str) -> List[GameRoom]:
+        """
+        Returns the game rooms hosted by a user.
+        """
+
+    async def get_current_game_id(self, user_id: str) -> Optional[str]:
+        """
+        Returns the id of the game room a user is currently enrolled in, None if not enrolled.
+        """
+        game_rooms = await self.find_by_player(user_id)
+        return game_rooms[0].game_room_id if game_rooms else None
+
+
+class SessionStateGameRoomRepository(GameRoomRepository):
+    """
+    Game room store in the state of the session the tools run in, persisted with the session.
+    Rooms are kept under {game_room_id}_game_details keys, and each player's current game under
+    {user_id}_current_game keys, so a room is only visible to the session that created it.
+    A room is a single state value: every save puts the whole room in the session's state delta.
+    """
+
+    def __init__(self, state: Any):
+        """
+        Args:
+            state: The session state (or ADK State of a tool context) rooms are read from and written to.
+        """
+        self._state = state
+
+    def _current_game_key(self, user_id: str) -> str:
+        return f"{user_id}_{StateVariables.CURRENT_GAME}"
+
+    async def get(self, game_room_id: str) -> Optional[GameRoom]:
+        game_room_dict = self._state.get(f"{game_room_id}_{StateVariables.GAME_DETAILS}", None)
+        # validated, rooms saved before compact card codes are converted on load
+        return GameRoom.model_validate(game_room_dict) if game_room_dict else None
+
+    async def save(self, game_room: GameRoom, changed_fields: Optional[Set[str]] = None) -> GameRoom:
+        # the room is written whole, changed fields only tell whether the player index needs updating
+        key = f"{game_room.game_room_id}_{StateVariables.GAME_DETAILS}"
+        stored = self._state.get(key, None)
+        stored_version = stored.get("version", 0) if stored else 0
+        if stored_version != game_room.version:
+            raise GameRoomVersionConflict(
+                f"game room {game_room.game_room_id} is at version {stored_version}, not {game_room.version}"
+            )
+        game_room.version += 1
+        self._state[key] = game_room.model_dump()
+        if stored is None or changed_fields is None or "players" in changed_fields:
+            old_players = stored.get("players", []) if stored else []
+            for player in set(old_players) - set(game_room.players):
+                if self._state.get(self._current_game_key(player), None) == game_room.game_room_id:
+                    self._state[self._current_game_key(player)] = None
+            for player in game_room.players:
+                if not self._state.get(self._current_game_key(player), None):
+                    self._state[self._current_game_key(player)] = game_room.game_room_id
+        return game_room
+
+    async def find_by_player(self, user_id: str) -> List[GameRoom]:
+        game_room_id = self._state.get(self._current_game_key(user_id), None)
+        game_room = await self.get(game_room_id) if game_room_id else None
+        return [game_room] if game_room else []
+
+    async def find_by_host(self, user_id: str) -> List[GameRoom]:
+        state = self._state.to_dict() if hasattr(self._state, "to_dict") else self._state
+        return [
+            GameRoom.model_validate(value) for key, value in sorted(state.items())
+            if key.endswith(f"_{StateVariables.GAME_DETAILS}") and value and value.get("host_user_id", None) == user_id
+        ]
+
+
+class InMemoryGameRoomRepository(GameRoomRepository):
+    """
+    Game room store held in process memory, for single worker deployments and testing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # stored documents and versions, by game room id
+        self._game_rooms: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._by_player: Dict[str, Set[str]] = {}
+        self._by_host: Dict[str, Set[str]] = {}
+
+    def _index(self, index: Dict[str, Set[str]], old_keys: List[str], new_keys: List[str], game_room_id: str):
+        for key in set(old_keys) - set(new_keys):
+            index.get(key, set()).discard(game_room_id)
+        for key in set(new_keys) - set(old_keys):
+            index.setdefault(key, set()).add(game_room_id)
+
+    async def get(self, game_room_id: str) -> Optional[GameRoom]:
+        stored = self._game_rooms.get(game_room_id, None)
+        if not stored:
+            return None
+        # validation builds a copy, so changes are only visible once saved
+        return GameRoom.model_validate({**stored, "version": self._versions[game_room_id]})
+
+    async def save(self, game_room: GameRoom, changed_fields: Optional[Set[str]] = None) -> GameRoom:
+        game_room_id = game_room.game_room_id
+        with self._lock:
+            stored = self._game_rooms.get(game_room_id, None)
+            stored_version = self._versions.get(game_room_id, 0)
+            if stored_version != game_room.version:
+                raise GameRoomVersionConflict(
+                    f"game room {game_room_id} is at version {stored_version}, not {game_room.version}"
+                )
+            old_players = stored["players"] if stored else []
+            old_hosts = [stored["host_user_id"]] if stored else []
+            if stored is None or changed_fields is None:
+                self._game_rooms[game_room_id] = _to_document(game_room)
+            else:
+                stored.update(_to_document(game_room, changed_fields))
+            game_room.version += 1
+            self._versions[game_room_id] = game_room.version
+            self._index(self._by_player, old_players, game_room.players, game_room_id)
+            self._index(self._by_host, old_hosts, [game_room.host_user_id], game_room_id)
+        return game_room
+
+    async def find_by_player(self, user_id: str) -> List[GameRoom]:
+        return [await self.get(game_room_id) for game_room_id in sorted(self._by_player.get(user_id, ()))]
+
+    async def find_by_host(self, user_id: str) -> List[GameRoom]:
+        return [await self.get(game_room_id) for game_room_id in sorted(self._by_host.get(user_id, ()))]
+
+
+class SqlGameRoomRepository(GameRoomRepository):
+    """
+    Game room store in database tables, shared by all workers of a multi-worker deployment.
+    Rooms are stored as JSON documents, with an index table of their players.
+    """
+
+    def __init__(self, db_url: str):
+        """
+        Initializes the store, creating its tables if needed.
+
+        Args:
+            db_url: SQLAlchemy database URL.
+        """
+        from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, Text, create_engine
+
+        self._engine = create_engine(db_url)
+        metadata = MetaData()
+        self._game_rooms = Table(
+            "game_rooms",
+            metadata,
+            Column("game_room_id", String(128), primary_key=True),
+            Column("host_user_id", String(256), index=True),
+            Column("game_status", String(32)),
+            Column("version", Integer, nullable=False),
+            Column("data", Text, nullable=False),
+            Column("update_time", Float, nullable=False),
+        )
+        self._players = Table(
+            "game_room_players",
+            metadata,
+            Column("game_room_id", String(128), primary_key=True),
+            Column("user_id", String(256), primary_key=True),
+            Index("ix_game_room_players_user_id", "user_id"),
+        )
+        metadata.create_all(self._engine, checkfirst=True)
+
+    def _get(self, game_room_id: str) -> Optional[GameRoom]:
+        with self._engine.connect() as connection:
+            row = connection.execute(
+                self._game_rooms.select().where(self._game_rooms.c.game_room_id == game_room_id)
+            ).first()
+        return self._to_game_room(row) if row else None
+
+    def _to_game_room(self, row) -> GameRoom:
+        return _from_document(json.loads(row.data), row.version)
+
+    def _save(self, game_room: GameRoom, changed_fields: Optional[Set[str]] = None) -> GameRoom:
+        from sqlalchemy.exc import IntegrityError
+
+        values = {
+            "host_user_id": game_room.host_user_id,
+            "game_status": game_room.game_status,
+            "version": game_room.version + 1,
+            # the room is stored as one document, written whole
+            "data": json.dumps({name: getattr(game_room, name) for name in _DOCUMENT_FIELDS}),
+            "update_time": time.time(),
+        }
+        rooms = self._game_rooms
+        try:
+            with self._engine.begin() as connection:
+                if game_room.version == 0:
+                    connection.execute(rooms.insert().values(game_room_id=game_room.game_room_id, **values))
+                else:
+                    result = connection.execute(
+                        rooms.update()
+                        .where(rooms.c.game_room_id == game_room.game_room_id)
+                        .where(rooms.c.version == game_room.version)
+                        .values(**values)
+                    )
+                    if result.rowcount != 1:
+                        raise GameRoomVersionConflict(
+                            f"game room {game_room.game_room_id} changed since version {game_room.version}"
+                        )
+                # keep the player index in step with the room, when its players may have changed
+                if game_room.version == 0 or changed_fields is None or "players" in changed_fields:
+                    connection.execute(
+                        self._players.delete().where(self._players.c.game_room_id == game_room.game_room_id)
+                    )
+                    if game_room.players:
+                        connection.execute(self._players.insert(), [
+                            {"game_room_id": game_room.game_room_id, "user_id": player} for player in game_room.players
+                        ])
+        except IntegrityError as e:
+            raise GameRoomVersionConflict(f"game room {game_room.game_room_id} already exists") from e
+        game_room.version += 1
+        return game_room
+
+    def _find_by_player(self, user_id: str) -> List[GameRoom]:
+        rooms = self._game_rooms
+        with self._engine.connect() as connection:
+            rows = connection.execute(
+                rooms.select()
+                .join(self._players, self._players.c.game_room_id == rooms.c.game_room_id)
+                .where(self._players.c.user_id == user_id)
+                .order_by(rooms.c.update_time.desc())
+            ).all()
+        return [self._to_game_room(row) for row in rows]
+
+    def _find_by_host(self, user_id: str) -> List[GameRoom]:
+        rooms = self._game_rooms
+        with self._engine.connect() as connection:
+            rows = connection.execute(
+                rooms.select().where(rooms.c.host_user_id == user_id).order_by(rooms.c.update_time.desc())
+            ).all()
+        return [self._to_game_room(row) for row in rows]
+
+    # database calls run in a worker thread, so they don't block the event loop
+
+    async def get(self, game_room_id: str) -> Optional[GameRoom]:
+        return await asyncio.to_thread(self._get, game_room_id)
+
+    async def save(self, game_room: GameRoom, changed_fields: Optional[Set[str]] = None) -> GameRoom:
+        return await asyncio.to_thread(self._save, game_room, changed_fields)
+
+    async def find_by_player(self, user_id: str) -> List[GameRoom]:
+        return await asyncio.to_thread(self._find_by_player, user_id)
+
+    async def find_by_host(self, user_id: str) -> List[GameRoom]:
+        return await asyncio.to_thread(self._find_by_host, user_id)
+
+
+_game_room_repository: Optional[GameRoomRepository] = None
+
+
+def get_game_room_repository(state: Any) -> GameRoomRepository:
+    """
+    Returns the game room repository configured from the application configuration: a singleton
+    SqlGameRoomRepository on DB_URL when GAME_ROOM_STORE is 'database', a singleton in-memory one when it is
+    'memory' (single worker deployments only), otherwise a SessionStateGameRoomRepository on the given state.
+
+    Args:
+        state: The state of the session the game room tools run in.
+
+    Raises:
+        ValueError: if GAME_ROOM_STORE is 'database' and DB_URL is not set.
+    """
+    global _game_room_repository
+    if _game_room_repository is None:
+        config = get_config()
+        if config.GAME_ROOM_STORE == "database":
+            if not config.DB_URL:
+                raise ValueError("GAME_ROOM_STORE is 'database' but DB_URL is not set")
+            _game_room_repository = SqlGameRoomRepository(db_url=config.DB_URL)
+        elif config.GAME_ROOM_STORE == "memory":
+            _game_room_repository = InMemoryGameRoomRepository()
+        else:
+            return SessionStateGameRoomRepository(state)
+    return _game_room_repository
@@ -0,0 +1,405 @@
+import functools
+import hashlib
+import secrets
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .cards import CARD_CODES, CARD_JSON, CARD_INDEX
+
+
+class _SeededCsprng:
+    """
+    Deterministic cryptographically secure random stream (SHA-256 in counter mode),
+    used for reproducible shuffles when the engine is seeded.
+    """
+
+    def __init__(self, seed: str):
+        self._key = hashlib.sha256(seed.encode("utf-8")).digest()
+        self._counter = 0
+
+    def randbytes(self, n: int) -> bytes:
+        out = b""
+        while len(out) < n:
+            out += hashlib.sha256(self._key + self._counter.to_bytes(8, "big")).digest()
+            self._counter += 1
+        return out[:n]
+
+    def randbelow(self, n: int) -> int:
+        # rejection sampling to avoid modulo bias
+        bits = max(n.bit_length(), 1)
+        while True:
+            r = int.from_bytes(self.randbytes((bits + 7) // 8), "big") >> (-bits % 8)
+            if r < n:
+                return r
+
+
+class _SystemCsprng:
+    """
+    Non deterministic cryptographically secure random stream from the OS.
+    """
+
+    def randbytes(self, n: int) -> bytes:
+        return secrets.token_bytes(n)
+
+    def randbelow(self, n: int) -> int:
+        return secrets.randbelow(n)
+
+
+class _UnknownCardCode(ValueError):
+    """
+    Raised when parsing a card code that is not in the deck.
+    """
+
+
+def _unknown_cards_as_error(method):
+    """
+    Returns an API error response from an engine method given unknown card codes, like the API does.
+    """
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await method(*args, **kwargs)
+        except _UnknownCardCode as e:
+            return {"success": False, "error": f"Unknown card code: {e}"}
+    return wrapper
+
+
+class _Deck:
+    """
+    In-memory deck state, cards are compact integers with the top of the deck at the end.
+    """
+
+    __slots__ = ("stack", "piles", "all_cards")
+
+    def __init__(self, cards: bytearray):
+        self.stack = cards
+        self.piles: Dict[str, bytearray] = {}
+        self.all_cards = bytes(cards)
+
+
+class LocalDeckEngine:
+    """
+    In-process drop-in replacement for the Deck of Cards API.
+
+    Exposes the same methods and JSON responses as DeckOfCardsClient, as coroutines like
+    AsyncDeckOfCardsClient, but keeps decks in memory as integer arrays, so draws make no network calls.
+    Shuffles use a cryptographically secure random stream, which is reproducible when a seed is given.
+    """
+
+    def __init__(self, seed: Optional[str] = None, max_decks: int = 10000):
+        """
+        Initializes the engine.
+
+        Args:
+            seed (str, optional): Seed for reproducible shuffles and deck ids.
+            max_decks (int): Maximum number of decks kept in memory, least recently used are evicted.
+        """
+        self._rng = _SeededCsprng(seed) if seed is not None else _SystemCsprng()
+        self._max_decks = max_decks
+        self._decks: "OrderedDict[str, _Deck]" = OrderedDict()
+
+    def _shuffle(self, cards: bytearray):
+        # Fisher-Yates shuffle
+        for i in range(len(cards) - 1, 0, -1):
+            j = self._rng.randbelow(i + 1)
+            cards[i], cards[j] = cards[j], cards[i]
+
+    def _new_deck(self, deck_count=None, jokers_enabled=None, cards=None, shuffled=True) -> str:
+        if cards:
+            base = self._parse_codes(cards)
+        else:
+            base = list(range(54 if jokers_enabled else 52))
+        stack = bytearray(base * (deck_count or 1))
+        if shuffled:
+            self._shuffle(stack)
+        else:
+            # top of the deck is at the end
+            stack.reverse()
+        deck_id = self._rng.randbytes(6).hex()
+        self._decks[deck_id] = _Deck(stack)
+        while len(self._decks) > self._max_decks:
+            self._decks.popitem(last=False)
+        return deck_id
+
+    def _get_deck(self, deck_id: str) -> Optional[_Deck]:
+        deck = self._decks.get(deck_id, None)
+        if deck is not None:
+            self._decks.move_to_end(deck_id)
+        return deck
+
+    @staticmethod
+    def _not_found(deck_id: str) -> dict:
+        return {"success": False, "error": f"Deck ID does not exist: {deck_id}"}
+
+    @staticmethod
+    def _piles_json(deck: _Deck) -> dict:
+        return {name: {"remaining": len(pile)} for name, pile in deck.piles.items()}
+
+    @staticmethod
+    def _parse_codes(cards: Optional[str]) -> List[int]:
+        """
+        Parses comma-separated card codes.
+
+        Raises:
+            _UnknownCardCode: for a code that is not a card.
+        """
+        if not cards:
+            return []
+        parsed = []
+        for code in cards.split(","):
+            code = code.strip().upper()
+            if not code:
+                continue
+            if code not in CARD_INDEX:
+                raise _UnknownCardCode(code)
+            parsed.append(CARD_INDEX[code])
+        return parsed
+
+    @staticmethod
+    def _take(source: bytearray, count: int) -> List[int]:
+        """
+        Takes up to count cards from the top (end) of the source.
+        """
+        count = min(count, len(source))
+        if count <= 0:
+            return []
+        taken = source[-count:]
+        del source[-count:]
+        return list(reversed(taken))
+
+    def _in_hand(self, deck: _Deck) -> List[int]:
+        """
+        Returns cards of the deck that are neither in the main stack nor in a pile.
+        """
+        counts: Dict[int, int] = {}
+        for card in deck.all_cards:
+            counts[card] = counts.get(card, 0) + 1
+        for card in deck.stack:
+            counts[card] -= 1
+        for pile in deck.piles.values():
+            for card in pile:
+                counts[card] -= 1
+        return [card for card, n in counts.items() for _ in range(n)]
+
+    @_unknown_cards_as_error
+    async def shuffle_new_deck(self, deck_count=None, jokers_enabled=None, cards=None):
+        """
+        Shuffle a new deck (optionally partial, with jokers, or multiple decks).
+
+        Args:
+            deck_count (int, optional): Number of decks to use.
+            jokers_enabled (bool, optional): Whether to include jokers.
+            cards (str, optional): Comma-separated card codes for a partial deck.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck_id = self._new_deck(deck_count, jokers_enabled, cards, shuffled=True)
+        return {"success": True, "deck_id": deck_id, "remaining": len(self._decks[deck_id].stack), "shuffled": True}
+
+    async def draw_cards(self, deck_id, count=None):
+        """
+        Draw cards from a deck.
+
+        Args:
+            deck_id (str): The deck ID or "new".
+            count (int, optional): Number of cards to draw.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        if deck_id == "new":
+            deck_id = self._new_deck(shuffled=True)
+        deck = self._get_deck(deck_id)
+        if deck is None:
+            return self._not_found(deck_id)
+        count = 1 if count is None else count
+        drawn = self._take(deck.stack, count)
+        response = {
+            "success": len(drawn) == count,
+            "deck_id": deck_id,
+            "cards": [CARD_JSON[card] for card in drawn],
+            "remaining": len(deck.stack),
+        }
+        if len(drawn) < count:
+            response["error"] = f"Not enough cards remaining to draw {count - len(drawn)} additional"
+        return response
+
+    async def reshuffle_deck(self, deck_id, remaining=None):
+        """
+        Reshuffle an existing deck.
+
+        Args:
+            deck_id (str): The deck ID.
+            remaining (bool, optional): Shuffle only remaining cards.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck = self._get_deck(deck_id)
+        if deck is None:
+            return self._not_found(deck_id)
+        if not remaining:
+            deck.stack = bytearray(deck.all_cards)
+            deck.piles = {}
+        self._shuffle(deck.stack)
+        return {"success": True, "deck_id": deck_id, "remaining": len(deck.stack), "shuffled": True}
+
+    @_unknown_cards_as_error
+    async def new_unshuffled_deck(self, deck_count=None, jokers_enabled=None, cards=None):
+        """
+        Create a new, unshuffled deck.
+
+        Args:
+            deck_count (int, optional): Number of decks to use.
+            jokers_enabled (bool, optional): Whether to include jokers.
+            cards (str, optional): Comma-separated card codes for a partial deck.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck_id = self._new_deck(deck_count, jokers_enabled, cards, shuffled=False)
+        return {"success": True, "deck_id": deck_id, "remaining": len(self._decks[deck_id].stack), "shuffled": False}
+
+    @_unknown_cards_as_error
+    async def add_to_pile(self, deck_id, pile_name, cards):
+        """
+        Add drawn cards to a named pile.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+            cards (str): Comma-separated card codes to add.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck = self._get_deck(deck_id)
+        if deck is None:
+            return self._not_found(deck_id)
+        in_hand = self._in_hand(deck)
+        to_add = self._parse_codes(cards)
+        for card in to_add:
+            if card not in in_hand:
+                return {"success": False, "error": f"The card {CARD_CODES[card]} has not been drawn.", "deck_id": deck_id}
+            in_hand.remove(card)
+        deck.piles.setdefault(pile_name, bytearray()).extend(to_add)
+        return {"success": True, "deck_id": deck_id, "remaining": len(deck.stack), "piles": self._piles_json(deck)}
+
+    async def list_pile(self, deck_id, pile_name):
+        """
+        List cards in a named pile.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck = self._get_deck(deck_id)
+        if deck is None:
+            return self._not_found(deck_id)
+        piles = self._piles_json(deck)
+        if pile_name in deck.piles:
+            piles[pile_name]["cards"] = [CARD_JSON[card] for card in deck.piles[pile_name]]
+        return {"success": True, "deck_id": deck_id, "remaining": len(deck.stack), "piles": piles}
+
+    @_unknown_cards_as_error
+    async def draw_from_pile(self, deck_id, pile_name, count=None, cards=None):
+        """
+        Draw cards from a named pile.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+            count (int, optional): Number of cards to draw.
+            cards (str, optional): Comma-separated card codes to draw.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck = self._get_deck(deck_id)
+        if deck is None:
+            return self._not_found(deck_id)
+        pile = deck.piles.get(pile_name, bytearray())
+        if cards:
+            drawn = self._parse_codes(cards)
+            # all requested cards are checked on a copy, so a missing card leaves the pile unchanged
+            remaining = bytearray(pile)
+            for card in drawn:
+                if card not in remaining:
+                    return {"success": False, "error": f"The card {CARD_CODES[card]} is not in pile {pile_name}.", "deck_id": deck_id}
+                remaining.remove(card)
+            pile[:] = remaining
+        else:
+            drawn = self._take(pile, 1 if count is None else count)
+        return {
+            "success": True,
+            "deck_id": deck_id,
+            "remaining": len(deck.stack),
+            "piles": self._piles_json(deck),
+            "cards": [CARD_JSON[card] for card in drawn],
+        }
+
+    @_unknown_cards_as_error
+    async def return_cards(self, deck_id, cards=None):
+        """
+        Return cards from hand to the main deck.
+
+        Args:
+            deck_id (str): The deck ID.
+            cards (str, optional): Comma-separated card codes to return.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck = self._get_deck(deck_id)
+        if deck is None:
+            return self._not_found(deck_id)
+        if cards:
+            in_hand = self._in_hand(deck)
+            to_return = self._parse_codes(cards)
+            for card in to_return:
+                if card not in in_hand:
+                    return {"success": False, "error": f"The card {CARD_CODES[card]} has not been drawn.", "deck_id": deck_id}
+                in_hand.remove(card)
+        else:
+            # all drawn cards, including those in piles
+            to_return = self._in_hand(deck)
+            for pile in deck.piles.values():
+                to_return.extend(pile)
+                pile.clear()
+        # returned cards go to the bottom of the deck
+        deck.stack[0:0] = bytes(reversed(to_return))
+        return {"success": True, "deck_id": deck_id, "remaining": len(deck.stack), "shuffled": False}
+
+    @_unknown_cards_as_error
+    async def return_cards_to_pile(self, deck_id, pile_name, cards=None):
+        """
+        Return cards from a pile to the main deck.
+
+        Args:
+            deck_id (str): The deck ID.
+            pile_name (str): Name of the pile.
+            cards (str, optional): Comma-separated card codes to return.
+
+        Returns:
+            dict: JSON response in the API's format.
+        """
+        deck = self._get_deck(deck_id)
+        if deck is None:
+            return self._not_found(deck_id)
+        pile = deck.piles.get(pile_name, bytearray())
+        if cards:
+            to_return = []
+            for card in self._parse_codes(cards):
+                if card not in pile:
+                    return {"success": False, "error": f"The card {CARD_CODES[card]} is not in pile {pile_name}.", "deck_id": deck_id}
+                pile.remove(card)
+                to_return.append(card)
+        else:
+            to_return = list(pile)
+            pile.clear()
+        deck.stack[0:0] = bytes(reversed(to_return))
+        return {"success": True, "deck_id": deck_id, "remaining": len(deck.stack), "piles": self._piles_json(deck)}
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Any, Optional
 
+from .cards import card_code
+
 class GameRoom(BaseModel):
     game_room_id: str = Field(None, description="game room id")
     max_number_players: int = Field(1, description="maximum number of players that can join the game (including host)")
@@ -9,11 +11,26 @@ class GameRoom(BaseModel):
     game_status: str = Field("pre-game", description="current status of the game (pre-game, in-game, betting, playing, post-game)")
     current_turn_player_id: Optional[str] = Field(None, description="user id of the current turn player in game")
     deck: Dict[str, Any] = Field({}, description="deck of card used in the game")
-    cards: List[Dict[str, Any]] = Field([], description="cards in the deck used for game")
-    player_cards: Dict[str, List[Any]] = Field({}, description="player cards with player_id as key and their cards as value")
+    cards: List[str] = Field([], description="codes of the cards in the deck used for game")
+    player_cards: Dict[str, List[str]] = Field({}, description="player cards with player_id as key and their card codes (e.g. 'KS') as value")
     bets: Dict[str, int] = Field({}, description="player bets with player_id as key and their bet as value")
     dealer_score: int = Field(0, description="dealer's score")
-    dealer_cards: List[Any] = Field([], description="dealer's cards")
+    dealer_cards: List[str] = Field([], description="dealer's card codes (e.g. 'KS')")
     hole_card_revealed: bool = Field(False, description="flag to track if dealer's hole card has been revealed")
     player_scores: Dict[str, int] = Field({}, description="player scores with player_id as key and their score as value")
-    player_hand_status: Dict[str, str] = Field({}, description="player hand status")
\ No newline at end of file
+    player_hand_status: Dict[str, str] = Field({}, description="player hand status")
+    player_results: Dict[str, str] = Field({}, description="player results for the hand with player_id as key (win, loss, push, blackjack_win)")
+    version: int = Field(0, description="version of the stored game room, for optimistic concurrency (0 if not yet stored)")
+
+    @field_validator("cards", "dealer_cards", mode="before")
+    @classmethod
+    def _compact_cards(cls, cards):
+        # game rooms saved before compact card codes hold deckofcardsapi.com card dicts
+        return [card_code(card) for card in cards] if cards else cards
+
+    @field_validator("player_cards", mode="before")
+    @classmethod
+    def _compact_player_cards(cls, player_cards):
+        if not player_cards:
+            return player_cards
+        return {player: [card_code(card) for card in cards] for player, cards in player_cards.items()}
@@ -14,10 +14,11 @@
 
 """The 'memorize' tool for several agents to affect session states."""
 
+from collections import OrderedDict
 from datetime import datetime
 import json
 import os
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from google.genai import types
 from google.adk.agents.callback_context import CallbackContext
@@ -25,6 +26,31 @@ from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 from .constants import StateVariables
 from .models import GameRoom
+from .game_room_repository import (
+    GameRoomVersionConflict,
+    SessionStateGameRoomRepository,
+    get_game_room_repository,
+    _to_document,
+)
+
+# game rooms loaded by recent invocations, each with a snapshot of its fields as loaded,
+# so that a room is loaded once per agent turn and saves know which fields changed
+_MAX_TRACKED_INVOCATIONS = 256
+_invocation_game_rooms: "OrderedDict[str, Dict[str, Tuple[GameRoom, Dict[str, Any]]]]" = OrderedDict()
+
+# game room fields included in the summary returned by tools
+_SUMMARY_FIELDS = [
+    "game_room_id",
+    "host_user_id",
+    "players",
+    "max_number_players",
+    "game_status",
+    "current_turn_player_id",
+    "bets",
+    "player_scores",
+    "player_hand_status",
+    "player_results",
+]
 
 
 def memorize_list(key: str, value: str, tool_context: ToolContext):
@@ -103,9 +129,29 @@ def initialize_session_state_for_instruction_prompts(callback_context: CallbackC
             state[key] = None
     return None
 
-def _load_game_room(game_room_id: str, tool_context: ToolContext):
+def _identity_map(tool_context: ToolContext):
     """
-    utility method to load game room object
+    utility method to get the game rooms loaded within the tool context's invocation
+    Args:
+        tool_context: The ADK tool context.
+    Returns:
+        dict of game room id to loaded game room and snapshot of its fields, None if there is no invocation id
+    """
+    invocation_id = getattr(tool_context, "invocation_id", None)
+    if not invocation_id:
+        return None
+    identity_map = _invocation_game_rooms.get(invocation_id, None)
+    if identity_map is None:
+        identity_map = _invocation_game_rooms[invocation_id] = {}
+        while len(_invocation_game_rooms) > _MAX_TRACKED_INVOCATIONS:
+            _invocation_game_rooms.popitem(last=False)
+    else:
+        _invocation_game_rooms.move_to_end(invocation_id)
+    return identity_map
+
+async def _load_game_room(game_room_id: str, tool_context: ToolContext):
+    """
+    utility method to load game room object, a game room is loaded once per invocation
     Args:
         game_room_id: a game room id to load the game
         tool_context: The ADK tool context.
@@ -113,35 +159,96 @@ def _load_game_room(game_room_id: str, tool_context: ToolContext):
         game_room: if successfule
         error: if failure
     """
-    # TODO: remove this when move from "app:" scope to DB store
-    state = tool_context.state
-
-    # check if game room exists (app scope)
-    # TODO: replace this from "app:" scope to DB store
-    # game_room_dict = state.get(f"{State.APP_PREFIX}{game_room_id}_{StateVariables.GAME_DETAILS}", None)
-    game_room_dict = state.get(f"{game_room_id}_{StateVariables.GAME_DETAILS}", None)
-    if not game_room_dict:
+    identity_map = _identity_map(tool_context)
+    if identity_map is not None and game_room_id in identity_map:
+        return identity_map[game_room_id][0], None
+
+    repository = get_game_room_repository(tool_context.state)
+    game_room = await repository.get(game_room_id)
+    if not game_room and not isinstance(repository, SessionStateGameRoomRepository):
+        # games created before a shared game room store are still kept in session state
+        game_room = await SessionStateGameRoomRepository(tool_context.state).get(game_room_id)
+        if game_room:
+            game_room.version = 0
+    if not game_room:
         return None, {
             "status" : "error",
             "message" : f"game room with id {game_room_id} does not exist"
         }
-
-    # convert to pydantic model
-    game_room = GameRoom.model_validate(game_room_dict)
+    if identity_map is not None:
+        identity_map[game_room_id] = (game_room, _to_document(game_room))
     return game_room, None
 
-def _save_game_room(game_room: GameRoom, tool_context: ToolContext):
+def _discard_game_room(game_room_id: str, tool_context: ToolContext):
     """
-    utility method to save game room object
+    utility method to drop a game room from the invocation's loaded rooms, when a tool fails after
+    changing it without saving, so that later tools of the invocation reload the stored room
+    Args:
+        game_room_id: id of the game room to drop
+        tool_context: The ADK tool context.
+    """
+    identity_map = _identity_map(tool_context)
+    if identity_map is not None:
+        identity_map.pop(game_room_id, None)
+
+async def _save_game_room(game_room: GameRoom, tool_context: ToolContext):
+    """
+    utility method to save game room object, skipped if no field changed since it was loaded
     Args:
         game_room: a game room object to save
         tool_context: The ADK tool context.
     Returns:
-        None
+        None: if successful
+        error: if the game room was changed by another request since it was loaded
+    """
+    identity_map = _identity_map(tool_context)
+    entry = identity_map.get(game_room.game_room_id, None) if identity_map is not None else None
+    changed_fields = None
+    if entry and entry[0] is game_room:
+        snapshot = entry[1]
+        changed_fields = {name for name, value in snapshot.items() if getattr(game_room, name) != value}
+        if not changed_fields:
+            return None
+
+    try:
+        await get_game_room_repository(tool_context.state).save(game_room, changed_fields)
+    except GameRoomVersionConflict as e:
+        # reload the game room on retry
+        _discard_game_room(game_room.game_room_id, tool_context)
+        return {
+            "status" : "error",
+            "message" : f"game room {game_room.game_room_id} was updated concurrently, please retry: {e}"
+        }
+
+    if identity_map is not None:
+        if changed_fields is None:
+            identity_map[game_room.game_room_id] = (game_room, _to_document(game_room))
+        else:
+            entry[1].update(_to_document(game_room, changed_fields))
+    return None
+
+def _game_room_summary(game_room: GameRoom):
+    """
+    utility method to summarize a game room for tool responses, without the deck, cards and hands
+    Args:
+        game_room: a game room object to summarize
+    Returns:
+        dict with the game room's status, players, bets, scores and results
     """
-    # TODO: remove this when move from "app:" scope to DB store
-    state = tool_context.state
+    return {name: getattr(game_room, name) for name in _SUMMARY_FIELDS}
 
-    # TODO: replace this from "app:" scope to DB store
-    # state[f"{State.APP_PREFIX}{game_room.game_room_id}_{StateVariables.GAME_DETAILS}"] = game_room.model_dump()
-    state[f"{game_room.game_room_id}_{StateVariables.GAME_DETAILS}"] = game_room.model_dump()
+async def _get_current_game_id(user_id: str, tool_context: ToolContext):
+    """
+    utility method to find the game room a user is currently enrolled in
+    Args:
+        user_id: user id of the player
+        tool_context: The ADK tool context.
+    Returns:
+        game room id, or None if user is not enrolled in a game
+    """
+    repository = get_game_room_repository(tool_context.state)
+    game_room_id = await repository.get_current_game_id(user_id)
+    if not game_room_id and not isinstance(repository, SessionStateGameRoomRepository):
+        # games created before a shared game room store are still tracked in session state
+        game_room_id = tool_context.state.get(f"{user_id}_{StateVariables.CURRENT_GAME}", None)
+    return game_room_id
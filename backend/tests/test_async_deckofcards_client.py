@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from demo_adk_app.utils.async_deckofcards_client import AsyncDeckOfCardsClient
+
+
+def _client(responses):
+    """
+    Client on a stub transport replaying the given responses or errors, recording the requested paths.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client = AsyncDeckOfCardsClient(
+        base_url="http://deck.test/api/deck",
+        backoff_seconds=0,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return client, requests
+
+
+def _ok(payload):
+    return httpx.Response(200, json={"success": True, **payload})
+
+
+def test_draw_is_not_retried_after_read_timeout():
+    client, requests = _client([httpx.ReadTimeout("timed out"), _ok({"cards": []})])
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(client.draw_cards("deck1", count=2))
+    assert requests == ["/api/deck/deck1/draw/"]
+
+
+def test_draw_is_not_retried_on_server_error():
+    client, requests = _client([httpx.Response(503), _ok({"cards": []})])
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.draw_cards("deck1", count=2))
+    assert len(requests) == 1
+
+
+def test_draw_is_retried_when_connection_failed():
+    client, requests = _client([httpx.ConnectError("refused"), _ok({"cards": [{"code": "AS"}]})])
+    response = asyncio.run(client.draw_cards("deck1", count=1))
+    assert response["cards"] == [{"code": "AS"}]
+    assert len(requests) == 2
+
+
+def test_pile_changes_are_not_retried_after_read_timeout():
+    client, requests = _client([httpx.ReadTimeout("timed out"), _ok({})])
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(client.add_to_pile("deck1", "dealer", "AS"))
+    assert requests == ["/api/deck/deck1/pile/dealer/add/"]
+
+
+def test_read_only_requests_are_retried_on_timeouts_and_server_errors():
+    client, requests = _client([
+        httpx.ReadTimeout("timed out"),
+        httpx.Response(502),
+        _ok({"deck_id": "deck1", "remaining": 52}),
+    ])
+    response = asyncio.run(client.shuffle_new_deck(deck_count=1))
+    assert response["deck_id"] == "deck1"
+    assert requests == ["/api/deck/new/shuffle/"] * 3
+
+
+def test_retries_are_bounded():
+    client, requests = _client([httpx.Response(500)] * 3)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.list_pile("deck1", "dealer"))
+    assert len(requests) == 3
@@ -0,0 +1,53 @@
+import pytest
+
+from demo_adk_app.utils.blackjack_odds import basic_strategy, estimate_odds, score_hands
+
+
+def test_score_hands_counts_aces_as_1_only_when_needed():
+    scores, soft = score_hands([["AS", "AH", "9D"], ["AS", "KS", "5D"], ["KS", "QS", "2D"], ["AS", "6H"]])
+    assert scores.tolist() == [21, 16, 22, 17]
+    assert soft.tolist() == [True, False, False, True]
+
+
+@pytest.mark.parametrize("player_hand, bust_probability", [
+    (["0S", "QS"], 12 / 13),  # only an ace does not bust a hard 20
+    (["0S", "2S"], 4 / 13),  # ten-valued cards bust a hard 12
+    (["AS", "6S"], 0.0),  # a soft hand never busts on one card
+])
+def test_bust_probability_on_hit(player_hand, bust_probability):
+    odds = estimate_odds(player_hand, "6D", num_hands=200000, seed=1)
+    assert odds["bust_probability_on_hit"] == pytest.approx(bust_probability, abs=0.005)
+
+
+def test_seeded_estimates_are_reproducible():
+    first = estimate_odds(["0S", "6H"], "0D", num_hands=10000, seed=7)
+    assert estimate_odds(["0S", "6H"], "0D", num_hands=10000, seed=7) == first
+    assert estimate_odds(["0S", "6H"], "0D", num_hands=10000, seed=8) != first
+
+    assert first["player_score"] == 16 and first["is_soft"] is False
+    assert first["recommendation"] == "hit"
+    for rates in (first["stand"], first["hit_then_stand"]):
+        assert sum(rates.values()) == pytest.approx(1.0)
+    # standing on 16 only wins when the dealer busts, about 23% of the time against a 10
+    assert first["stand"]["push"] == 0.0
+    assert first["stand"]["win"] == pytest.approx(0.23, abs=0.02)
+
+
+def test_dealer_hitting_soft_17_changes_the_dealer_hands():
+    stands = estimate_odds(["0S", "7H"], "AD", num_hands=200000, seed=3)
+    hits = estimate_odds(["0S", "7H"], "AD", num_hands=200000, seed=3, hit_soft_17=True)
+    # the dealer makes 17 less often, so a player 17 pushes less
+    assert hits["stand"]["push"] < stands["stand"]["push"]
+
+
+@pytest.mark.parametrize("player_score, is_soft, up_card, move", [
+    (16, False, 10, "hit"),
+    (16, False, 6, "stand"),
+    (12, False, 3, "hit"),
+    (12, False, 4, "stand"),
+    (18, True, 9, "hit"),
+    (18, True, 8, "stand"),
+    (11, False, 11, "hit"),
+])
+def test_basic_strategy(player_score, is_soft, up_card, move):
+    assert basic_strategy(player_score, is_soft, up_card) == move
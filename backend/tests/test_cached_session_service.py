@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from demo_adk_app.services.cached_session_service import CachingSessionService
+
+
+class RecordingSessionService(InMemorySessionService):
+    """
+    In memory session service recording the configs sessions are read with.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.configs = []
+
+    async def get_session(self, *, app_name, user_id, session_id, config=None):
+        self.configs.append(config)
+        return await super().get_session(app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+
+
+async def _session_with_events(service, count: int):
+    session = await service.create_session(app_name="app", user_id="user", state={"hand": ["KS"]})
+    for index in range(count):
+        await service.append_event(session, Event(invocation_id=f"inv-{index}", author="user", timestamp=time.time()))
+    return session
+
+
+def test_filtered_miss_is_read_from_the_backend_with_its_config():
+    async def run():
+        backend = RecordingSessionService()
+        session = await _session_with_events(backend, 5)
+        service = CachingSessionService(backend)
+        config = GetSessionConfig(num_recent_events=2)
+
+        recent = await service.get_session(app_name="app", user_id="user", session_id=session.id, config=config)
+        assert len(recent.events) == 2
+        assert backend.configs == [config]
+        assert service.metrics["misses"] == 1
+
+        # the filtered read was not cached, a full read loads and caches the session
+        await service.get_session(app_name="app", user_id="user", session_id=session.id)
+        full = await service.get_session(app_name="app", user_id="user", session_id=session.id)
+        assert len(full.events) == 5
+        assert backend.configs == [config, None]
+        assert service.metrics["hits"] == 1
+
+    asyncio.run(run())
+
+
+def test_cached_state_is_not_shared_with_callers():
+    async def run():
+        backend = InMemorySessionService()
+        session = await _session_with_events(backend, 0)
+        service = CachingSessionService(backend)
+        await service.get_session(app_name="app", user_id="user", session_id=session.id)
+
+        first = await service.get_session(app_name="app", user_id="user", session_id=session.id)
+        first.state["hand"].append("AH")
+        second = await service.get_session(app_name="app", user_id="user", session_id=session.id)
+        assert second.state["hand"] == ["KS"]
+
+        event = Event(invocation_id="inv", author="user", actions=EventActions(state_delta={"bet": 10}))
+        await service.append_event(second, event)
+        third = await service.get_session(app_name="app", user_id="user", session_id=session.id)
+        assert third.state == {"hand": ["KS"], "bet": 10}
+
+    asyncio.run(run())
+
+
+def test_events_appended_by_another_worker_are_not_served_from_cache(tmp_path):
+    async def run():
+        backend = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'sessions.db'}")
+        worker_a = CachingSessionService(backend)
+        worker_b = CachingSessionService(backend)
+        session = await worker_a.create_session(app_name="app", user_id="user")
+        await worker_a.get_session(app_name="app", user_id="user", session_id=session.id)
+
+        # an event without state delta leaves the session's update time unchanged
+        other = await worker_b.get_session(app_name="app", user_id="user", session_id=session.id)
+        await worker_b.append_event(other, Event(invocation_id="inv", author="user", timestamp=time.time()))
+
+        current = await worker_a.get_session(app_name="app", user_id="user", session_id=session.id)
+        assert len(current.events) == 1
+        assert worker_a.metrics["stale"] == 1
+
+        # the re-read session is served from cache again
+        await worker_a.get_session(app_name="app", user_id="user", session_id=session.id)
+        assert worker_a.metrics["hits"] == 2
+
+    asyncio.run(run())
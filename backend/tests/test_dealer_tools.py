@@ -0,0 +1,176 @@
+import asyncio
+import uuid
+
+import pytest
+from google.adk.sessions.state import State
+
+from demo_adk_app.agents.dealer_agent import tools as dealer_tools
+from demo_adk_app.utils import config as config_module
+from demo_adk_app.utils.config import Config
+from demo_adk_app.utils.constants import StateVariables
+from demo_adk_app.utils.local_deck_engine import LocalDeckEngine
+from demo_adk_app.utils.models import GameRoom
+
+
+class _ToolContext:
+    """
+    Minimal stand-in for ADK's ToolContext, dealer tools only use its state and invocation id.
+    """
+
+    def __init__(self, state: dict, invocation_id: str):
+        self.invocation_id = invocation_id
+        self.state = State(value=state, delta={})
+
+
+@pytest.fixture
+def table(monkeypatch):
+    """
+    Returns a function stacking a deck in draw order and storing a game room in session state,
+    returning a tool context for the game room.
+    """
+    engine = LocalDeckEngine(seed="test")
+    monkeypatch.setattr(dealer_tools, "get_async_deck_client", lambda: engine)
+    monkeypatch.setattr(config_module, "_config_instance", Config.model_construct(GAME_ROOM_STORE="session"))
+
+    def _table(cards: str, **room_fields) -> _ToolContext:
+        deck = asyncio.run(engine.new_unshuffled_deck(cards=cards))
+        game_room = GameRoom(
+            game_room_id="room-1", host_user_id="alice", players=["alice", "bob"],
+            deck={"deck_id": deck["deck_id"]}, **room_fields,
+        )
+        state = {f"room-1_{StateVariables.GAME_DETAILS}": game_room.model_dump()}
+        return _ToolContext(state, invocation_id=f"test-{uuid.uuid4()}")
+
+    return _table
+
+
+def _stored_room(tool_context: _ToolContext) -> GameRoom:
+    return GameRoom.model_validate(tool_context.state[f"room-1_{StateVariables.GAME_DETAILS}"])
+
+
+def _dealt_room(player_cards: dict, player_hand_status: dict, dealer_cards: list) -> dict:
+    return dict(
+        game_status="playing",
+        player_cards=player_cards,
+        player_scores={player: dealer_tools.calculate_hand_score(hand) for player, hand in player_cards.items()},
+        player_hand_status=player_hand_status,
+        dealer_cards=dealer_cards,
+    )
+
+
+def test_deal_initial_hands_deals_one_card_per_seat_per_round_with_the_dealer_last(table):
+    tool_context = table("2S,3S,4S,5S,6S,7S")
+
+    response = asyncio.run(dealer_tools.deal_initial_hands("room-1", tool_context))
+
+    assert response["status"] == "success"
+    game_room = _stored_room(tool_context)
+    assert game_room.player_cards == {"alice": ["2S", "5S"], "bob": ["3S", "6S"]}
+    assert game_room.dealer_cards == ["4S", "7S"]
+    assert game_room.player_scores == {"alice": 7, "bob": 9}
+    assert game_room.game_status == "playing"
+
+
+def test_deal_initial_hands_hides_the_dealer_hole_card(table):
+    tool_context = table("2S,3S,KH,5S,6S,AD")
+
+    response = asyncio.run(dealer_tools.deal_initial_hands("room-1", tool_context))
+
+    assert response["dealer_up_card"] == "KING of HEARTS"
+    assert response["dealer_visible_score"] == 10
+    assert "ACE of DIAMONDS" not in str(response)
+    assert _stored_room(tool_context).hole_card_revealed is False
+
+
+def test_deal_initial_hands_marks_natural_blackjacks(table):
+    tool_context = table("AS,3S,4S,KS,6S,7S")
+
+    response = asyncio.run(dealer_tools.deal_initial_hands("room-1", tool_context))
+
+    assert response["player_hand_status"] == {"alice": "blackjack", "bob": "playing"}
+    assert response["player_scores"]["alice"] == 21
+
+
+@pytest.mark.parametrize("player_hand, player_status, dealer_hand, result", [
+    pytest.param(["AS", "KS"], "blackjack", ["AH", "KH"], "push", id="blackjack vs blackjack"),
+    pytest.param(["AS", "KS"], "blackjack", ["9H", "KH"], "blackjack_win", id="blackjack"),
+    pytest.param(["9S", "8S", "4S"], "stood_21", ["AH", "KH"], "loss", id="21 vs dealer blackjack"),
+    pytest.param(["9S", "8S"], "stood", ["0H", "7H"], "push", id="push"),
+    pytest.param(["9S", "8S"], "stood", ["0H", "6H", "9D"], "win", id="dealer bust"),
+    pytest.param(["9S", "8S", "9D"], "busted", ["0H", "6H", "9C"], "loss", id="player bust before dealer bust"),
+    pytest.param(["9S", "7S"], "stood", ["0H", "8H"], "loss", id="lower score"),
+])
+def test_settle_player(player_hand, player_status, dealer_hand, result):
+    player_score = dealer_tools.calculate_hand_score(player_hand)
+    dealer_score = dealer_tools.calculate_hand_score(dealer_hand)
+    assert dealer_tools._settle_player(player_hand, player_score, player_status, dealer_hand, dealer_score) == result
+
+
+@pytest.mark.parametrize("hit_soft_17, dealer_final_hand", [
+    (False, ["ACE of HEARTS", "6 of HEARTS"]),
+    (True, ["ACE of HEARTS", "6 of HEARTS", "2 of CLUBS"]),
+])
+def test_play_dealer_hand_hits_soft_17_by_house_rule(table, monkeypatch, hit_soft_17, dealer_final_hand):
+    tool_context = table("2C", **_dealt_room(
+        player_cards={"alice": ["0S", "8S"], "bob": ["9S", "7S"]},
+        player_hand_status={"alice": "stood", "bob": "stood"},
+        dealer_cards=["AH", "6H"],
+    ))
+    monkeypatch.setattr(
+        config_module, "_config_instance", Config.model_construct(GAME_ROOM_STORE="session", DEALER_HITS_SOFT_17=hit_soft_17)
+    )
+
+    response = asyncio.run(dealer_tools.play_dealer_hand("room-1", tool_context))
+
+    assert response["status"] == "success"
+    assert response["dealer_final_hand"] == dealer_final_hand
+    game_room = _stored_room(tool_context)
+    assert game_room.game_status == "post-game"
+    assert game_room.player_results == (
+        {"alice": "loss", "bob": "loss"} if hit_soft_17 else {"alice": "win", "bob": "loss"}
+    )
+
+
+def test_play_dealer_hand_waits_for_every_player(table):
+    tool_context = table("2C", **_dealt_room(
+        player_cards={"alice": ["0S", "8S"], "bob": ["9S", "7S"]},
+        player_hand_status={"alice": "stood", "bob": "playing"},
+        dealer_cards=["0H", "6H"],
+    ))
+
+    response = asyncio.run(dealer_tools.play_dealer_hand("room-1", tool_context))
+
+    assert response["status"] == "error"
+    assert _stored_room(tool_context).dealer_cards == ["0H", "6H"]
+
+
+def test_play_dealer_hand_does_not_settle_a_finished_hand_again(table):
+    room = _dealt_room(
+        player_cards={"alice": ["0S", "8S"], "bob": ["9S", "7S"]},
+        player_hand_status={"alice": "stood", "bob": "stood"},
+        dealer_cards=["0H", "6H", "4C"],
+    )
+    tool_context = table("2C", **{**room, "game_status": "post-game", "player_results": {"alice": "loss", "bob": "loss"}})
+
+    response = asyncio.run(dealer_tools.play_dealer_hand("room-1", tool_context))
+
+    assert response["status"] == "error"
+    assert _stored_room(tool_context).player_results == {"alice": "loss", "bob": "loss"}
+
+
+def test_estimate_odds_tool_simulates_the_player_hand(table, monkeypatch):
+    tool_context = table("2C", **_dealt_room(
+        player_cards={"alice": ["0S", "6S"], "bob": ["9S", "7S"]},
+        player_hand_status={"alice": "playing", "bob": "stood"},
+        dealer_cards=["0H", "6H"],
+    ))
+    monkeypatch.setattr(
+        config_module, "_config_instance", Config.model_construct(GAME_ROOM_STORE="session", ODDS_SIMULATIONS=1000)
+    )
+
+    response = asyncio.run(dealer_tools.estimate_odds_tool("room-1", "alice", tool_context))
+
+    assert response["status"] == "success"
+    assert response["player_score"] == 16 and response["simulated_hands"] == 1000
+    assert response["dealer_up_card"] == "10 of HEARTS"
+    assert asyncio.run(dealer_tools.estimate_odds_tool("room-1", "bob", tool_context))["status"] == "error"
@@ -0,0 +1,108 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+from google.adk.sessions.state import State
+
+from demo_adk_app.utils import config as config_module
+from demo_adk_app.utils import game_room_repository as repository_module
+from demo_adk_app.utils import tools
+from demo_adk_app.utils.config import Config
+from demo_adk_app.utils.constants import StateVariables
+from demo_adk_app.utils.game_room_repository import (
+    GameRoomVersionConflict,
+    InMemoryGameRoomRepository,
+    SessionStateGameRoomRepository,
+    SqlGameRoomRepository,
+    get_game_room_repository,
+)
+from demo_adk_app.utils.models import GameRoom
+
+
+def _room(players=("host",)) -> GameRoom:
+    return GameRoom(game_room_id="room-1", host_user_id="host", players=list(players))
+
+
+def test_session_state_repository_keeps_rooms_and_current_games_in_state():
+    async def run():
+        delta = {}
+        repository = SessionStateGameRoomRepository(State(value={}, delta=delta))
+
+        game_room = await repository.save(_room())
+        assert delta[f"room-1_{StateVariables.GAME_DETAILS}"]["version"] == 1
+        assert await repository.get_current_game_id("host") == "room-1"
+
+        game_room.players.append("guest")
+        await repository.save(game_room, {"players"})
+        assert await repository.get_current_game_id("guest") == "room-1"
+
+        game_room.players.remove("guest")
+        await repository.save(game_room, {"players"})
+        assert await repository.get_current_game_id("guest") is None
+        assert [room.game_room_id for room in await repository.find_by_host("host")] == ["room-1"]
+
+        stale = _room()
+        stale.version = 1
+        with pytest.raises(GameRoomVersionConflict):
+            await repository.save(stale)
+
+    asyncio.run(run())
+
+
+def test_sql_repository_saves_and_finds_rooms(tmp_path):
+    async def run():
+        repository = SqlGameRoomRepository(db_url=f"sqlite:///{os.path.join(tmp_path, 'rooms.db')}")
+
+        game_room = await repository.save(_room())
+        loaded = await repository.get("room-1")
+        assert loaded.version == 1 and loaded.players == ["host"]
+        assert await repository.get_current_game_id("host") == "room-1"
+
+        with pytest.raises(GameRoomVersionConflict):
+            await repository.save(_room())
+        loaded.game_status = "in-game"
+        await repository.save(loaded, {"game_status"})
+        assert (await repository.get("room-1")).game_status == "in-game"
+        assert [room.version for room in await repository.find_by_host("host")] == [2]
+
+    asyncio.run(run())
+
+
+def test_in_memory_repository_hands_out_copies():
+    async def run():
+        repository = InMemoryGameRoomRepository()
+        await repository.save(_room())
+
+        loaded = await repository.get("room-1")
+        loaded.players.append("guest")
+        assert (await repository.get("room-1")).players == ["host"]
+
+    asyncio.run(run())
+
+
+def test_discarded_room_is_reloaded_by_later_tools(monkeypatch):
+    async def run():
+        repository = InMemoryGameRoomRepository()
+        await repository.save(_room())
+        monkeypatch.setattr(tools, "get_game_room_repository", lambda state: repository)
+        tool_context = SimpleNamespace(invocation_id="inv-1", state=State(value={}, delta={}))
+
+        game_room, _ = await tools._load_game_room("room-1", tool_context)
+        assert (await tools._load_game_room("room-1", tool_context))[0] is game_room
+
+        # a tool failing after changing the room drops it, the next tool gets the stored room
+        game_room.game_status = "post-game"
+        tools._discard_game_room("room-1", tool_context)
+        reloaded, _ = await tools._load_game_room("room-1", tool_context)
+        assert reloaded is not game_room and reloaded.game_status == "pre-game"
+
+    asyncio.run(run())
+
+
+def test_database_store_without_db_url_is_a_configuration_error(monkeypatch):
+    monkeypatch.setattr(repository_module, "_game_room_repository", None)
+    monkeypatch.setattr(config_module, "_config_instance", Config.model_construct(GAME_ROOM_STORE="database", DB_URL=None))
+
+    with pytest.raises(ValueError, match="DB_URL"):
+        get_game_room_repository(State(value={}, delta={}))
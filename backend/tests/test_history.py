@@ -0,0 +1,32 @@
+import pytest
+from google.adk.events import Event
+from google.genai import types
+
+from demo_adk_app.api.history import parse_event_fields, project_event
+
+
+def _event() -> Event:
+    return Event(
+        invocation_id="inv-1",
+        author="dealer_agent",
+        content=types.Content(role="model", parts=[types.Part(text="hello")]),
+    )
+
+
+def test_project_event_without_fields_keeps_the_full_body():
+    event = _event()
+
+    assert project_event(event, None, True) == event.model_dump(mode="json", by_alias=True)
+
+
+def test_parse_event_fields_accepts_response_and_field_names():
+    assert parse_event_fields("invocationId, author,turn_complete") == {"invocation_id", "author", "turn_complete"}
+    assert parse_event_fields(" , ") is None
+    with pytest.raises(ValueError):
+        parse_event_fields("id,invocationID")
+
+
+def test_project_event_with_fields_omits_empty_fields():
+    data = project_event(_event(), parse_event_fields("invocationId,author,branch"), True)
+
+    assert data == {"invocationId": "inv-1", "author": "dealer_agent"}
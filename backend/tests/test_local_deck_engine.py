@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from demo_adk_app.utils.local_deck_engine import LocalDeckEngine
+
+
+@pytest.mark.parametrize("call", [
+    lambda engine, deck_id: engine.shuffle_new_deck(cards="AS,ZZ"),
+    lambda engine, deck_id: engine.new_unshuffled_deck(cards="1X"),
+    lambda engine, deck_id: engine.add_to_pile(deck_id, "dealer", "AS,QQ"),
+    lambda engine, deck_id: engine.draw_from_pile(deck_id, "dealer", cards="XX"),
+    lambda engine, deck_id: engine.return_cards(deck_id, cards="??"),
+    lambda engine, deck_id: engine.return_cards_to_pile(deck_id, "dealer", cards="11"),
+])
+def test_unknown_card_codes_are_an_error_response(call):
+    async def run():
+        engine = LocalDeckEngine(seed="test")
+        deck = await engine.shuffle_new_deck()
+        return await call(engine, deck["deck_id"])
+
+    response = asyncio.run(run())
+    assert response["success"] is False
+    assert "Unknown card code" in response["error"]
+
+
+def test_partial_deck_accepts_lowercase_and_spaces():
+    response = asyncio.run(LocalDeckEngine(seed="test").new_unshuffled_deck(cards="as, kd ,0h"))
+    assert response["success"] is True
+    assert response["remaining"] == 3
+
+
+def test_draw_from_pile_with_a_missing_card_leaves_the_pile_unchanged():
+    async def run():
+        engine = LocalDeckEngine(seed="test")
+        deck_id = (await engine.new_unshuffled_deck(cards="AS,KD,0H"))["deck_id"]
+        await engine.draw_cards(deck_id, count=3)
+        await engine.add_to_pile(deck_id, "dealer", "AS,KD")
+        failed = await engine.draw_from_pile(deck_id, "dealer", cards="AS,0H")
+        pile = await engine.list_pile(deck_id, "dealer")
+        return failed, pile
+
+    failed, pile = asyncio.run(run())
+    assert failed["success"] is False
+    assert [card["code"] for card in pile["piles"]["dealer"]["cards"]] == ["AS", "KD"]
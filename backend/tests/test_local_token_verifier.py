@@ -0,0 +1,81 @@
+import datetime
+import json
+import time
+from functools import lru_cache
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from firebase_admin import auth as firebase_auth
+from google.auth import crypt as google_crypt
+from google.auth import jwt as google_jwt
+
+from demo_adk_app.api.local_token_verifier import FIREBASE_ISSUER_PREFIX, LocalTokenVerifier
+
+PROJECT_ID = "test-project"
+KEY_ID = "test-key"
+
+
+@lru_cache(maxsize=None)
+def _signing_key(name: str):
+    """
+    Returns a throwaway RSA key in PEM and its self-signed certificate in PEM.
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, name)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(subject).issuer_name(subject).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    return private_pem, certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def _token(key_name: str = "signing", key_id: str = KEY_ID, **claims) -> str:
+    issued_at = int(time.time())
+    payload = {
+        "iss": f"{FIREBASE_ISSUER_PREFIX}{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "user-1",
+        "iat": issued_at,
+        "exp": issued_at + 3600,
+        **claims,
+    }
+    signer = google_crypt.RSASigner.from_string(_signing_key(key_name)[0], key_id=key_id)
+    return google_jwt.encode(signer, payload).decode()
+
+
+@pytest.fixture
+def verifier(tmp_path):
+    keys_file = tmp_path / "keys.json"
+    keys_file.write_text(json.dumps({KEY_ID: _signing_key("signing")[1]}))
+    verifier = LocalTokenVerifier(project_id=PROJECT_ID, keys_file=str(keys_file))
+    yield verifier
+    verifier.close()
+
+
+def test_valid_token_is_decoded_with_its_uid(verifier):
+    decoded_token = verifier.verify_id_token(_token(email="user-1@example.com"))
+    assert decoded_token["uid"] == "user-1"
+    assert decoded_token["email"] == "user-1@example.com"
+
+
+@pytest.mark.parametrize("token", [
+    pytest.param(lambda: _token(key_name="other"), id="bad signature"),
+    pytest.param(lambda: _token(iss=f"{FIREBASE_ISSUER_PREFIX}other-project"), id="wrong issuer"),
+    pytest.param(lambda: _token(aud="other-project"), id="wrong audience"),
+    pytest.param(lambda: _token(iat=int(time.time()) - 7200, exp=int(time.time()) - 3600), id="expired"),
+    pytest.param(lambda: _token(key_id="unknown-key"), id="unknown kid"),
+    pytest.param(lambda: _token(sub=""), id="missing subject"),
+])
+def test_invalid_token_is_rejected(verifier, token):
+    with pytest.raises(firebase_auth.InvalidIdTokenError):
+        verifier.verify_id_token(token())
@@ -0,0 +1,36 @@
+import asyncio
+
+from demo_adk_app.services import rules_engine
+from demo_adk_app.utils.constants import StateVariables
+
+
+def _fake_current_game_id(enrolled):
+    async def _get_current_game_id(user_id, tool_context):
+        return enrolled.get(user_id)
+    return _get_current_game_id
+
+
+def test_find_player_game_uses_the_id_the_player_was_registered_with(monkeypatch):
+    # the game was joined from a session keyed by email, the current session's USER_ID is the uid
+    enrolled = {"player@example.com": "room-1"}
+    monkeypatch.setattr(rules_engine, "_get_current_game_id", _fake_current_game_id(enrolled))
+    session_state = {
+        StateVariables.USER_ID: "uid-1",
+        StateVariables.USER_DETAILS: {"uid": "uid-1", "email": "player@example.com"},
+    }
+    tool_context = rules_engine._StateToolContext(session_state)
+
+    assert asyncio.run(rules_engine._find_player_game(session_state, tool_context)) == ("player@example.com", "room-1")
+
+
+def test_find_player_game_prefers_the_session_user_id(monkeypatch):
+    enrolled = {"uid-1": "room-1", "player@example.com": "room-2"}
+    monkeypatch.setattr(rules_engine, "_get_current_game_id", _fake_current_game_id(enrolled))
+    session_state = {
+        StateVariables.USER_ID: "uid-1",
+        StateVariables.USER_DETAILS: {"uid": "uid-1", "email": "player@example.com"},
+    }
+    tool_context = rules_engine._StateToolContext(session_state)
+
+    assert asyncio.run(rules_engine._find_player_game(session_state, tool_context)) == ("uid-1", "room-1")
+    assert asyncio.run(rules_engine._find_player_game({}, tool_context)) == (None, None)
@@ -0,0 +1,148 @@
+import asyncio
+from collections import Counter
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from demo_adk_app.api.models import Message
+from demo_adk_app.services.runner import Runner
+from demo_adk_app.utils.config import Config
+from demo_adk_app.utils.constants import StateVariables
+
+APP_NAME = "test_app"
+USER = {"uid": "user-1", "email": "user-1@example.com"}
+
+
+class ReplyAgent(BaseAgent):
+    """
+    Agent replying with a fixed message, without a model call.
+    """
+
+    async def _run_async_impl(self, ctx):
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text="hello")]),
+        )
+
+
+class CountingSessionService(InMemorySessionService):
+    """
+    In-memory session service counting calls per method.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+
+    async def get_session(self, **kwargs):
+        self.calls["get_session"] += 1
+        return await super().get_session(**kwargs)
+
+    async def append_event(self, session, event):
+        self.calls["append_event"] += 1
+        return await super().append_event(session, event)
+
+
+def _runner():
+    config = Config.model_construct(
+        APP_NAME=APP_NAME,
+        RULES_FAST_PATH=False,
+        SESSION_COMPACTION_THRESHOLD=0,
+        STREAM_FLUSH_INTERVAL_MS=0,
+    )
+    session_service = CountingSessionService()
+    runner = Runner(
+        root_agent=ReplyAgent(name="reply_agent"),
+        session_service=session_service,
+        memory_service=None,
+        artifact_service=None,
+        config=config,
+    )
+    return runner, session_service
+
+
+async def _new_session(session_service):
+    session = await session_service.create_session(app_name=APP_NAME, user_id=USER["uid"])
+    session_service.calls.clear()
+    return session
+
+
+async def _drain(events):
+    return [event async for event in events]
+
+
+def test_submit_and_stream_read_the_session_once_per_turn():
+    async def turn():
+        runner, session_service = _runner()
+        session = await _new_session(session_service)
+
+        # the first submit records the user's details and the message, without re-reading the session
+        await runner.submit(user=USER, session=session, msg=Message(text="hi"))
+        assert session_service.calls == {"append_event": 2}
+        assert session.state[StateVariables.USER_ID] == USER["uid"]
+
+        # the only read of the stream request is the ADK runner loading the session for its run
+        session_service.calls.clear()
+        await _drain(await runner.stream(user=USER, session=session, request=None))
+        assert session_service.calls["get_session"] == 1
+
+        # later turns don't record the user's details again
+        session_service.calls.clear()
+        await runner.submit(user=USER, session=session, msg=Message(text="hi again"))
+        assert session_service.calls == {"append_event": 1}
+
+    asyncio.run(turn())
+
+
+def test_submitted_message_is_streamed_by_another_runner():
+    async def turn():
+        runner, session_service = _runner()
+        session = await _new_session(session_service)
+        await runner.submit(user=USER, session=session, msg=Message(text="hi"))
+
+        # the stream request reaches another worker, which loads the session from the session service
+        other_runner = Runner(
+            root_agent=ReplyAgent(name="reply_agent"),
+            session_service=session_service,
+            memory_service=None,
+            artifact_service=None,
+            config=runner._config,
+        )
+        session = await session_service.get_session(app_name=APP_NAME, user_id=USER["uid"], session_id=session.id)
+        await _drain(await other_runner.stream(user=USER, session=session, request=None))
+        session = await session_service.get_session(app_name=APP_NAME, user_id=USER["uid"], session_id=session.id)
+        assert [event.content.parts[0].text for event in session.events if event.content] == ["hi", "hello"]
+        assert not session.state[StateVariables.LAST_USER_MESSAGE]
+
+    asyncio.run(turn())
+
+
+def test_invoke_reads_the_session_once_per_turn():
+    async def turn():
+        runner, session_service = _runner()
+        session = await _new_session(session_service)
+
+        response = await runner.invoke(user=USER, session=session, msg=Message(text="hi"))
+        assert session_service.calls["get_session"] == 1
+        # user's details, user message and agent reply
+        assert session_service.calls["append_event"] == 3
+        assert response.text == ""
+
+    asyncio.run(turn())
+
+
+def test_stream_message_reads_the_session_once_per_turn():
+    async def turn():
+        runner, session_service = _runner()
+        session = await _new_session(session_service)
+
+        events = await _drain(
+            await runner.stream_message(user=USER, session=session, msg=Message(text="hi"), request=None)
+        )
+        assert session_service.calls["get_session"] == 1
+        assert '"type":"end"' in events[-1]["data"]
+
+    asyncio.run(turn())
@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+import json
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from demo_adk_app.api.models import Message
+from demo_adk_app.services.runner import Runner
+from demo_adk_app.utils.config import Config
+
+APP_NAME = "test_app"
+USER = {"uid": "user-1", "email": "user-1@example.com"}
+
+
+class StreamingReplyAgent(BaseAgent):
+    """
+    Agent calling a function, then streaming its reply in partial events, without a model call.
+    """
+
+    async def _run_async_impl(self, ctx):
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(
+                function_call=types.FunctionCall(id="call-1", name="lookup", args={})
+            )]),
+        )
+        for text in ["hel", "lo"]:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                partial=True,
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+            )
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text="hello")]),
+        )
+
+
+def test_end_event_digest_covers_the_streamed_message_text():
+    async def turn():
+        session_service = InMemorySessionService()
+        runner = Runner(
+            root_agent=StreamingReplyAgent(name="reply_agent"),
+            session_service=session_service,
+            memory_service=None,
+            artifact_service=None,
+            config=Config.model_construct(
+                APP_NAME=APP_NAME,
+                RULES_FAST_PATH=False,
+                SESSION_COMPACTION_THRESHOLD=0,
+                STREAM_FLUSH_INTERVAL_MS=0,
+                STREAM_END_PAYLOAD="digest",
+            ),
+        )
+        session = await session_service.create_session(app_name=APP_NAME, user_id=USER["uid"])
+        events = await runner.stream_message(user=USER, session=session, msg=Message(text="hi"), request=None)
+        return [json.loads(sse_event["data"]) async for sse_event in events]
+
+    events = asyncio.run(turn())
+    message_text = "".join(event["data"] for event in events if event["type"] == "message")
+    assert message_text == "hello"
+    assert any(event["type"] == "action" for event in events)
+    assert json.loads(events[-1]["data"]) == {
+        "chars": len(message_text),
+        "sha256": hashlib.sha256(message_text.encode("utf-8")).hexdigest(),
+    }
@@ -0,0 +1,174 @@
+import asyncio
+import json
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from google.genai import types
+
+from demo_adk_app.api.models import Message
+from demo_adk_app.services.pending_messages import BasePendingMessageStore
+from demo_adk_app.services.runner import Runner
+from demo_adk_app.utils.config import Config
+from demo_adk_app.utils.constants import StateVariables
+
+APP_NAME = "test_app"
+USER = {"uid": "user-1", "email": "user-1@example.com"}
+
+
+class SlowToolAgent(BaseAgent):
+    """
+    Agent calling a function, then waiting on it until cancelled, without a model call.
+    """
+
+    async def _run_async_impl(self, ctx):
+        if ctx.user_content.parts[0].text == "slow":
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                content=types.Content(role="model", parts=[types.Part(
+                    function_call=types.FunctionCall(id="call-1", name="lookup", args={})
+                )]),
+            )
+            await asyncio.sleep(60)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text="done")]),
+        )
+
+
+class FailingPendingMessageStore(BasePendingMessageStore):
+    """
+    Pending message store failing to take messages.
+    """
+
+    async def put(self, session, text):
+        pass
+
+    async def pop(self, session):
+        raise ConnectionError("pending message store is unavailable")
+
+
+class GatedAgent(BaseAgent):
+    """
+    Agent replying to each message once its gate is opened, without a model call.
+    """
+
+    gate: asyncio.Event
+
+    async def _run_async_impl(self, ctx):
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text="thinking")]),
+        )
+        await self.gate.wait()
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text=f"reply to {ctx.user_content.parts[0].text}")]),
+        )
+
+
+def _runner(policy: str = "queue", pending_message_store=None, session_service=None, root_agent=None):
+    session_service = session_service or InMemorySessionService()
+    runner = Runner(
+        root_agent=root_agent or SlowToolAgent(name="slow_agent"),
+        session_service=session_service,
+        memory_service=None,
+        artifact_service=None,
+        config=Config.model_construct(
+            APP_NAME=APP_NAME,
+            RULES_FAST_PATH=False,
+            SESSION_COMPACTION_THRESHOLD=0,
+            STREAM_FLUSH_INTERVAL_MS=0,
+            TURN_CONCURRENCY_POLICY=policy,
+        ),
+        pending_message_store=pending_message_store,
+    )
+    return runner, session_service
+
+
+async def _new_session(session_service):
+    return await session_service.create_session(
+        app_name=APP_NAME, user_id=USER["uid"], state={StateVariables.USER_DETAILS: USER}
+    )
+
+
+def test_stream_releases_its_admission_when_taking_the_message_fails():
+    async def run():
+        runner, session_service = _runner(pending_message_store=FailingPendingMessageStore())
+        session = await _new_session(session_service)
+
+        events = [event async for event in await runner.stream(user=USER, session=session, request=None)]
+        assert json.loads(events[-1]["data"]) == {"type": "error", "data": "pending message store is unavailable"}
+        assert runner._turn_scheduler._admitted == 0
+
+    asyncio.run(run())
+
+
+def test_turn_cancelled_before_it_started_is_released_and_completed():
+    async def run():
+        runner, session_service = _runner()
+        session = await _new_session(session_service)
+
+        ticket = runner._turn_scheduler.admit(session.id)
+        turn = runner._start_turn(session=session, text="hi", ticket=ticket)
+        task = next(task for task in runner._turn_tasks if task.get_name() == session.id)
+        task.cancel()
+        events = [event async for event in turn.subscribe()]
+
+        assert runner._turn_scheduler._admitted == 0
+        assert turn.done and "cancelled before it started" in events[-1]["data"]
+
+    asyncio.run(run())
+
+
+def test_invoke_cancelled_by_a_newer_message_records_the_interrupted_turn():
+    async def run():
+        runner, session_service = _runner(policy="cancel")
+        session = await _new_session(session_service)
+
+        first = asyncio.create_task(runner.invoke(user=USER, session=session, msg=Message(text="slow")))
+        await asyncio.sleep(0.1)
+        second = await runner.invoke(user=USER, session=session, msg=Message(text="hi"))
+        assert (await first).text == "this message was cancelled by a newer message"
+        assert second.text == ""
+
+        session = await session_service.get_session(app_name=APP_NAME, user_id=USER["uid"], session_id=session.id)
+        responses = [response for event in session.events for response in event.get_function_responses()]
+        assert [(response.id, response.name) for response in responses] == [("call-1", "lookup")]
+        assert any(event.interrupted for event in session.events)
+
+    asyncio.run(run())
+
+
+def test_submit_while_a_turn_is_running_does_not_stale_its_database_session(tmp_path):
+    async def run():
+        gate = asyncio.Event()
+        session_service = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'sessions.db'}")
+        runner, _ = _runner(session_service=session_service, root_agent=GatedAgent(name="gated_agent", gate=gate))
+        session = await _new_session(session_service)
+
+        await runner.submit(user=USER, session=session, msg=Message(text="first"))
+        first = await runner.stream(user=USER, session=session, request=None)
+        # sqlite stores the session's update time in seconds, a state change in a later second stales the turn's session
+        await asyncio.sleep(1.1)
+        # the first turn is waiting on its gate, with its first reply appended
+        session = await session_service.get_session(app_name=APP_NAME, user_id=USER["uid"], session_id=session.id)
+        await runner.submit(user=USER, session=session, msg=Message(text="second"))
+        second = await runner.stream(user=USER, session=session, request=None)
+        gate.set()
+
+        first_events = [json.loads(event["data"]) async for event in first]
+        second_events = [json.loads(event["data"]) async for event in second]
+        assert [event["type"] for event in first_events] == ["end"]
+        assert [event["type"] for event in second_events] == ["end"]
+
+        session = await session_service.get_session(app_name=APP_NAME, user_id=USER["uid"], session_id=session.id)
+        texts = [event.content.parts[0].text for event in session.events if event.content and event.content.parts]
+        assert texts == ["first", "thinking", "reply to first", "second", "thinking", "reply to second"]
+        assert session.state.get(StateVariables.LAST_USER_MESSAGE) is None
+
+    asyncio.run(run())
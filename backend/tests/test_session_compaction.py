@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from google.genai import types
+from sqlalchemy import select
+
+from demo_adk_app.services.session_compaction import SNAPSHOT_INVOCATION_ID, _archive_table, compact_session
+
+APP_NAME = "test_app"
+USER_ID = "user-1"
+
+
+def _system_event(index: int, state_delta: dict) -> Event:
+    return Event(
+        invocation_id=f"system-{index}",
+        author="system",
+        actions=EventActions(state_delta=state_delta),
+        timestamp=time.time(),
+    )
+
+
+def _user_event(index: int) -> Event:
+    return Event(
+        invocation_id=f"user-{index}",
+        author="user",
+        content=types.Content(role="user", parts=[types.Part(text=f"message {index}")]),
+        timestamp=time.time(),
+    )
+
+
+def _tool_events(index: int):
+    call_id = f"call-{index}"
+    return [
+        Event(
+            invocation_id=f"tool-{index}",
+            author="dealer_agent",
+            content=types.Content(role="model", parts=[types.Part(
+                function_call=types.FunctionCall(id=call_id, name="player_hit", args={})
+            )]),
+            timestamp=time.time(),
+        ),
+        Event(
+            invocation_id=f"tool-{index}",
+            author="dealer_agent",
+            content=types.Content(role="user", parts=[types.Part(
+                function_response=types.FunctionResponse(id=call_id, name="player_hit", response={"success": True})
+            )]),
+            actions=EventActions(state_delta={"hand": index}),
+            timestamp=time.time(),
+        ),
+    ]
+
+
+async def _session_with_history(session_service):
+    """
+    Creates a session of 10 events: 4 system events, 4 user messages and a tool call with its response.
+    """
+    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    events = [
+        _system_event(0, {"user_details": "a"}),
+        _user_event(0),
+        _system_event(1, {"last_user_message": "hi"}),
+        _user_event(1),
+        *_tool_events(0),
+        _system_event(2, {"last_user_message": None}),
+        _user_event(2),
+        _system_event(3, {"bet": 10}),
+        _user_event(3),
+    ]
+    for event in events:
+        await session_service.append_event(session, event)
+    return session, events
+
+
+async def _compact(session_service, session, threshold: int = 5, prune_tool_events: bool = False) -> int:
+    return await compact_session(
+        session_service,
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id=session.id,
+        threshold=threshold,
+        keep_recent=3,
+        prune_tool_events=prune_tool_events,
+    )
+
+
+async def _events(session_service, session):
+    session = await session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=session.id)
+    return session.events, session.state
+
+
+def test_in_memory_compaction_folds_old_system_events_into_a_snapshot():
+    async def run():
+        session_service = InMemorySessionService()
+        session, events = await _session_with_history(session_service)
+        _, state = await _events(session_service, session)
+
+        assert await _compact(session_service, session) == 3
+        compacted, compacted_state = await _events(session_service, session)
+
+        snapshots = [event for event in compacted if event.invocation_id == SNAPSHOT_INVOCATION_ID]
+        assert len(snapshots) == 1
+        assert snapshots[0].actions.state_delta == {"user_details": "a", "last_user_message": None}
+        # the recent events and the old non-system events are kept, in order
+        assert [event.id for event in compacted[-3:]] == [event.id for event in events[-3:]]
+        kept_ids = {event.id for event in events} - {events[0].id, events[2].id, events[6].id}
+        assert {event.id for event in compacted} - {snapshots[0].id} == kept_ids
+        assert compacted_state == state
+
+    asyncio.run(run())
+
+
+def test_compaction_prunes_completed_tool_events_when_enabled():
+    async def run():
+        session_service = InMemorySessionService()
+        session, events = await _session_with_history(session_service)
+
+        assert await _compact(session_service, session, prune_tool_events=True) == 5
+        compacted, _ = await _events(session_service, session)
+        assert not any(event.get_function_calls() or event.get_function_responses() for event in compacted)
+        snapshot = next(event for event in compacted if event.invocation_id == SNAPSHOT_INVOCATION_ID)
+        assert snapshot.actions.state_delta["hand"] == 0
+
+    asyncio.run(run())
+
+
+def test_sessions_under_the_threshold_are_left_unchanged():
+    async def run():
+        session_service = InMemorySessionService()
+        session, events = await _session_with_history(session_service)
+
+        assert await _compact(session_service, session, threshold=len(events)) == 0
+        compacted, _ = await _events(session_service, session)
+        assert [event.id for event in compacted] == [event.id for event in events]
+
+    asyncio.run(run())
+
+
+def test_database_compaction_archives_the_removed_events(tmp_path):
+    async def run():
+        session_service = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'sessions.db'}")
+        session, events = await _session_with_history(session_service)
+        _, state = await _events(session_service, session)
+
+        assert await _compact(session_service, session) == 3
+        compacted, compacted_state = await _events(session_service, session)
+        assert len(compacted) == len(events) - 3 + 1
+        assert [event.id for event in compacted[-3:]] == [event.id for event in events[-3:]]
+        assert compacted_state == state
+
+        archive = _archive_table()
+        with session_service.database_session_factory() as sql_session:
+            rows = sql_session.execute(select(archive).where(archive.c.session_id == session.id)).all()
+        assert sorted(row.id for row in rows) == sorted([events[0].id, events[2].id, events[6].id])
+        archived = {row.id: Event.model_validate_json(row.event_json) for row in rows}
+        assert archived[events[2].id].actions.state_delta == {"last_user_message": "hi"}
+
+        # compacting again leaves the single snapshot alone
+        assert await _compact(session_service, session) == 0
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+from google.adk.events import Event
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from google.genai import types
+
+from demo_adk_app.services.session_history import load_history_page
+
+APP_NAME = "test_app"
+USER_ID = "user-1"
+
+
+async def _session_with_events(session_service, count: int):
+    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    events = []
+    for index in range(count):
+        event = Event(
+            invocation_id=f"invocation-{index}",
+            author="user",
+            content=types.Content(role="user", parts=[types.Part(text=f"message {index}")]),
+            timestamp=time.time(),
+        )
+        await session_service.append_event(session, event)
+        events.append(event)
+    return session, events
+
+
+def _session_service(backend, tmp_path):
+    if backend == "memory":
+        return InMemorySessionService()
+    return DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'sessions.db'}")
+
+
+@pytest.mark.parametrize("backend", ["memory", "database"])
+def test_pages_return_every_event_once_in_order(tmp_path, backend):
+    async def run():
+        session_service = _session_service(backend, tmp_path)
+        session, events = await _session_with_events(session_service, 5)
+        pages, since_event_id = [], None
+        while True:
+            page, event_count, last_event_id = await load_history_page(
+                session_service, APP_NAME, USER_ID, session.id, since_event_id=since_event_id, limit=2
+            )
+            assert (event_count, last_event_id) == (5, events[-1].id)
+            if not page:
+                return events, pages
+            pages.append([event.id for event in page])
+            since_event_id = page[-1].id
+
+    events, pages = asyncio.run(run())
+    ids = [event.id for event in events]
+    assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+
+
+@pytest.mark.parametrize("backend", ["memory", "database"])
+def test_unknown_since_event_id_is_an_error(tmp_path, backend):
+    async def run():
+        session_service = _session_service(backend, tmp_path)
+        session, _ = await _session_with_events(session_service, 2)
+        await load_history_page(session_service, APP_NAME, USER_ID, session.id, since_event_id="missing", limit=None)
+
+    with pytest.raises(ValueError, match="missing"):
+        asyncio.run(run())
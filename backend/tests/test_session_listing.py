@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from sqlalchemy import inspect
+
+from demo_adk_app.services.session_listing import list_session_metadata
+
+APP_NAME = "test_app"
+USER_ID = "user-1"
+# update times of the listed sessions, with ties
+UPDATE_TIMES = [1000.0, 3000.0, 2000.0, 3000.0, 2000.0, 3000.0]
+
+
+async def _in_memory_sessions():
+    session_service = InMemorySessionService()
+    for index, update_time in enumerate(UPDATE_TIMES):
+        await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=f"session-{index}")
+        session_service.sessions[APP_NAME][USER_ID][f"session-{index}"].last_update_time = update_time
+    await session_service.create_session(app_name=APP_NAME, user_id="user-2", session_id="other-user")
+    return session_service
+
+
+async def _database_sessions(tmp_path):
+    from google.adk.sessions.database_session_service import StorageSession
+
+    session_service = DatabaseSessionService(db_url=f"sqlite:///{tmp_path / 'sessions.db'}")
+    for index in range(len(UPDATE_TIMES)):
+        await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=f"session-{index}")
+    await session_service.create_session(app_name=APP_NAME, user_id="user-2", session_id="other-user")
+    with session_service.database_session_factory() as sql_session:
+        for index, update_time in enumerate(UPDATE_TIMES):
+            storage_session = sql_session.get(StorageSession, (APP_NAME, USER_ID, f"session-{index}"))
+            storage_session.update_time = datetime.fromtimestamp(update_time, timezone.utc).replace(tzinfo=None)
+        sql_session.commit()
+    return session_service
+
+
+async def _list_all_pages(session_service, limit: int):
+    pages, cursor = [], None
+    while True:
+        sessions, cursor = await list_session_metadata(
+            session_service, app_name=APP_NAME, user_id=USER_ID, limit=limit, cursor=cursor
+        )
+        pages.append([session.id for session in sessions])
+        if cursor is None:
+            return pages
+
+
+# most recent first, ties on update time by descending id
+EXPECTED_ORDER = ["session-5", "session-3", "session-1", "session-4", "session-2", "session-0"]
+
+
+@pytest.mark.parametrize("backend", ["memory", "database"])
+@pytest.mark.parametrize("limit", [1, 2, 4, 6, 10])
+def test_pages_list_every_session_once_most_recent_first(tmp_path, backend, limit):
+    async def run():
+        session_service = await (_in_memory_sessions() if backend == "memory" else _database_sessions(tmp_path))
+        return await _list_all_pages(session_service, limit)
+
+    pages = asyncio.run(run())
+    assert [session_id for page in pages for session_id in page] == EXPECTED_ORDER
+    # a last page ending exactly on the limit has no next cursor
+    assert all(len(page) == limit for page in pages[:-1])
+    assert len(pages) == max(1, -(-len(EXPECTED_ORDER) // limit))
+
+
+def test_database_listing_keeps_the_update_time_of_the_listed_sessions(tmp_path):
+    async def run():
+        session_service = await _database_sessions(tmp_path)
+        return await list_session_metadata(session_service, app_name=APP_NAME, user_id=USER_ID, limit=2)
+
+    sessions, cursor = asyncio.run(run())
+    assert [session.last_update_time.timestamp() for session in sessions] == [3000.0, 3000.0]
+    assert cursor is not None
+
+
+def test_malformed_cursor_is_a_value_error():
+    async def run():
+        session_service = await _in_memory_sessions()
+        await list_session_metadata(session_service, app_name=APP_NAME, user_id=USER_ID, limit=2, cursor="not-a-cursor")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+@pytest.mark.parametrize("create_index", [False, True])
+def test_listing_index_is_created_only_when_enabled(tmp_path, create_index):
+    async def run():
+        session_service = await _database_sessions(tmp_path)
+        await list_session_metadata(
+            session_service, app_name=APP_NAME, user_id=USER_ID, limit=2, create_index=create_index
+        )
+        return {index["name"] for index in inspect(session_service.db_engine).get_indexes("sessions")}
+
+    assert ("ix_sessions_listing" in asyncio.run(run())) == create_index
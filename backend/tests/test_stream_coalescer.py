@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from demo_adk_app.api.models import StreamingEvent
+from demo_adk_app.services.stream_coalescer import coalesce_streaming_events
+
+
+async def _source(*items, delay: float = 0):
+    """
+    Yields the given events, sleeping `delay` seconds before each, raising the exceptions among them.
+    """
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def _message(text: str) -> StreamingEvent:
+    return StreamingEvent(type="message", data=text)
+
+
+def _coalesce(source, flush_interval: float = 10, flush_bytes: int = 1024):
+    async def run():
+        return [
+            (event.type, event.data)
+            async for event in coalesce_streaming_events(source, flush_interval=flush_interval, flush_bytes=flush_bytes)
+        ]
+
+    return asyncio.run(run())
+
+
+def test_messages_are_merged_until_another_event():
+    events = _coalesce(_source(
+        _message("hel"), _message("lo"), StreamingEvent(type="action", data="calling"),
+        _message(" world"), StreamingEvent(type="end", data="done"),
+    ))
+    assert events == [("message", "hello"), ("action", "calling"), ("message", " world"), ("end", "done")]
+
+
+def test_messages_are_flushed_on_size_in_utf8_bytes():
+    # 3 characters of 2 bytes each reach the 6 bytes limit
+    events = _coalesce(_source(_message("é"), _message("éé"), _message("a")), flush_bytes=6)
+    assert events == [("message", "ééé"), ("message", "a")]
+
+
+def test_messages_are_flushed_on_interval():
+    # chunks arrive every 30ms, text is held at most 50ms
+    events = _coalesce(_source(*[_message(str(i)) for i in range(6)], delay=0.03), flush_interval=0.05)
+    assert "".join(data for _, data in events) == "012345"
+    assert 1 < len(events) < 6
+
+
+def test_zero_interval_passes_every_event_through():
+    events = _coalesce(_source(_message("a"), _message("b")), flush_interval=0)
+    assert events == [("message", "a"), ("message", "b")]
+
+
+def test_source_errors_are_raised_after_the_buffered_text():
+    received = []
+
+    async def run():
+        async for event in coalesce_streaming_events(
+            _source(_message("partial"), ConnectionError("model failed")), flush_interval=10, flush_bytes=1024
+        ):
+            received.append((event.type, event.data))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    assert received == [("message", "partial")]
+
+
+def test_error_events_are_passed_through_without_delay():
+    events = _coalesce(_source(
+        _message("a"), StreamingEvent(type="error", data="tool failed"), _message("b"),
+    ))
+    assert events == [("message", "a"), ("error", "tool failed"), ("message", "b")]
@@ -0,0 +1,51 @@
+import asyncio
+import itertools
+import json
+
+from demo_adk_app.services.turn_streams import TurnStream
+
+
+async def _read(turn: TurnStream, after):
+    return [sse_event async for sse_event in turn.subscribe(after=after)]
+
+
+def _lost(sse_events):
+    return [json.loads(sse_event["data"])["data"] for sse_event in sse_events if "id" not in sse_event]
+
+
+def test_resuming_inside_the_dropped_range_reports_only_the_lost_events():
+    async def run():
+        turn = TurnStream(ids=itertools.count(100), max_events=3)
+        for index in range(6):
+            turn.append(f"event {index}")
+        turn.finish()
+
+        # ids 100 to 102 were dropped, the client received up to 101
+        sse_events = await _read(turn, after=101)
+        assert _lost(sse_events) == ["1 events of this turn are no longer available"]
+        assert [sse_event["id"] for sse_event in sse_events if "id" in sse_event] == ["103", "104", "105"]
+
+        assert _lost(await _read(turn, after=None)) == ["3 events of this turn are no longer available"]
+        assert await _read(turn, after=102) == [
+            {"id": str(event_id), "data": f"event {event_id - 100}"} for event_id in (103, 104, 105)
+        ]
+
+    asyncio.run(run())
+
+
+def test_dropped_ids_interleaved_with_another_turn_are_counted():
+    async def run():
+        ids = itertools.count(100)
+        turn = TurnStream(ids=ids, max_events=2)
+        other = TurnStream(ids=ids, max_events=2)
+        for index in range(3):
+            turn.append(f"event {index}")
+            other.append(f"other {index}")
+        turn.append("event 3")
+        turn.finish()
+
+        # the turn's ids are 100, 102, 104 and 106, 100 and 102 were dropped
+        assert _lost(await _read(turn, after=101)) == ["1 events of this turn are no longer available"]
+        assert turn.last_id == 106
+
+    asyncio.run(run())